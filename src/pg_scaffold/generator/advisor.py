@@ -0,0 +1,168 @@
+# pg_scaffold/generator/advisor.py
+
+import os
+import glob
+import json
+from typing import Any, Dict, List, Tuple
+from sqlalchemy.dialects import postgresql
+
+_quote = postgresql.dialect().identifier_preparer.quote
+
+POSTGRES_MAX_IDENTIFIER = 63
+
+
+class IndexAdvisor:
+    """
+    Cross-references a schema snapshot (as written by DatabaseInspector) with the
+    access paths of the generated code and reports:
+
+    - FK columns with no index leading on them. The generated CRUD filters on
+      them for every reverse relationship (selectinload / include=) and Postgres
+      scans the child table for them on every parent DELETE or key UPDATE.
+    - Duplicate indexes: same method, elements, INCLUDE list and predicate.
+    - Redundant prefix indexes: a non-unique btree whose elements are a leading
+      prefix of another btree with the same predicate.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = schema
+        self.missing: List[Dict[str, Any]] = []
+        self.duplicates: List[Dict[str, Any]] = []
+        self.redundant: List[Dict[str, Any]] = []
+
+    @classmethod
+    def from_json_dir(cls, sql_json_dir: str) -> "IndexAdvisor":
+        schema = {}
+        for file_path in sorted(glob.glob(os.path.join(sql_json_dir, "*.json"))):
+            table_name = os.path.splitext(os.path.basename(file_path))[0]
+            with open(file_path, "r", encoding="utf-8") as f:
+                schema[table_name] = json.load(f)
+        return cls(schema)
+
+    @staticmethod
+    def _element_key(element: Dict[str, Any]) -> Tuple:
+        return (element["expression"], element["opclass"], element["desc"], element["nulls_first"])
+
+    def _leading_columns(self, table_info: Dict[str, Any]) -> set:
+        """Columns some full (non-partial) btree index, the PK or a unique constraint starts with."""
+        leading = set()
+        primary_keys = [col["name"] for col in table_info.get("columns", []) if col["primary_key"]]
+        if primary_keys:
+            leading.add(primary_keys[0])
+
+        if "indexes" not in table_info:
+            # Older snapshots only know that a column is part of some index
+            leading.update(col["name"] for col in table_info.get("columns", []) if col.get("indexed"))
+            return leading
+
+        for index in table_info["indexes"]:
+            first = index["elements"][0] if index["elements"] else None
+            if index["method"] == "btree" and not index["predicate"] and first and first["column"]:
+                leading.add(first["expression"].strip('"'))
+        return leading
+
+    def _index_name(self, table_name: str, column: str) -> str:
+        return f"ix_{table_name}_{column}"[:POSTGRES_MAX_IDENTIFIER]
+
+    def _check_foreign_keys(self, table_name: str, table_info: Dict[str, Any]) -> None:
+        leading = self._leading_columns(table_info)
+        for relationship in table_info.get("relationships", []):
+            if relationship.get("relation_type") != "foreign_key":
+                continue
+            column = relationship["referred_variable"]
+            if column in leading:
+                continue
+            self.missing.append(
+                {
+                    "table": table_name,
+                    "column": column,
+                    "referred_table": relationship["referred_table"],
+                    "row_estimate": table_info.get("statistics", {}).get("row_estimate", -1),
+                    "name": self._index_name(table_name, column),
+                }
+            )
+            leading.add(column)
+
+    def _check_overlaps(self, table_name: str, table_info: Dict[str, Any]) -> None:
+        indexes = table_info.get("indexes", [])
+        seen: Dict[Tuple, Dict[str, Any]] = {}
+        for index in indexes:
+            signature = (
+                index["method"],
+                tuple(self._element_key(element) for element in index["elements"]),
+                tuple(index["include"]),
+                index["predicate"],
+                index["unique"],
+            )
+            kept = seen.setdefault(signature, index)
+            if kept is index:
+                continue
+            if index["constraint"] and not kept["constraint"]:
+                # Keep the constraint's index and report the plain one
+                seen[signature], kept, index = index, index, kept
+            self.duplicates.append({"table": table_name, "index": index["name"], "duplicate_of": kept["name"],
+                                    "constraint": index["constraint"]})
+
+        duplicates = {item["index"] for item in self.duplicates if item["table"] == table_name}
+        for index in indexes:
+            if index["method"] != "btree" or index["unique"] or index["include"] or index["name"] in duplicates:
+                continue
+            keys = [self._element_key(element) for element in index["elements"]]
+            for other in indexes:
+                if other is index or other["method"] != "btree" or other["predicate"] != index["predicate"]:
+                    continue
+                other_keys = [self._element_key(element) for element in other["elements"]]
+                if len(keys) < len(other_keys) and other_keys[:len(keys)] == keys:
+                    self.redundant.append({"table": table_name, "index": index["name"], "covered_by": other["name"]})
+                    break
+
+    def analyze(self) -> "IndexAdvisor":
+        self.missing, self.duplicates, self.redundant = [], [], []
+        for table_name, table_info in sorted(self.schema.items()):
+            self._check_foreign_keys(table_name, table_info)
+            self._check_overlaps(table_name, table_info)
+        return self
+
+    def report(self) -> str:
+        lines = ["# pg_scaffold index advice", ""]
+        lines.append(f"## Unindexed foreign keys ({len(self.missing)})")
+        for item in sorted(self.missing, key=lambda item: -item["row_estimate"]):
+            rows = f"~{item['row_estimate']} rows" if item["row_estimate"] >= 0 else "not analyzed"
+            lines.append(f"- {item['table']}.{item['column']} -> {item['referred_table']} ({rows}): "
+                         f"used by reverse relationship loads and by deletes on {item['referred_table']}")
+        lines += ["", f"## Duplicate indexes ({len(self.duplicates)})"]
+        for item in self.duplicates:
+            note = " (both back constraints; drop one of the constraints)" if item["constraint"] else ""
+            lines.append(f"- {item['table']}.{item['index']} duplicates {item['duplicate_of']}{note}")
+        lines += ["", f"## Redundant prefix indexes ({len(self.redundant)})"]
+        for item in self.redundant:
+            lines.append(f"- {item['table']}.{item['index']} is a leading prefix of {item['covered_by']}")
+        return "\n".join(lines) + "\n"
+
+    def migration_sql(self) -> str:
+        lines = [
+            "-- Generated by pg_scaffold advise",
+            "-- CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block:",
+            "-- run this file with psql without --single-transaction.",
+            "",
+        ]
+        for item in self.missing:
+            lines.append(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {_quote(item['name'])} "
+                         f"ON {_quote(item['table'])} ({_quote(item['column'])});")
+        drops = [(item["index"], f"duplicate of {item['duplicate_of']}") for item in self.duplicates if not item["constraint"]]
+        drops += [(item["index"], f"prefix of {item['covered_by']}") for item in self.redundant]
+        if drops:
+            lines += ["", "-- Review before dropping; uncomment to apply"]
+            for name, reason in drops:
+                lines.append(f"-- DROP INDEX CONCURRENTLY IF EXISTS {_quote(name)};  -- {reason}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, output_dir: str) -> Tuple[str, str]:
+        os.makedirs(output_dir, exist_ok=True)
+        report_path = os.path.join(output_dir, "index_advice.md")
+        sql_path = os.path.join(output_dir, "create_missing_indexes.sql")
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(self.report())
+        with open(sql_path, "w", encoding="utf-8") as f:
+            f.write(self.migration_sql())
+        return report_path, sql_path
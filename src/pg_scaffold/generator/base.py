@@ -4,16 +4,25 @@ import os
 import glob
 import json
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Tuple
 from jinja2 import Environment, FileSystemLoader
 from pg_scaffold.generator.utils import ensure_package_dirs
 
 class CodeGenerator(ABC):
     """Abstract base class for code generators."""
 
-    def __init__(self, sql_json_dir: Any, output_dir: str, template_file_nm: Optional[str] = None, gen_version: str = "v1"):
+    # Paths relative to the output directory that the generator reads and writes ("schema_json" is the
+    # inspector's snapshot); the scheduler runs a generator after every generator whose outputs it reads
+    inputs: Tuple[str, ...] = ("schema_json",)
+    outputs: Tuple[str, ...] = ()
+    # Only writes files that list every table, so selective runs that leave those alone skip it
+    aggregates_only = False
+
+    def __init__(self, sql_json_dir: Any, output_dir: str, template_file_nm: Optional[str] = None, gen_version: str = "v1",
+                 options: Optional[Dict[str, Any]] = None):
         self.sql_json_dir = sql_json_dir
         self.output_dir = output_dir
+        self.options = options or {}  # Generator settings from the CLI
         print(f"Output directory: {self.output_dir}")
         ensure_package_dirs(self.output_dir, stop_at='app')
         
@@ -38,6 +47,15 @@ class CodeGenerator(ABC):
                 
         return metadata
 
+    def _selected_tables(self):
+        """(table_name, table_info) pairs to write per-table files for: all tables unless options["tables"] narrows it."""
+        tables = self.options.get("tables")
+        return [(table_name, info) for table_name, info in self.schema.items() if tables is None or table_name in tables]
+
+    def _write_aggregates(self) -> bool:
+        """Whether to rewrite files that list every table (__init__.py, main.py, ...)."""
+        return self.options.get("aggregates", True)
+
     def _get_template(self, template_file_nm):
         env = Environment(
             loader=FileSystemLoader(self.template_dir),
@@ -0,0 +1,966 @@
+# pg_scaffold/generator/dump_inspector.py
+
+import re
+import json
+import logging
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.sql import sqltypes
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql.base import ischema_names
+
+from pg_scaffold.generator.inspector import DatabaseInspector
+
+_quote = postgresql.dialect().identifier_preparer.quote
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+      (?P<space>\s+|--[^\n]*|/\*.*?\*/)
+    | (?P<dollar>\$(?P<tag>(?:[^\W\d]\w*)?)\$.*?\$(?P=tag)\$)
+    | (?P<string>[Ee]'(?:[^'\\]|\\.|'')*'|[BbXxNn]?'(?:[^']|'')*')
+    | (?P<quoted>"(?:[^"]|"")*")
+    | (?P<word>[^\W\d][\w$]*)
+    | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    | (?P<param>\$\d+)
+    | (?P<cast>::)
+    | (?P<punct>[(),;\[\].])
+    | (?P<operator>[-+*/<>=~!@\#%^&|`?:]+)
+    """,
+    re.S | re.X,
+)
+
+# Keywords that end a column's type (and a DEFAULT expression) in a column definition
+_COLUMN_CONSTRAINTS = ("NOT", "NULL", "DEFAULT", "COLLATE", "GENERATED", "CONSTRAINT", "PRIMARY", "UNIQUE", "REFERENCES", "CHECK")
+_TABLE_CONSTRAINTS = ("CONSTRAINT", "PRIMARY", "UNIQUE", "FOREIGN", "CHECK", "EXCLUDE")
+
+_SERIAL_TYPES = {
+    "smallserial": "smallint", "serial2": "smallint",
+    "serial": "integer", "serial4": "integer",
+    "bigserial": "bigint", "serial8": "bigint",
+}
+
+# Spellings Postgres accepts in DDL but format_type() never returns
+_TYPE_ALIASES = {
+    "int": "integer", "int4": "integer", "int2": "smallint", "int8": "bigint",
+    "varchar": "character varying", "char": "character", "bpchar": "character",
+    "bool": "boolean", "float4": "real", "float8": "double precision", "decimal": "numeric",
+    "timestamp": "timestamp without time zone", "timestamptz": "timestamp with time zone",
+    "timetz": "time with time zone",
+}
+
+# Type -> operator class name prefix, for the default operator class of a btree/hash/brin index element
+_OPCLASS_PREFIXES = {
+    "smallint": "int2", "integer": "int4", "bigint": "int8", "numeric": "numeric",
+    "real": "float4", "double precision": "float8", "text": "text", "character varying": "text",
+    "character": "bpchar", "boolean": "bool", "date": "date", "time without time zone": "time",
+    "timestamp without time zone": "timestamp", "timestamp with time zone": "timestamptz",
+    "interval": "interval", "uuid": "uuid", "bytea": "bytea", "oid": "oid", "inet": "inet",
+    "jsonb": "jsonb", "tsvector": "tsvector", "citext": "citext",
+}
+_BRIN_MINMAX = {"int2", "int4", "int8", "numeric", "float4", "float8", "text", "bpchar", "date", "time",
+                "timestamp", "timestamptz", "interval", "uuid", "bytea", "oid"}
+
+# Result types of the aggregates a view's select list commonly uses, by argument type
+_SUM_TYPES = {"smallint": "bigint", "integer": "bigint", "bigint": "numeric", "numeric": "numeric",
+              "real": "real", "double precision": "double precision", "interval": "interval", "money": "money"}
+_AVG_TYPES = {"smallint": "numeric", "integer": "numeric", "bigint": "numeric", "numeric": "numeric",
+              "real": "double precision", "double precision": "double precision", "interval": "interval"}
+
+
+class _Token(NamedTuple):
+    kind: str
+    text: str
+    start: int
+    end: int
+
+
+def _tokenize(sql: str) -> List[_Token]:
+    tokens = []
+    position = 0
+    while position < len(sql):
+        match = _TOKEN_PATTERN.match(sql, position)
+        if match is None:
+            raise ValueError(f"Unexpected character {sql[position]!r} at offset {position} of the schema dump")
+        if match.lastgroup != "space":
+            tokens.append(_Token(match.lastgroup, match.group(), match.start(), match.end()))  # type: ignore
+        position = match.end()
+    return tokens
+
+
+def _unquote(text: str) -> str:
+    """An identifier as Postgres stores it: quoted names verbatim, unquoted ones folded to lower case."""
+    if text.startswith('"'):
+        return text[1:-1].replace('""', '"')
+    return text.lower()
+
+
+class _Cursor:
+    """A position in a statement's tokens. Keywords match case-insensitively, punctuation literally."""
+
+    def __init__(self, sql: str, tokens: List[_Token]):
+        self.sql = sql
+        self.tokens = tokens
+        self.pos = 0
+
+    def done(self) -> bool:
+        return self.pos >= len(self.tokens)
+
+    def peek(self, offset: int = 0) -> Optional[_Token]:
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def at(self, *words: str) -> bool:
+        for offset, word in enumerate(words):
+            token = self.peek(offset)
+            if token is None or token.kind == "quoted" or token.text.upper() != word:
+                return False
+        return True
+
+    def accept(self, *words: str) -> bool:
+        if self.at(*words):
+            self.pos += len(words)
+            return True
+        return False
+
+    def take(self) -> _Token:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def name(self) -> Tuple[Optional[str], str]:
+        """A possibly schema-qualified name: (schema or None, name)."""
+        parts = [_unquote(self.take().text)]
+        while self.at(".") and self.peek(1) is not None:
+            self.pos += 1
+            parts.append(_unquote(self.take().text))
+        return (parts[-2] if len(parts) > 1 else None), parts[-1]
+
+    def _closing(self, start: int) -> int:
+        depth = 0
+        for index in range(start, len(self.tokens)):
+            text = self.tokens[index].text
+            if text in ("(", "["):
+                depth += 1
+            elif text in (")", "]"):
+                depth -= 1
+                if depth == 0:
+                    return index
+        raise ValueError(f"Unbalanced parentheses in: {self.text()}")
+
+    def group(self) -> "_Cursor":
+        """The tokens inside the parenthesised group at the cursor; moves past it."""
+        end = self._closing(self.pos)
+        inner = _Cursor(self.sql, self.tokens[self.pos + 1:end])
+        self.pos = end + 1
+        return inner
+
+    def until(self, *words: str, minimum: int = 0) -> "_Cursor":
+        """The tokens up to the first top-level keyword in words (or the end); moves past them."""
+        start = self.pos
+        depth = 0
+        while not self.done():
+            token = self.tokens[self.pos]
+            if depth == 0 and self.pos - start >= minimum and token.kind == "word" and token.text.upper() in words:
+                break
+            if token.text in ("(", "["):
+                depth += 1
+            elif token.text in (")", "]"):
+                depth -= 1
+            self.pos += 1
+        return _Cursor(self.sql, self.tokens[start:self.pos])
+
+    def rest(self) -> "_Cursor":
+        rest = _Cursor(self.sql, self.tokens[self.pos:])
+        self.pos = len(self.tokens)
+        return rest
+
+    def items(self) -> List["_Cursor"]:
+        """The remaining tokens split on top-level commas."""
+        items, start, depth = [], self.pos, 0
+        for index in range(self.pos, len(self.tokens)):
+            text = self.tokens[index].text
+            if text in ("(", "["):
+                depth += 1
+            elif text in (")", "]"):
+                depth -= 1
+            elif text == "," and depth == 0:
+                items.append(_Cursor(self.sql, self.tokens[start:index]))
+                start = index + 1
+        if start < len(self.tokens):
+            items.append(_Cursor(self.sql, self.tokens[start:]))
+        self.pos = len(self.tokens)
+        return items
+
+    def encloses(self) -> bool:
+        """Whether the tokens are one parenthesised group."""
+        return bool(self.tokens) and self.tokens[0].text == "(" and self._closing(0) == len(self.tokens) - 1
+
+    def source(self) -> str:
+        if not self.tokens:
+            return ""
+        return self.sql[self.tokens[0].start:self.tokens[-1].end]
+
+    def text(self) -> str:
+        """The source text with whitespace runs outside literals collapsed, as pg_get_expr() prints it."""
+        parts = []
+        for previous, token in zip([None] + self.tokens[:-1], self.tokens):
+            if previous is not None and previous.end < token.start:
+                parts.append(" ")
+            parts.append(token.text)
+        return "".join(parts)
+
+
+def split_statements(sql: str) -> List[_Cursor]:
+    """The statements of a SQL script, without comments or psql meta-commands (\\connect, \\restrict, ...)."""
+    sql = re.sub(r"(?m)^\\.*$", "", sql)
+    statements, current = [], []
+    for token in _tokenize(sql):
+        if token.text == ";":
+            if current:
+                statements.append(_Cursor(sql, current))
+            current = []
+        else:
+            current.append(token)
+    if current:
+        statements.append(_Cursor(sql, current))
+    return statements
+
+
+def _has_top_level(cursor: _Cursor, *words: str) -> bool:
+    probe = _Cursor(cursor.sql, cursor.tokens)
+    probe.until(*words)
+    return not probe.done()
+
+
+def _pretty(expression: str) -> str:
+    """
+    pg_dump prints expressions with pg_get_expr()'s full parenthesisation,
+    while the live inspector reads index elements and predicates in pretty
+    mode. Drop the parentheses pretty mode leaves out: around a column or
+    literal being cast, one redundant outer pair, and around the comparisons
+    of a plain AND chain.
+    """
+    expression = re.sub(
+        r"""(?<![\w$"])\(("(?:[^"]|"")*"|[^\W\d][\w$]*(?:\.[^\W\d][\w$]*)?|'(?:[^']|'')*'|-?\d+(?:\.\d+)?)\)(?=::)""",
+        r"\1",
+        expression,
+    )
+    cursor = _Cursor(expression, _tokenize(expression))
+    if cursor.encloses() and cursor.group().encloses():
+        expression = expression[cursor.tokens[1].start:cursor.tokens[-2].end]
+    return expression
+
+
+def _pretty_predicate(predicate: str) -> str:
+    predicate = _pretty(predicate)
+    cursor = _Cursor(predicate, _tokenize(predicate))
+    if cursor.encloses():
+        cursor = cursor.group()
+    parts = []
+    while not cursor.done():
+        part = cursor.until("AND")
+        cursor.accept("AND")
+        parts.append(part)
+    if len(parts) > 1 and all(part.encloses() for part in parts):
+        inner = [_Cursor(part.sql, part.tokens[1:-1]) for part in parts]
+        if not any(_has_top_level(part, "AND", "OR") for part in inner):
+            parts = inner
+    return " AND ".join(part.source() for part in parts)
+
+
+class DumpCatalog:
+    """
+    The part of sqlalchemy's Inspector interface that DatabaseInspector uses
+    (get_table_names, get_columns, get_pk_constraint, get_unique_constraints,
+    get_indexes, get_foreign_keys, ...), answered from the DDL in a
+    `pg_dump --schema-only` file instead of the system catalog.
+
+    Only objects in schema_name are read. Expressions are kept as pg_dump
+    prints them, which is pg_get_expr() output, with the schema
+    qualification pg_dump adds under its empty search_path removed. Views
+    get their column types from the select list where it is made of column
+    references, casts and the common aggregates; other views are left
+    without columns.
+    """
+
+    def __init__(self, sql: str, schema_name: str = "public"):
+        self.schema_name = schema_name
+        self.enums: Dict[str, List[str]] = {}
+        self.domains: Dict[str, str] = {}
+        self.tables: Dict[str, Dict[str, Any]] = {}
+        self.views: Dict[str, Dict[str, Any]] = {}
+        self.indexes: Dict[str, List[Dict[str, Any]]] = {}
+        for statement in split_statements(sql):
+            self._parse(statement)
+
+    # --- DDL ---------------------------------------------------------------
+
+    def _local(self, schema: Optional[str]) -> bool:
+        return schema is None or schema == self.schema_name
+
+    def _expression(self, cursor: _Cursor) -> str:
+        schema = re.escape(self.schema_name)
+        quoted = re.escape(_quote(self.schema_name))
+        return re.sub(rf'(?<![\w$".])(?:{schema}|{quoted})\.', "", cursor.text())
+
+    def _parse(self, stmt: _Cursor) -> None:
+        if stmt.accept("CREATE"):
+            stmt.accept("OR", "REPLACE")
+            if stmt.accept("TYPE"):
+                self._create_type(stmt)
+            elif stmt.accept("DOMAIN"):
+                self._create_domain(stmt)
+            elif stmt.accept("UNIQUE", "INDEX"):
+                self._create_index(stmt, unique=True)
+            elif stmt.accept("INDEX"):
+                self._create_index(stmt, unique=False)
+            elif stmt.accept("MATERIALIZED", "VIEW"):
+                self._create_view(stmt, "materialized_view")
+            else:
+                stmt.accept("UNLOGGED")
+                stmt.accept("RECURSIVE")
+                if stmt.accept("TABLE"):
+                    self._create_table(stmt)
+                elif stmt.accept("VIEW"):
+                    self._create_view(stmt, "view")
+        elif stmt.accept("ALTER", "TABLE"):
+            self._alter_table(stmt)
+
+    def _create_type(self, stmt: _Cursor) -> None:
+        schema, name = stmt.name()
+        if self._local(schema) and stmt.accept("AS", "ENUM"):
+            self.enums[name] = [item.take().text[1:-1].replace("''", "'") for item in stmt.group().items()]
+
+    def _create_domain(self, stmt: _Cursor) -> None:
+        schema, name = stmt.name()
+        stmt.accept("AS")
+        if self._local(schema):
+            self.domains[name] = stmt.until("COLLATE", "DEFAULT", "CONSTRAINT", "NOT", "NULL", "CHECK").text()
+
+    def _create_table(self, stmt: _Cursor) -> None:
+        stmt.accept("IF", "NOT", "EXISTS")
+        schema, table_name = stmt.name()
+        if not self._local(schema):
+            return
+        if not stmt.at("("):
+            logging.warning(f"Skipping table {table_name}: only tables with a column list are supported offline")
+            return
+        self.tables[table_name] = {"columns": [], "primary_key": None, "unique": [], "foreign_keys": []}
+        for item in stmt.group().items():
+            if item.at("LIKE"):
+                logging.warning(f"Ignoring LIKE in table {table_name}: copied columns are not read offline")
+            elif any(item.at(word) for word in _TABLE_CONSTRAINTS):
+                self._add_constraint(table_name, item)
+            else:
+                self._add_column(table_name, item)
+
+    def _column(self, table_name: str, column_name: str) -> Optional[Dict[str, Any]]:
+        for column in self.tables[table_name]["columns"]:
+            if column["name"] == column_name:
+                return column
+        return None
+
+    def _add_column(self, table_name: str, item: _Cursor) -> None:
+        table = self.tables[table_name]
+        column_name = _unquote(item.take().text)
+        column = {"name": column_name, "type": item.until(*_COLUMN_CONSTRAINTS).text(), "nullable": True,
+                  "default": None, "computed": None, "identity": None}
+        serial = _SERIAL_TYPES.get(column["type"].lower())
+        if serial:
+            column.update(type=serial, nullable=False, default=f"nextval('{table_name}_{column_name}_seq'::regclass)")
+        table["columns"].append(column)
+
+        while not item.done():
+            name = _unquote(item.take().text) if item.accept("CONSTRAINT") else None
+            if item.accept("NOT", "NULL"):
+                column["nullable"] = False
+            elif item.accept("NULL"):
+                pass
+            elif item.accept("DEFAULT"):
+                column["default"] = self._expression(item.until(*_COLUMN_CONSTRAINTS, minimum=1))
+            elif item.accept("COLLATE"):
+                item.name()
+            elif item.accept("GENERATED"):
+                self._generated(column, item)
+            elif item.accept("PRIMARY", "KEY"):
+                table["primary_key"] = {"name": name or f"{table_name}_pkey", "constrained_columns": [column_name]}
+                column["nullable"] = False
+            elif item.accept("UNIQUE"):
+                item.accept("NULLS", "NOT", "DISTINCT") or item.accept("NULLS", "DISTINCT")
+                table["unique"].append({"name": name or f"{table_name}_{column_name}_key", "columns": [_quote(column_name)], "include": []})
+            elif item.accept("REFERENCES"):
+                self._add_foreign_key(table_name, name or f"{table_name}_{column_name}_fkey", [column_name], item)
+            elif item.accept("CHECK"):
+                item.group()
+            else:
+                item.take()
+
+    @staticmethod
+    def _generated(column: Dict[str, Any], item: _Cursor) -> None:
+        """GENERATED ALWAYS AS (expr) STORED, or GENERATED {ALWAYS | BY DEFAULT} AS IDENTITY [(options)]."""
+        always = item.accept("ALWAYS")
+        if not always:
+            item.accept("BY", "DEFAULT")
+        item.accept("AS")
+        if item.accept("IDENTITY"):
+            column.update(identity={"always": always}, nullable=False)
+            if item.at("("):
+                item.group()
+            return
+        column["computed"] = {"sqltext": item.group().text(), "persisted": item.accept("STORED")}
+
+    def _add_foreign_key(self, table_name: str, name: str, columns: List[str], item: _Cursor) -> None:
+        schema, referred_table = item.name()
+        referred_columns = [_unquote(column.text()) for column in item.group().items()] if item.at("(") else None
+        self.tables[table_name]["foreign_keys"].append(
+            {
+                "name": name,
+                "constrained_columns": columns,
+                "referred_schema": None if self._local(schema) else schema,
+                "referred_table": referred_table,
+                "referred_columns": referred_columns,  # None: the referred table's primary key
+            }
+        )
+
+    def _add_constraint(self, table_name: str, item: _Cursor) -> None:
+        table = self.tables[table_name]
+        name = _unquote(item.take().text) if item.accept("CONSTRAINT") else None
+        if item.accept("PRIMARY", "KEY"):
+            columns = [_unquote(column.text()) for column in item.group().items()]
+            table["primary_key"] = {"name": name or f"{table_name}_pkey", "constrained_columns": columns}
+            for column_name in columns:
+                column = self._column(table_name, column_name)
+                if column is not None:
+                    column["nullable"] = False
+        elif item.accept("UNIQUE"):
+            item.accept("NULLS", "NOT", "DISTINCT") or item.accept("NULLS", "DISTINCT")
+            columns = [column.text() for column in item.group().items()]
+            include = [column.text() for column in item.group().items()] if item.accept("INCLUDE") else []
+            default_name = f"{table_name}_{'_'.join(_unquote(column) for column in columns)}_key"
+            table["unique"].append({"name": name or default_name, "columns": columns, "include": include})
+        elif item.accept("FOREIGN", "KEY"):
+            columns = [_unquote(column.text()) for column in item.group().items()]
+            item.accept("REFERENCES")
+            self._add_foreign_key(table_name, name or f"{table_name}_{'_'.join(columns)}_fkey", columns, item)
+
+    def _alter_table(self, stmt: _Cursor) -> None:
+        stmt.accept("IF", "EXISTS")
+        stmt.accept("ONLY")
+        schema, table_name = stmt.name()
+        if not self._local(schema) or table_name not in self.tables:
+            return
+        for action in stmt.items():
+            if action.accept("ADD"):
+                if any(action.at(word) for word in _TABLE_CONSTRAINTS):
+                    self._add_constraint(table_name, action)
+                else:
+                    action.accept("COLUMN")
+                    action.accept("IF", "NOT", "EXISTS")
+                    self._add_column(table_name, action)
+            elif action.accept("ALTER"):
+                action.accept("COLUMN")
+                column = self._column(table_name, _unquote(action.take().text))
+                if column is None:
+                    continue
+                if action.accept("SET", "DEFAULT"):
+                    column["default"] = self._expression(action.rest())
+                elif action.accept("DROP", "DEFAULT"):
+                    column["default"] = None
+                elif action.accept("SET", "NOT", "NULL"):
+                    column["nullable"] = False
+                elif action.accept("DROP", "NOT", "NULL"):
+                    column["nullable"] = True
+                elif action.accept("ADD", "GENERATED"):
+                    self._generated(column, action)
+                elif action.accept("TYPE") or action.accept("SET", "DATA", "TYPE"):
+                    column["type"] = action.until("COLLATE", "USING").text()
+
+    def _create_index(self, stmt: _Cursor, unique: bool) -> None:
+        stmt.accept("CONCURRENTLY")
+        stmt.accept("IF", "NOT", "EXISTS")
+        index_name = None if stmt.at("ON") else stmt.name()[1]
+        stmt.accept("ON")
+        stmt.accept("ONLY")
+        schema, table_name = stmt.name()
+        if not self._local(schema):
+            return
+        method = _unquote(stmt.take().text) if stmt.accept("USING") else "btree"
+        elements = [self._index_element(table_name, method, item) for item in stmt.group().items()]
+        include = [item.text() for item in stmt.group().items()] if stmt.accept("INCLUDE") else []
+        stmt.accept("NULLS", "NOT", "DISTINCT") or stmt.accept("NULLS", "DISTINCT")
+        if stmt.accept("WITH"):
+            stmt.group()
+        if stmt.accept("TABLESPACE"):
+            stmt.take()
+        predicate = _pretty_predicate(self._expression(stmt.rest())) if stmt.accept("WHERE") else None
+        if index_name is None:
+            keys = [_unquote(element["expression"]) if element["column"] else "expr" for element in elements]
+            index_name = f"{table_name}_{'_'.join(keys)}_idx"
+        self.indexes.setdefault(table_name, []).append(
+            {"name": index_name, "method": method, "unique": unique, "constraint": None,
+             "elements": elements, "include": include, "predicate": predicate}
+        )
+
+    def _index_element(self, table_name: str, method: str, item: _Cursor) -> Dict[str, Any]:
+        """expression [COLLATE collation] [opclass] [ASC | DESC] [NULLS {FIRST | LAST}]"""
+        tokens = list(item.tokens)
+
+        def ends(*words: str) -> bool:
+            return len(tokens) > len(words) and all(
+                token.kind == "word" and token.text.upper() == word for token, word in zip(tokens[-len(words):], words)
+            )
+
+        nulls_first = None
+        if ends("NULLS", "FIRST") or ends("NULLS", "LAST"):
+            nulls_first = tokens[-1].text.upper() == "FIRST"
+            del tokens[-2:]
+        desc = ends("DESC")
+        if desc or ends("ASC"):
+            del tokens[-1]
+
+        element = _Cursor(item.sql, tokens)
+        if element.at("("):
+            element.group()
+            column = False
+        else:
+            element.name()
+            column = not element.at("(")
+            if not column:
+                element.group()
+        expression = _Cursor(item.sql, tokens[:element.pos])
+        if element.accept("COLLATE"):
+            element.name()
+        opclass = element.name()[1] if not element.done() else None
+
+        if column:
+            expression_text = _quote(_unquote(expression.text()))
+            type_name = self._column_type_name(table_name, _unquote(expression.text()))
+        else:
+            expression_text = _pretty(self._expression(expression))
+            type_name = self._expression_type_name(expression_text)
+        return {
+            "expression": expression_text,
+            "column": column,
+            "opclass": opclass,
+            "opclass_name": opclass or self._default_opclass(method, type_name),
+            "desc": desc,
+            # DESC defaults to NULLS FIRST, ASC to NULLS LAST
+            "nulls_first": desc if nulls_first is None else nulls_first,
+        }
+
+    def _create_view(self, stmt: _Cursor, kind: str) -> None:
+        stmt.accept("IF", "NOT", "EXISTS")
+        schema, view_name = stmt.name()
+        if not self._local(schema):
+            return
+        column_names = [_unquote(item.text()) for item in stmt.group().items()] if stmt.at("(") else None
+        while not stmt.done() and not stmt.at("AS"):
+            if stmt.at("("):
+                stmt.group()
+            else:
+                stmt.take()
+        stmt.accept("AS")
+        query = stmt.until("WITH") if kind == "materialized_view" else stmt.rest()
+        self.views[view_name] = {"kind": kind, "query": query, "column_names": column_names, "columns": None}
+
+    # --- Types -------------------------------------------------------------
+
+    def _canonical_type(self, type_text: str) -> Tuple[str, List[str], int]:
+        """(base type name as format_type() spells it, type modifiers, array dimensions)"""
+        text = " ".join(type_text.split())
+        array_dimensions = len(re.findall(r"\[\d*\]", text))
+        text = re.sub(r"\s*(\[\d*\])+$", "", text)
+        modifiers = re.search(r"\(([^)]*)\)", text)
+        args = [arg.strip() for arg in modifiers.group(1).split(",")] if modifiers else []
+        base = re.sub(r"\s*\([^)]*\)", "", text).strip()
+        for prefix in (f"{self.schema_name}.", f"{_quote(self.schema_name)}.", "pg_catalog."):
+            if base.startswith(prefix):
+                base = base[len(prefix):]
+        if not base.startswith('"'):
+            base = base.lower()
+        return _TYPE_ALIASES.get(base, base), args, array_dimensions
+
+    def _reflect_type(self, type_text: str) -> sqltypes.TypeEngine:
+        """The sqlalchemy type live reflection builds for a format_type() string (PGDialect._reflect_type)."""
+        base, args, array_dimensions = self._canonical_type(type_text)
+        type_class = ischema_names.get(base)
+        type_args: Tuple[Any, ...] = ()
+        kwargs: Dict[str, Any] = {}
+        if base == "numeric":
+            type_args = tuple(int(arg) for arg in args) if len(args) == 2 else ()
+        elif base == "double precision":
+            type_args = (53,)
+        elif base in ("timestamp with time zone", "time with time zone", "timestamp without time zone",
+                      "time without time zone", "time"):
+            kwargs["timezone"] = base.endswith(" with time zone")
+            if len(args) == 1:
+                kwargs["precision"] = int(args[0])
+        elif base == "bit varying":
+            kwargs["varying"] = True
+            type_args = (int(args[0]),) if len(args) == 1 else ()
+        elif base == "interval" or base.startswith("interval "):
+            type_class = postgresql.INTERVAL
+            if base.startswith("interval "):
+                kwargs["fields"] = base[len("interval "):]
+            if len(args) == 1:
+                kwargs["precision"] = int(args[0])
+        elif type_class is None:
+            name = _unquote(base)
+            if name in self.enums:
+                data_type: sqltypes.TypeEngine = postgresql.ENUM(*self.enums[name], name=name)
+            elif name in self.domains:
+                data_type = postgresql.DOMAIN(name, self._reflect_type(self.domains[name]), create_type=False)
+            else:
+                logging.warning(f"Did not recognize type '{type_text}' in the schema dump")
+                return sqltypes.NULLTYPE
+            return postgresql.ARRAY(data_type) if array_dimensions else data_type
+        elif args:
+            try:
+                type_args = (int(args[0]), *args[1:])
+            except ValueError:
+                type_args = tuple(args)
+
+        data_type = type_class(*type_args, **kwargs)
+        return postgresql.ARRAY(data_type) if array_dimensions else data_type
+
+    def _column_type_name(self, table_name: str, column_name: str) -> Optional[str]:
+        for name, type_text in self._relation_columns(table_name) or []:
+            if name == column_name:
+                base, _, array_dimensions = self._canonical_type(type_text)
+                return f"{base}[]" if array_dimensions else base
+        return None
+
+    @staticmethod
+    def _expression_type_name(expression: str) -> Optional[str]:
+        """The type of an index expression, for the forms whose type is evident from the text."""
+        if expression.startswith("to_tsvector("):
+            return "tsvector"
+        if re.match(r"(lower|upper)\(", expression) or expression.endswith("::text"):
+            return "text"
+        return None
+
+    @staticmethod
+    def _default_opclass(method: str, type_name: Optional[str]) -> Optional[str]:
+        if type_name is None:
+            return None
+        if type_name.endswith("[]"):
+            return "array_ops" if method in ("btree", "hash", "gin") else None
+        prefix = _OPCLASS_PREFIXES.get(type_name)
+        if method in ("btree", "hash") and prefix:
+            return f"{prefix}_ops"
+        if method == "gin" and type_name in ("tsvector", "jsonb"):
+            return f"{type_name}_ops"
+        if method == "gist" and type_name == "tsvector":
+            return "gist_tsvector_ops"
+        if method == "brin" and prefix in _BRIN_MINMAX:
+            return f"{prefix}_minmax_ops"
+        return None
+
+    # --- Views -------------------------------------------------------------
+
+    def _relation_columns(self, relation: str) -> Optional[List[Tuple[str, str]]]:
+        """(name, type text) of a table's or view's columns; None when a view's types can't be worked out."""
+        if relation in self.tables:
+            return [(column["name"], column["type"]) for column in self.tables[relation]["columns"]]
+        if relation in self.views:
+            return self._view_columns(relation)
+        return None
+
+    def _view_columns(self, view_name: str) -> Optional[List[Tuple[str, str]]]:
+        view = self.views[view_name]
+        if view["columns"] is None:
+            view["columns"] = []  # Guards against self-reference while resolving
+            view["columns"] = self._resolve_view_columns(view_name, _Cursor(view["query"].sql, view["query"].tokens))
+        return view["columns"] or None
+
+    def _resolve_view_columns(self, view_name: str, query: _Cursor) -> List[Tuple[str, str]]:
+        while query.encloses():
+            query = query.group()
+        if not query.accept("SELECT"):
+            logging.warning(f"View {view_name}: only plain SELECT definitions can be read offline")
+            return []
+        if query.accept("DISTINCT") and query.accept("ON"):
+            query.group()
+        query.accept("ALL")
+        targets = query.until("FROM").items()
+        sources = self._view_sources(query.until("WHERE", "GROUP", "HAVING", "WINDOW", "ORDER", "LIMIT", "OFFSET",
+                                                 "FETCH", "UNION", "INTERSECT", "EXCEPT"))
+
+        column_names = self.views[view_name]["column_names"]
+        columns = []
+        for position, target in enumerate(targets):
+            tokens = target.tokens
+            name = None
+            if len(tokens) > 2 and tokens[-2].kind == "word" and tokens[-2].text.upper() == "AS":
+                name = _unquote(tokens[-1].text)
+                target = _Cursor(target.sql, tokens[:-2])
+            elif all(token.kind in ("word", "quoted") or token.text == "." for token in tokens):
+                name = _unquote(tokens[-1].text)
+            if column_names and position < len(column_names):
+                name = column_names[position]
+            type_text = self._expression_type(target, sources)
+            if name is None or type_text is None:
+                logging.warning(f"View {view_name}: can't work out the type of {target.text()!r} offline")
+                return []
+            columns.append((name, type_text))
+        return columns
+
+    def _view_sources(self, from_clause: _Cursor) -> Dict[str, str]:
+        """Alias (or relation name) -> relation, for the tables and views in a FROM clause."""
+        keywords = {"JOIN", "LEFT", "RIGHT", "INNER", "FULL", "OUTER", "CROSS", "NATURAL", "LATERAL", "ON", "USING"}
+        sources = {}
+        tokens = from_clause.tokens
+        index = 0
+        while index < len(tokens):
+            token = tokens[index]
+            if token.kind not in ("word", "quoted") or (index and tokens[index - 1].text == "."):
+                index += 1
+                continue
+            cursor = _Cursor(from_clause.sql, tokens[index:])
+            schema, relation = cursor.name()
+            index += cursor.pos
+            if not self._local(schema) or (relation not in self.tables and relation not in self.views):
+                continue
+            cursor = _Cursor(from_clause.sql, tokens[index:])
+            cursor.accept("AS")
+            alias = cursor.peek()
+            if alias is not None and alias.kind in ("word", "quoted") and alias.text.upper() not in keywords:
+                sources[_unquote(alias.text)] = relation
+                index += cursor.pos + 1
+            else:
+                sources[relation] = relation
+        return sources
+
+    def _source_column_type(self, sources: Dict[str, str], qualifier: Optional[str], column_name: str) -> Optional[str]:
+        relations = [sources[qualifier]] if qualifier in sources else [] if qualifier else list(sources.values())
+        types = [type_text for relation in relations for name, type_text in self._relation_columns(relation) or []
+                 if name == column_name]
+        return types[0] if len(types) == 1 else None
+
+    def _expression_type(self, expression: _Cursor, sources: Dict[str, str]) -> Optional[str]:
+        """The type of a select-list expression: column references, casts, literals and common aggregates."""
+        tokens = expression.tokens
+        if not tokens:
+            return None
+        depth = 0
+        last_cast = None
+        for index, token in enumerate(tokens):
+            if token.text in ("(", "["):
+                depth += 1
+            elif token.text in (")", "]"):
+                depth -= 1
+            elif token.kind == "cast" and depth == 0:
+                last_cast = index
+        if last_cast is not None:
+            return _Cursor(expression.sql, tokens[last_cast + 1:]).text()
+        if expression.encloses():
+            return self._expression_type(_Cursor(expression.sql, tokens[1:-1]), sources)
+
+        if len(tokens) in (1, 3) and all(token.kind in ("word", "quoted") or token.text == "." for token in tokens):
+            qualifier = _unquote(tokens[0].text) if len(tokens) == 3 else None
+            return self._source_column_type(sources, qualifier, _unquote(tokens[-1].text))
+        if len(tokens) == 1:
+            if tokens[0].kind == "string":
+                return "text"
+            if tokens[0].kind == "number":
+                return "integer" if tokens[0].text.isdigit() else "numeric"
+            if tokens[0].text.upper() in ("TRUE", "FALSE"):
+                return "boolean"
+            return None
+
+        cursor = _Cursor(expression.sql, tokens)
+        if tokens[0].kind == "word" and tokens[1].text == "(" and cursor._closing(1) == len(tokens) - 1:
+            function = tokens[0].text.lower()
+            arguments = _Cursor(expression.sql, tokens[2:-1]).items()
+            if function == "count":
+                return "bigint"
+            if function in ("now", "current_timestamp"):
+                return "timestamp with time zone"
+            if function in ("lower", "upper", "concat", "string_agg"):
+                return "text"
+            if not arguments:
+                return None
+            argument = self._expression_type(arguments[0], sources)
+            if argument is None:
+                return None
+            base = self._canonical_type(argument)[0]
+            if function in ("min", "max", "coalesce"):
+                return argument
+            if function == "sum":
+                return _SUM_TYPES.get(base)
+            if function == "avg":
+                return _AVG_TYPES.get(base)
+        return None
+
+    # --- Inspector interface -----------------------------------------------
+
+    def clear_cache(self) -> None:
+        """Nothing is cached beyond the parsed dump."""
+
+    def get_table_names(self) -> List[str]:
+        return sorted(self.tables)
+
+    def get_view_names(self) -> List[str]:
+        return sorted(name for name, view in self.views.items() if view["kind"] == "view")
+
+    def get_materialized_view_names(self) -> List[str]:
+        return sorted(name for name, view in self.views.items() if view["kind"] == "materialized_view")
+
+    def get_columns(self, table_name: str) -> List[Dict[str, Any]]:
+        if table_name in self.views:
+            return [{"name": name, "type": self._reflect_type(type_text), "nullable": True, "default": None}
+                    for name, type_text in self._view_columns(table_name) or []]
+
+        columns = []
+        for column in self.tables[table_name]["columns"]:
+            reflected = {"name": column["name"], "type": self._reflect_type(column["type"]),
+                         "nullable": column["nullable"], "default": column["default"]}
+            # Like live reflection: generated and identity columns report no default
+            if column["computed"]:
+                reflected["computed"] = column["computed"]
+                reflected["default"] = None
+            if column["identity"]:
+                reflected["identity"] = column["identity"]
+                reflected["default"] = None
+            columns.append(reflected)
+        return columns
+
+    def get_pk_constraint(self, table_name: str) -> Dict[str, Any]:
+        primary_key = self.tables.get(table_name, {}).get("primary_key")
+        return dict(primary_key) if primary_key else {"constrained_columns": [], "name": None}
+
+    def get_unique_constraints(self, table_name: str) -> List[Dict[str, Any]]:
+        unique = self.tables.get(table_name, {}).get("unique", [])
+        return [{"name": uc["name"], "column_names": [_unquote(column) for column in uc["columns"]]}
+                for uc in sorted(unique, key=lambda uc: uc["name"])]
+
+    def index_definitions(self, table_name: str) -> List[Dict[str, Any]]:
+        """Indexes in the format DatabaseInspector._indexes_for_table() returns, unique constraints included."""
+        indexes = list(self.indexes.get(table_name, []))
+        for uc in self.tables.get(table_name, {}).get("unique", []):
+            elements = []
+            for column in uc["columns"]:
+                column_name = _unquote(column)
+                elements.append(
+                    {"expression": _quote(column_name), "column": True, "opclass": None,
+                     "opclass_name": self._default_opclass("btree", self._column_type_name(table_name, column_name)),
+                     "desc": False, "nulls_first": False}
+                )
+            indexes.append({"name": uc["name"], "method": "btree", "unique": True, "constraint": uc["name"],
+                            "elements": elements, "include": uc["include"], "predicate": None})
+        return sorted(indexes, key=lambda index: index["name"])
+
+    def get_indexes(self, table_name: str) -> List[Dict[str, Any]]:
+        indexes = []
+        for index in self.index_definitions(table_name):
+            reflected = {
+                "name": index["name"],
+                "unique": index["unique"],
+                "column_names": [_unquote(element["expression"]) if element["column"] else None
+                                 for element in index["elements"]],
+                "include_columns": [_unquote(column) for column in index["include"]],
+                "dialect_options": {"postgresql_using": index["method"]},
+            }
+            if index["predicate"]:
+                reflected["dialect_options"]["postgresql_where"] = index["predicate"]
+            if index["constraint"]:
+                reflected["duplicates_constraint"] = index["constraint"]
+            indexes.append(reflected)
+        return indexes
+
+    def get_foreign_keys(self, table_name: str) -> List[Dict[str, Any]]:
+        foreign_keys = []
+        for fk in sorted(self.tables.get(table_name, {}).get("foreign_keys", []), key=lambda fk: fk["name"]):
+            fk = dict(fk)
+            if fk["referred_columns"] is None:
+                fk["referred_columns"] = self.get_pk_constraint(fk["referred_table"])["constrained_columns"]
+            foreign_keys.append(fk)
+        return foreign_keys
+
+
+class DumpInspector(DatabaseInspector):
+    """
+    DatabaseInspector over a `pg_dump --schema-only` file instead of a live
+    database, for CI jobs without Postgres. Writes the same schema_json
+    snapshot, except that there are no planner statistics: every table looks
+    unanalyzed (row_estimate -1), as it would right after restoring the dump.
+    """
+
+    def __init__(self, dump_path: str, output_dir: str, schema_name: str = "public"):
+        self.db_url = None
+        self.dump_path = dump_path
+        self.output_dir = output_dir
+        self.engine = None
+        with open(dump_path, "r", encoding="utf-8") as f:
+            self.inspector = DumpCatalog(f.read(), schema_name)
+        self.schema: Optional[Dict[str, Any]] = None
+
+    def _inspect_view(self, table_name: str):
+        if not self.inspector.get_columns(table_name):
+            logging.warning(f"Skipping view {table_name}: its column types could not be read from the dump")
+            del self.schema[table_name]  # type: ignore
+            return
+        super()._inspect_view(table_name)
+
+    def _statistics_for_table(self, table_name: str):
+        return {"row_estimate": -1, "table_bytes": None, "total_bytes": None, "avg_row_bytes": None, "columns": {}}
+
+    def _indexes_for_table(self, table_name: str):
+        return self.inspector.index_definitions(table_name)
+
+    def fingerprints(self) -> Dict[str, str]:
+        raise NotImplementedError("A schema dump has no catalog to fingerprint; watch a live database with --pgdb")
+
+
+def load_schema_dump(db_url: str, dump_path: str) -> None:
+    """Run a schema dump's statements against db_url, e.g. a scratch database for conformance_differences()."""
+    with open(dump_path, "r", encoding="utf-8") as f:
+        statements = split_statements(f.read())
+    # pg_dump empties search_path for its session; keep that off the inspector's connections
+    engine = create_engine(db_url)
+    try:
+        with engine.begin() as conn:
+            for statement in statements:
+                conn.exec_driver_sql(statement.source())
+    finally:
+        engine.dispose()
+
+
+def _comparable(table_info: Dict[str, Any]) -> Dict[str, Any]:
+    """A snapshot entry without statistics, relationships in a fixed order and expressions minus layout."""
+
+    def expression_key(expression):
+        return re.sub(r"[\s()]", "", expression) if expression else expression
+
+    entry = json.loads(json.dumps({key: value for key, value in table_info.items() if key != "statistics"}))
+    entry["relationships"] = sorted(entry.get("relationships", []), key=lambda rel: json.dumps(rel, sort_keys=True))
+    for index in entry.get("indexes", []) + entry.get("search_indexes", []):
+        index["predicate"] = expression_key(index["predicate"])
+        if "expression" in index:
+            index["expression"] = expression_key(index["expression"])
+        for element in index.get("elements", []):
+            element["expression"] = expression_key(element["expression"])
+    return entry
+
+
+def conformance_differences(offline: Dict[str, Any], live: Dict[str, Any]) -> List[str]:
+    """
+    Where a DumpInspector snapshot differs from live reflection of the same
+    DDL. Planner statistics are ignored, and index expressions and predicates
+    are compared without whitespace and parentheses, which only differ in
+    how pg_get_expr() lays them out.
+    """
+    differences = []
+    for table_name in sorted(offline.keys() | live.keys()):
+        if table_name not in live:
+            differences.append(f"{table_name}: only in the dump")
+            continue
+        if table_name not in offline:
+            differences.append(f"{table_name}: only in the live database")
+            continue
+        dumped, reflected = _comparable(offline[table_name]), _comparable(live[table_name])
+        for key in sorted(dumped.keys() | reflected.keys()):
+            if dumped.get(key) != reflected.get(key):
+                differences.append(f"{table_name}.{key}:\n    dump: {json.dumps(dumped.get(key))}\n    live: {json.dumps(reflected.get(key))}")
+    return differences
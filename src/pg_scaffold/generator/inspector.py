@@ -1,3 +1,4 @@
+import copy
 import logging
 import os
 import json
@@ -38,14 +39,61 @@ class DatabaseInspector:
 
     def _tables_for_scheme(self):
         self.schema = {}
-        for table_name in self.inspector.get_table_names():
-            self.schema[table_name] = {
-                "table_name": table_name,
-                "class_name": table_name_to_class_name(table_name),
-                "file_name": table_name_to_file_name(table_name),
-                "columns": [],
-                "relationships": [],
-            }  # type: ignore
+        relations = [
+            ("table", self.inspector.get_table_names()),
+            ("view", self.inspector.get_view_names()),
+            ("materialized_view", self.inspector.get_materialized_view_names()),
+        ]
+        for kind, table_names in relations:
+            for table_name in table_names:
+                self.schema[table_name] = self._relation_entry(table_name, kind)  # type: ignore
+
+    def _relation_entry(self, table_name: str, kind: str) -> Dict[str, Any]:
+        return {
+            "table_name": table_name,
+            "kind": kind,
+            "class_name": table_name_to_class_name(table_name),
+            "file_name": table_name_to_file_name(table_name),
+            "columns": [],
+            "relationships": [],
+        }
+
+    def _view_key(self, table_name: str, columns: List[Dict[str, Any]], indexes: List[Dict[str, Any]]):
+        """
+        Identity columns for a view, which has no primary key: an `id` column,
+        else the columns of a full unique index (materialized views only).
+        Returns None when the view has neither.
+        """
+        if any(col["name"] == "id" for col in columns):
+            return ["id"]
+        for index in indexes:
+            if index["unique"] and not index["predicate"] and all(element["column"] for element in index["elements"]):
+                return [element["expression"].strip('"') for element in index["elements"]]
+        return None
+
+    def _inspect_view(self, table_name: str):
+        """Views and materialized views: columns, statistics and (matview) indexes; no constraints or FKs."""
+        table_info = self.schema[table_name]  # type: ignore
+        columns = self._columns_for_table(table_name)
+        indexes = self._indexes_for_table(table_name) if table_info["kind"] == "materialized_view" else []
+        key = self._view_key(table_name, columns, indexes)
+        if key is None:
+            logging.warning(f"Skipping view {table_name}: it needs an id column or a unique index to be addressable")
+            del self.schema[table_name]  # type: ignore
+            return
+
+        for col in columns:
+            col["primary_key"] = col["name"] in key
+        table_info["columns"].extend(columns)
+        table_info["unique_keys"] = [{"name": f"{table_name}_key", "columns": key}]
+        table_info["statistics"] = self._statistics_for_table(table_name)
+        table_info["indexes"] = indexes
+        table_info["search_indexes"] = self._search_indexes(indexes)
+        # REFRESH ... CONCURRENTLY needs a unique index over plain columns without a WHERE clause
+        table_info["concurrent_refresh"] = any(
+            index["unique"] and not index["predicate"] and all(element["column"] for element in index["elements"])
+            for index in indexes
+        )
 
     def _parse_default_value(self, raw_default):
         if raw_default is None:
@@ -135,10 +183,13 @@ class DatabaseInspector:
                     "type": str(column_name["type"]).split("(", 1)[0],
                     "var_len": getattr(column_name["type"], "length", None),
                     "nullable": column_name["nullable"],
+                    # Generated columns (e.g. a stored tsvector) are filled in by Postgres too
                     "server_default": (
-                        True if column_name["default"] is not None else False
+                        True if column_name["default"] is not None or column_name.get("computed") else False
                     ),
                     "server_default_value": python_default,
+                    # Identity columns have no default expression, but Postgres fills them in all the same
+                    "identity": bool(column_name.get("identity")),
                     "index": column_name["name"] in index_columns,
                     "unique": column_name["name"] in unique_columns,
                     "primary_key": column_name["name"] in primary_keys,
@@ -149,6 +200,168 @@ class DatabaseInspector:
 
         return columns
 
+    def _unique_keys_for_table(self, table_name: str):
+        """Column sets usable as an ON CONFLICT target: the PK, unique constraints and plain unique indexes."""
+        unique_keys = []
+        seen = set()
+
+        def add(name, columns):
+            if columns and tuple(columns) not in seen:
+                seen.add(tuple(columns))
+                unique_keys.append({"name": name, "columns": list(columns)})
+
+        pk_constraint = self.inspector.get_pk_constraint(table_name)
+        add(pk_constraint.get("name") or f"{table_name}_pkey", pk_constraint.get("constrained_columns", []))
+
+        for uc in self.inspector.get_unique_constraints(table_name):
+            add(uc.get("name"), uc["column_names"])
+
+        for index in self.inspector.get_indexes(table_name):
+            columns = index.get("column_names", [])
+            # Expression and partial indexes can't be inferred from a bare column list
+            if not index.get("unique") or None in columns or index.get("dialect_options", {}).get("postgresql_where"):
+                continue
+            add(index.get("name"), columns)
+
+        return unique_keys
+
+    def _statistics_for_table(self, table_name: str):
+        """
+        Planner statistics for the table: estimated rows (-1 until the table has
+        been analyzed), heap and total size in bytes, average row width, and
+        per-column null_frac / n_distinct / avg_width from pg_stats.
+        """
+        table_query = sa.text(
+            "SELECT c.reltuples::bigint AS row_estimate, "
+            "pg_relation_size(c.oid) AS table_bytes, pg_total_relation_size(c.oid) AS total_bytes "
+            "FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relname = :table_name AND n.nspname = current_schema()"
+        )
+        column_query = sa.text(
+            "SELECT attname, null_frac, n_distinct, avg_width FROM pg_stats "
+            "WHERE tablename = :table_name AND schemaname = current_schema()"
+        )
+        with self.engine.connect() as conn:
+            row = conn.execute(table_query, {"table_name": table_name}).mappings().first()
+            column_rows = conn.execute(column_query, {"table_name": table_name}).mappings().all()
+
+        columns = {
+            stat["attname"]: {
+                "null_frac": float(stat["null_frac"]),
+                # Negative n_distinct is a fraction of the row count (-1 = every value distinct)
+                "n_distinct": float(stat["n_distinct"]),
+                "avg_width": int(stat["avg_width"]),
+            }
+            for stat in column_rows
+        }
+        row_estimate = int(row["row_estimate"]) if row else -1
+        avg_row_bytes = sum(stat["avg_width"] for stat in columns.values()) if columns else None
+        if avg_row_bytes is None and row and row_estimate > 0:
+            avg_row_bytes = int(row["table_bytes"]) // row_estimate
+
+        return {
+            "row_estimate": row_estimate,
+            "table_bytes": int(row["table_bytes"]) if row else None,
+            "total_bytes": int(row["total_bytes"]) if row else None,
+            "avg_row_bytes": avg_row_bytes,
+            "columns": columns,
+        }
+
+    def _indexes_for_table(self, table_name: str):
+        """
+        Full definitions of the table's indexes except the primary key and
+        exclusion constraints: method, uniqueness, key elements (column or
+        expression, non-default operator class, sort order), INCLUDE columns
+        and the partial-index predicate. Indexes backing a UNIQUE constraint
+        are marked with the constraint name.
+        """
+        query = sa.text(
+            "SELECT i.relname AS name, am.amname AS method, ix.indisunique AS is_unique, "
+            "pg_get_expr(ix.indpred, ix.indrelid, true) AS predicate, "
+            "(SELECT con.conname FROM pg_constraint con WHERE con.conindid = ix.indexrelid AND con.contype = 'u') AS constraint_name, "
+            "ARRAY(SELECT pg_get_indexdef(ix.indexrelid, k, true) FROM generate_series(1, ix.indnkeyatts) AS k ORDER BY k) AS expressions, "
+            "ARRAY(SELECT ix.indkey[k - 1] <> 0 FROM generate_series(1, ix.indnkeyatts) AS k ORDER BY k) AS is_column, "
+            "ARRAY(SELECT ix.indoption[k - 1] FROM generate_series(1, ix.indnkeyatts) AS k ORDER BY k) AS options, "
+            "ARRAY(SELECT pg_get_indexdef(ix.indexrelid, k, true) FROM generate_series(ix.indnkeyatts + 1, ix.indnatts) AS k ORDER BY k) AS include, "
+            "ARRAY(SELECT opc.opcname FROM unnest(ix.indclass::oid[]) WITH ORDINALITY AS c(oid, ord) "
+            "      JOIN pg_opclass opc ON opc.oid = c.oid ORDER BY c.ord) AS opclasses, "
+            "ARRAY(SELECT opc.opcdefault FROM unnest(ix.indclass::oid[]) WITH ORDINALITY AS c(oid, ord) "
+            "      JOIN pg_opclass opc ON opc.oid = c.oid ORDER BY c.ord) AS opclass_defaults "
+            "FROM pg_index ix "
+            "JOIN pg_class i ON i.oid = ix.indexrelid "
+            "JOIN pg_class t ON t.oid = ix.indrelid "
+            "JOIN pg_namespace n ON n.oid = t.relnamespace "
+            "JOIN pg_am am ON am.oid = i.relam "
+            "WHERE t.relname = :table_name AND n.nspname = current_schema() AND NOT ix.indisprimary "
+            "AND NOT ix.indisexclusion "
+            "ORDER BY i.relname"
+        )
+        with self.engine.connect() as conn:
+            rows = conn.execute(query, {"table_name": table_name}).mappings().all()
+
+        indexes = []
+        for row in rows:
+            elements = []
+            for expression, is_column, option, opclass, is_default in zip(
+                row["expressions"], row["is_column"], row["options"], row["opclasses"], row["opclass_defaults"]
+            ):
+                elements.append(
+                    {
+                        "expression": expression,
+                        "column": is_column,
+                        "opclass": None if is_default else opclass,
+                        "opclass_name": opclass,
+                        # pg_index.indoption bits: 1 = DESC, 2 = NULLS FIRST
+                        "desc": bool(option & 1),
+                        "nulls_first": bool(option & 2),
+                    }
+                )
+            indexes.append(
+                {
+                    "name": row["name"],
+                    "method": row["method"],
+                    "unique": row["is_unique"],
+                    "constraint": row["constraint_name"],
+                    "elements": elements,
+                    "include": list(row["include"]),
+                    "predicate": row["predicate"],
+                }
+            )
+
+        return indexes
+
+    def _search_indexes(self, indexes: List[Dict[str, Any]]):
+        """
+        The elements of GIN/GiST indexes usable for text search: tsvector indexes
+        (on a tsvector column or a to_tsvector(...) expression) and pg_trgm
+        trigram indexes.
+        """
+        search_indexes = []
+        for index in indexes:
+            if index["method"] not in ("gin", "gist"):
+                continue
+            for element in index["elements"]:
+                if element["opclass_name"] in ("gin_trgm_ops", "gist_trgm_ops"):
+                    kind = "trigram"
+                elif element["opclass_name"] in ("tsvector_ops", "gist_tsvector_ops"):
+                    kind = "fulltext"
+                else:
+                    continue
+                config = re.search(r"to_tsvector\('([\w.]+)'::regconfig", element["expression"])
+                search_indexes.append(
+                    {
+                        "name": index["name"],
+                        "method": index["method"],
+                        "kind": kind,
+                        "expression": element["expression"],
+                        "config": config.group(1) if config else None,
+                        "opclass": element["opclass"],
+                        "predicate": index["predicate"],
+                    }
+                )
+
+        return search_indexes
+
     def _relationships_for_table(self, table_name: str):
         relationships = []
         reverse_relationships = []
@@ -195,45 +408,168 @@ class DatabaseInspector:
                 }
             )
 
-            reverse_relationships.append(
-                {
-                    "relationship_table_name": referred_table,
-                    "file_name": table_name_to_file_name(table_name),
-                    "model_name": table_name_to_class_name(table_name),
-                    "variable_name": table_name_to_variable_name(
-                        table_name, use_singular=is_one_to_one
-                    ),
-                    "back_populates": table_name_to_variable_name(
-                        referred_table, use_singular=True
-                    ),
-                    "use_list": True,  # Reverse is always one-to-many unless overridden manually
-                    "relation_type": "reverse",  # ← added type info
-                }
-            )
+            reverse_relationships.append(self._reverse_relationship(relationships[-1]))
 
         return relationships, reverse_relationships
 
+    @staticmethod
+    def _reverse_relationship(relationship: Dict[str, Any]) -> Dict[str, Any]:
+        """The referred table's side of a foreign_key relationship."""
+        table_name = relationship["relationship_table_name"]
+        return {
+            "relationship_table_name": relationship["referred_table"],
+            "file_name": table_name_to_file_name(table_name),
+            "model_name": table_name_to_class_name(table_name),
+            "variable_name": relationship["back_populates"],
+            "back_populates": relationship["variable_name"],
+            "use_list": True,  # Reverse is always one-to-many unless overridden manually
+            "relation_type": "reverse",  # ← added type info
+        }
+
+    def _inspect_table(self, table_name: str) -> None:
+        if self.schema[table_name]["kind"] != "table":  # type: ignore
+            self._inspect_view(table_name)
+            return
+        columns_info = self._columns_for_table(table_name)
+        foreign_key, _ = self._relationships_for_table(table_name)
+
+        self.schema[table_name]["columns"].extend(columns_info)  # type: ignore
+        self.schema[table_name]["relationships"].extend(foreign_key)  # type: ignore
+        self.schema[table_name]["unique_keys"] = self._unique_keys_for_table(table_name)  # type: ignore
+        self.schema[table_name]["statistics"] = self._statistics_for_table(table_name)  # type: ignore
+        self.schema[table_name]["indexes"] = self._indexes_for_table(table_name)  # type: ignore
+        self.schema[table_name]["search_indexes"] = self._search_indexes(self.schema[table_name]["indexes"])  # type: ignore
+
+    def _link_reverse_relationships(self) -> None:
+        """Give every referred table the reverse side of the foreign keys pointing at it, then link many-to-many pairs."""
+        for table_info in self.schema.values():  # type: ignore
+            table_info["relationships"] = [rel for rel in table_info["relationships"] if rel["relation_type"] != "reverse"]
+
+        for table_info in list(self.schema.values()):  # type: ignore
+            for relationship in table_info["relationships"]:
+                owner = relationship.get("referred_table")
+                if relationship["relation_type"] == "foreign_key" and owner in self.schema:
+                    self.schema[owner]["relationships"].append(self._reverse_relationship(relationship))  # type: ignore
+
+        self._link_many_to_many()
+
+    def _association_ends(self, table_info: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        The two foreign_key relationships of a pure association table, else
+        None: a table whose primary key is exactly two single-column foreign
+        keys to two other tables, and whose remaining columns (if any) fill
+        themselves in, e.g. a created_at default, so a link is just the pair.
+        """
+        if table_info.get("kind", "table") != "table":
+            return None
+        foreign_keys = [rel for rel in table_info["relationships"] if rel["relation_type"] == "foreign_key"]
+        if len(foreign_keys) != 2 or foreign_keys[0]["referred_table"] == foreign_keys[1]["referred_table"]:
+            return None
+        if any(self.schema.get(fk["referred_table"], {}).get("kind", "table") != "table" for fk in foreign_keys):  # type: ignore
+            return None
+        columns = table_info["columns"]
+        primary_keys = {col["name"] for col in columns if col["primary_key"]}
+        if primary_keys != {fk["referred_variable"] for fk in foreign_keys}:
+            return None
+        if any(not col["nullable"] and not col["server_default"] for col in columns if not col["primary_key"]):
+            return None
+        return foreign_keys
+
+    def _link_many_to_many(self) -> None:
+        """
+        Give both tables joined by a pure association table a many_to_many
+        relationship through it (secondary=). The association table keeps its
+        own model and foreign_key/reverse relationships.
+        """
+        for table_info in self.schema.values():  # type: ignore
+            table_info["relationships"] = [rel for rel in table_info["relationships"] if rel["relation_type"] != "many_to_many"]
+
+        for table_name, table_info in list(self.schema.items()):  # type: ignore
+            ends = self._association_ends(table_info)
+            if ends is None:
+                continue
+            (left, right) = ends
+            names = {}
+            for end, other in ((left, right), (right, left)):
+                owner = self.schema[end["referred_table"]]  # type: ignore
+                taken = {col["name"] for col in owner["columns"]} | {rel["variable_name"] for rel in owner["relationships"]}
+                name = table_name_to_variable_name(other["referred_table"], use_singular=False)
+                names[end["referred_table"]] = name if name not in taken else f"{name}_via_{table_name}"
+
+            for end, other in ((left, right), (right, left)):
+                self.schema[end["referred_table"]]["relationships"].append(  # type: ignore
+                    {
+                        "relationship_table_name": end["referred_table"],
+                        "file_name": table_name_to_file_name(other["referred_table"]),
+                        "model_name": table_name_to_class_name(other["referred_table"]),
+                        "variable_name": names[end["referred_table"]],
+                        "back_populates": names[other["referred_table"]],
+                        "use_list": True,
+                        "referred_table": other["referred_table"],
+                        "secondary": table_name,
+                        "local_column": end["referred_variable"],
+                        "remote_column": other["referred_variable"],
+                        "relation_type": "many_to_many",
+                    }
+                )
+
     def inspect(self) -> Dict[str, Any]:
 
         self._tables_for_scheme()
 
-        reverse_relationships = []
-        for table_name in self.schema.keys():  # type: ignore
-            columns_info = self._columns_for_table(table_name)
-            foreign_key, reverse = self._relationships_for_table(table_name)
+        for table_name in list(self.schema.keys()):  # type: ignore
+            self._inspect_table(table_name)
 
-            self.schema[table_name]["columns"].extend(columns_info)  # type: ignore
-            self.schema[table_name]["relationships"].extend(foreign_key)  # type: ignore
-            reverse_relationships.extend(reverse)  # type: ignore
-
-        for relationship in reverse_relationships:
-            owner = relationship["relationship_table_name"]
-            self.schema[owner]["relationships"].append(relationship)  # type: ignore
+        self._link_reverse_relationships()
 
         return self.schema  # type: ignore
 
-    def generate_scheme_json(self) -> None:
-        """Writes one JSON file per table in the output_dir."""
+    def fingerprints(self) -> Dict[str, str]:
+        """
+        One md5 per table, view and materialized view in the current schema over
+        what generation depends on: columns (name, type, nullability, default),
+        constraints and index definitions. Planner statistics are left out, so
+        only DDL changes a fingerprint. A single catalog query, cheap to poll.
+        """
+        query = sa.text(
+            "SELECT c.relname, md5(concat_ws('|', c.relkind, "
+            "(SELECT string_agg(a.attname || ':' || format_type(a.atttypid, a.atttypmod) || ':' || a.attnotnull || ':' "
+            "|| coalesce(pg_get_expr(d.adbin, d.adrelid), ''), ',' ORDER BY a.attnum) "
+            "FROM pg_attribute a LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum "
+            "WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped), "
+            "(SELECT string_agg(k.conname || ':' || pg_get_constraintdef(k.oid), ',' ORDER BY k.conname) "
+            "FROM pg_constraint k WHERE k.conrelid = c.oid), "
+            "(SELECT string_agg(pg_get_indexdef(i.indexrelid), ',' ORDER BY i.indexrelid) "
+            "FROM pg_index i WHERE i.indrelid = c.oid))) AS fingerprint "
+            "FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE n.nspname = current_schema() AND c.relkind IN ('r', 'p', 'v', 'm')"
+        )
+        with self.engine.connect() as conn:
+            return {row.relname: row.fingerprint for row in conn.execute(query)}
+
+    def refresh(self, schema: Dict[str, Any], table_names: List[str]) -> Dict[str, Any]:
+        """
+        Re-inspect only table_names on top of a previous snapshot: the other
+        tables keep their snapshot entries, tables gone from the database are
+        dropped, and reverse relationships are relinked across all tables.
+        """
+        self.inspector.clear_cache()
+        self._tables_for_scheme()
+        fresh = self.schema  # type: ignore
+        self.schema = {}
+        for table_name, entry in fresh.items():  # type: ignore
+            if table_name in table_names or table_name not in schema:
+                self.schema[table_name] = entry
+                self._inspect_table(table_name)
+            else:
+                self.schema[table_name] = copy.deepcopy(schema[table_name])
+
+        self._link_reverse_relationships()
+
+        return self.schema
+
+    def generate_scheme_json(self, table_names: Optional[List[str]] = None) -> None:
+        """Writes one JSON file per table (or per table in table_names) in the output_dir."""
         if self.schema is None:
             self.inspect()
 
@@ -241,6 +577,8 @@ class DatabaseInspector:
         os.makedirs(metadata_dir, exist_ok=True)
 
         for table_name, table_data in self.schema.items():
+            if table_names is not None and table_name not in table_names:
+                continue
             # print(f"Writing metadata JSON files to: {table_data}")
             # print("*" * 40)
             file_path = os.path.join(metadata_dir, f"{table_name}.json")
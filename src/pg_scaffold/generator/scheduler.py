@@ -0,0 +1,172 @@
+# pg_scaffold/generator/scheduler.py
+
+import time
+import importlib
+import importlib.util
+from importlib.metadata import entry_points
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Set, Tuple, Type
+
+from pg_scaffold.generator.base import CodeGenerator
+
+# Third-party generators: [project.entry-points."pg_scaffold.generators"] MyGenerator = "my_pkg.module:MyGenerator"
+ENTRY_POINT_GROUP = "pg_scaffold.generators"
+
+# Built-in generators and their module in pg_scaffold.generator.<version>, in the order they used to run
+BUILTIN_GENERATORS = {
+    "ModelGenerator": "model_generator",
+    "SchemaGenerator": "schema_generator",
+    "CRUDGenerator": "crud_generator",
+    "APIGenerator": "api_generator",
+    "MainGenerator": "main_generator",
+    "HelperGenerator": "helper_generator",
+    "TypescriptGenerator": "typescript_generator",
+}
+
+
+class GeneratorRegistry:
+    """
+    Generator classes by name, imported the first time they are needed.
+
+    The built-ins of a version are registered when their module exists, found
+    with importlib.util.find_spec so nothing is imported yet; entry points in
+    ENTRY_POINT_GROUP come after them, and one registered under a built-in
+    name replaces it.
+    """
+
+    def __init__(self, version: str):
+        self.version = version
+        self.loaders: Dict[str, Callable[[], Type[CodeGenerator]]] = {}
+        self.loaded: Dict[str, Optional[Type[CodeGenerator]]] = {}
+
+    def register(self, name: str, loader: Callable[[], Type[CodeGenerator]]) -> None:
+        self.loaders[name] = loader
+        self.loaded.pop(name, None)
+
+    def register_builtins(self) -> int:
+        """Register the built-in generators of self.version; returns how many exist."""
+        count = 0
+        for name, module_name in BUILTIN_GENERATORS.items():
+            path = f"pg_scaffold.generator.{self.version}.{module_name}"
+            try:
+                found = importlib.util.find_spec(path) is not None
+            except ModuleNotFoundError:
+                found = False
+            if not found:
+                print(f"⚠️  WARNING: {name} not found for version '{self.version}', skipping.")
+                continue
+            self.register(name, lambda path=path, name=name: getattr(importlib.import_module(path), name))
+            count += 1
+        return count
+
+    def register_entry_points(self) -> int:
+        """Register the generators other packages expose in ENTRY_POINT_GROUP; returns how many."""
+        found = entry_points(group=ENTRY_POINT_GROUP)
+        for entry_point in found:
+            self.register(entry_point.name, entry_point.load)
+        return len(found)
+
+    def names(self) -> List[str]:
+        return list(self.loaders)
+
+    def load(self, name: str) -> Optional[Type[CodeGenerator]]:
+        """The generator class, or None (with a warning) when it cannot be imported."""
+        if name not in self.loaded:
+            try:
+                self.loaded[name] = self.loaders[name]()
+            except (ImportError, AttributeError) as e:
+                print(f"⚠️  WARNING: could not load {name}, skipping: {e}")
+                self.loaded[name] = None
+        return self.loaded[name]
+
+
+def _overlaps(paths: Tuple[str, ...], others: Tuple[str, ...]) -> bool:
+    """Whether any path is, contains or sits inside one of others ("app/models/" covers "app/models/user.py")."""
+    return any(path.startswith(other) or other.startswith(path) for path in paths for other in others)
+
+
+class GeneratorScheduler:
+    """
+    Runs generators on a thread pool, each one as soon as the generators it
+    depends on have finished.
+
+    A generator depends on an earlier-registered one when it reads one of its
+    outputs, or when both write the same path (so the later one still wins,
+    as with the old fixed order). Generators that only read schema_json and
+    write their own directory run side by side. Threads rather than processes,
+    since CodePreservationManager.batch_writer routes every write of a run
+    through one StagedOutput writer.
+    """
+
+    def __init__(self, generators: Dict[str, Type[CodeGenerator]], max_workers: Optional[int] = None):
+        self.generators = generators
+        self.max_workers = max_workers
+
+    def dependencies(self) -> Dict[str, Set[str]]:
+        """Generator name -> names of the generators it waits for."""
+        names = list(self.generators)
+        dependencies: Dict[str, Set[str]] = {name: set() for name in names}
+        for i, name in enumerate(names):
+            generator = self.generators[name]
+            for other_name in names:
+                other = self.generators[other_name]
+                if other_name == name:
+                    continue
+                if _overlaps(generator.inputs, other.outputs):
+                    dependencies[name].add(other_name)
+                elif names.index(other_name) < i and _overlaps(generator.outputs, other.outputs):
+                    dependencies[name].add(other_name)
+
+        self._check_cycles(dependencies)
+        return dependencies
+
+    @staticmethod
+    def _check_cycles(dependencies: Dict[str, Set[str]]) -> None:
+        remaining = {name: set(waits_for) for name, waits_for in dependencies.items()}
+        while remaining:
+            ready = [name for name, waits_for in remaining.items() if not waits_for]
+            if not ready:
+                raise ValueError(f"Generators depend on each other's outputs in a cycle: {', '.join(sorted(remaining))}")
+            for name in ready:
+                del remaining[name]
+            for waits_for in remaining.values():
+                waits_for.difference_update(ready)
+
+    def run(self, run_one: Callable[[str, Type[CodeGenerator]], None]) -> Dict[str, float]:
+        """
+        Call run_one(name, generator class) for every generator in dependency order.
+        Returns the seconds each one took; the first error is re-raised once the
+        generators already running have finished, and nothing new is started.
+        """
+        dependencies = self.dependencies()
+        timings: Dict[str, float] = {}
+        running: Dict[Future, str] = {}
+        done: Set[str] = set()
+        error: Optional[BaseException] = None
+
+        def timed(name: str) -> None:
+            start = time.perf_counter()
+            try:
+                run_one(name, self.generators[name])
+            finally:
+                timings[name] = time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pg_scaffold-generator") as pool:
+            pending = list(dependencies)
+            while pending or running:
+                if error is None:
+                    for name in [name for name in pending if dependencies[name] <= done]:
+                        pending.remove(name)
+                        running[pool.submit(timed, name)] = name
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    if future.exception() is not None and error is None:
+                        error = future.exception()
+                    done.add(name)
+
+        if error is not None:
+            raise error
+        return timings
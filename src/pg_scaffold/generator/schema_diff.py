@@ -0,0 +1,85 @@
+# pg_scaffold/generator/schema_diff.py
+
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from pg_scaffold.generator.utils import get_table_strategy
+
+
+def dependency_graph(*schemas: Dict[str, Any]) -> Dict[str, Set[str]]:
+    """
+    Table -> tables it shares a foreign key or an association table with,
+    in either direction. Both sides of a relationship render against each
+    other (relationship() with back_populates in the models, WithRelations
+    in the schemas), so a change on one side means re-rendering the other.
+    Several snapshots can be merged, e.g. before and after a change, so
+    relationships that were just dropped still count.
+    """
+    graph: Dict[str, Set[str]] = {}
+    for schema in schemas:
+        for table_name, info in schema.items():
+            graph.setdefault(table_name, set())
+            for relationship in info.get("relationships", []):
+                if relationship.get("relation_type") not in ("foreign_key", "many_to_many"):
+                    continue
+                referred_table = relationship["referred_table"]
+                if referred_table != table_name:
+                    graph[table_name].add(referred_table)
+                    graph.setdefault(referred_table, set()).add(table_name)
+    return graph
+
+
+def with_neighbours(tables: Iterable[str], graph: Dict[str, Set[str]]) -> Set[str]:
+    """The tables plus their direct relationship neighbours."""
+    selected = set(tables)
+    for table_name in list(selected):
+        selected |= graph.get(table_name, set())
+    return selected
+
+
+def _generation_inputs(table_name: str, info: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+    """What the generated files of a table depend on: the snapshot entry, with statistics reduced to the strategy they pick."""
+    inputs = {key: value for key, value in info.items() if key != "statistics"}
+    inputs["strategy"] = get_table_strategy(table_name, info, options)
+    return inputs
+
+
+def diff_schemas(previous: Dict[str, Any], current: Dict[str, Any], options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Compare two snapshots and return what to regenerate:
+
+        {"changed": [...],     tables added or whose generation inputs changed
+         "tables": [...],      changed tables plus their relationship neighbours
+         "dropped": [...],     tables gone from the current snapshot
+         "aggregates": bool}   whether files listing every table must be rewritten
+
+    Planner statistics only count through the strategy they select, so a
+    re-ANALYZE that moves row estimates does not regenerate anything unless
+    it crosses a threshold.
+    """
+    options = options or {}
+    inputs = {table_name: _generation_inputs(table_name, info, options) for table_name, info in current.items()}
+    previous_inputs = {table_name: _generation_inputs(table_name, info, options)
+                       for table_name, info in previous.items() if table_name in current}
+
+    changed = sorted(table_name for table_name in current if previous_inputs.get(table_name) != inputs[table_name])
+    dropped = sorted(previous.keys() - current.keys())
+    graph = dependency_graph(previous, current)
+    tables = sorted(with_neighbours(changed + dropped, graph) & current.keys())
+
+    def aggregate_inputs(table_inputs: Dict[str, Any]):
+        return table_inputs.get("kind"), table_inputs["relationships"], table_inputs["strategy"]["lookup"]
+
+    aggregates = previous.keys() != current.keys() or any(
+        aggregate_inputs(previous_inputs[table_name]) != aggregate_inputs(inputs[table_name])
+        for table_name in changed if table_name in previous_inputs
+    )
+    return {"changed": changed, "tables": tables, "dropped": dropped, "aggregates": aggregates}
+
+
+def select_tables(schema: Dict[str, Any], tables: List[str]) -> Dict[str, Any]:
+    """What to regenerate for an explicit table list: the tables, their neighbours and the aggregates."""
+    unknown = sorted(set(tables) - schema.keys())
+    if unknown:
+        raise ValueError(f"Unknown tables: {', '.join(unknown)}")
+    closure = with_neighbours(tables, dependency_graph(schema))
+    return {"changed": sorted(set(tables)), "tables": sorted(closure), "dropped": [], "aggregates": True}
@@ -0,0 +1,150 @@
+# pg_scaffold/generator/staging.py
+
+import os
+import errno
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pg_scaffold.preserve_custom.preservation import CodePreservationManager
+
+GENERATED_HEADER = "Generated by pg-scaffolding"
+
+
+def _write_file(path: str, content: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+class BatchWriter:
+    """
+    Writes files on a thread pool; flush() waits for all of them and re-raises the first error.
+    submit() may be called from several generator threads at once.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pg_scaffold-writer")
+        self.pending: Dict[str, Future] = {}
+        self.lock = threading.Lock()
+
+    def submit(self, path: str, content: str) -> None:
+        with self.lock:
+            previous = self.pending.get(path)
+            if previous is not None:
+                # Same file written twice: the later content must win
+                previous.result()
+            self.pending[path] = self.executor.submit(_write_file, path, content)
+
+    def flush(self) -> None:
+        try:
+            for future in self.pending.values():
+                future.result()
+        finally:
+            self.pending = {}
+            self.executor.shutdown()
+
+
+class StagedOutput:
+    """
+    A staging directory next to output_dir that a whole generation run is
+    rendered into, custom code included, and then swapped into the live tree.
+
+    commit() moves each staged file over its live counterpart with os.replace,
+    which is atomic per file, so a running dev server or test run never reads
+    a half-written module. Files whose content only differs in the generated
+    header's timestamp are left alone, so unchanged modules do not trigger a
+    reload. Leaf modules go first and the files listing them (`last`) after,
+    so aggregates never import something that is not there yet.
+    """
+
+    def __init__(self, output_dir: str):
+        self.output_dir = os.path.normpath(output_dir)
+        parent = os.path.dirname(os.path.abspath(self.output_dir))
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f".{os.path.basename(os.path.abspath(self.output_dir))}-staging-", dir=parent)
+        # Generators expect a path relative to the working directory
+        self.path = os.path.relpath(staging)
+
+    @contextmanager
+    def writer(self, max_workers: Optional[int] = None):
+        """Route CodePreservationManager.write_code through a BatchWriter for the duration."""
+        batch_writer = BatchWriter(max_workers)
+        CodePreservationManager.batch_writer = batch_writer
+        try:
+            yield batch_writer
+        finally:
+            CodePreservationManager.batch_writer = None
+            batch_writer.flush()
+
+    def staged_files(self) -> List[str]:
+        files = []
+        for root, _, file_names in os.walk(self.path):
+            for file_name in file_names:
+                files.append(os.path.relpath(os.path.join(root, file_name), self.path))
+        return sorted(files)
+
+    @staticmethod
+    def _same_content(live_path: str, staged_path: str) -> bool:
+        if not os.path.exists(live_path):
+            return False
+        with open(live_path, "rb") as f:
+            live = f.read()
+        with open(staged_path, "rb") as f:
+            staged = f.read()
+        if live == staged:
+            return True
+        live_header, _, live_body = live.partition(b"\n")
+        staged_header, _, staged_body = staged.partition(b"\n")
+        header = GENERATED_HEADER.encode()
+        return header in live_header and header in staged_header and live_body == staged_body
+
+    def _swap(self, relative_path: str) -> bool:
+        staged_path = os.path.join(self.path, relative_path)
+        live_path = os.path.join(self.output_dir, relative_path)
+        if os.path.basename(relative_path) == "__init__.py" and os.path.getsize(staged_path) == 0 and os.path.exists(live_path):
+            # Package marker from ensure_package_dirs; a selective run did not render the real __init__.py
+            return False
+        if self._same_content(live_path, staged_path):
+            return False
+
+        os.makedirs(os.path.dirname(live_path), exist_ok=True)
+        try:
+            os.replace(staged_path, live_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # Staging is on another filesystem: copy next to the target first, then rename
+            temp_path = f"{live_path}.pg_scaffold-tmp"
+            shutil.copyfile(staged_path, temp_path)
+            os.replace(temp_path, live_path)
+        return True
+
+    def commit(self, last: Iterable[str] = (), remove: Iterable[str] = (), max_workers: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Swap the staged files into output_dir, then delete `remove` (live paths
+        relative to output_dir). Returns (files replaced, files left unchanged).
+        """
+        last = [os.path.normpath(path) for path in last]
+        staged = self.staged_files()
+        first = [path for path in staged if path not in last]
+        later = [path for path in last if path in staged]
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pg_scaffold-swap") as pool:
+            swapped = list(pool.map(self._swap, first))
+        swapped += [self._swap(path) for path in later]
+
+        for path in remove:
+            live_path = os.path.join(self.output_dir, path)
+            if os.path.exists(live_path):
+                os.remove(live_path)
+                print(f"Removed file: {live_path}")
+
+        replaced = sum(swapped)
+        return replaced, len(swapped) - replaced
+
+    def discard(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
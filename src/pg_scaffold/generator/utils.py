@@ -3,6 +3,7 @@ import os
 from typing import Optional
 from typing import Any, Union
 import inflect
+import json
 import re
 
 inflector = inflect.engine()
@@ -90,6 +91,7 @@ def map_pg_type_to_sqlalchemy_type(pg_type: str) -> str:
         "FLOAT": "Float",
         "DATE": "Date",
         "UUID": "UUID",
+        "TSVECTOR": "TSVECTOR",
     }
     return mapping.get(pg_type.upper(), "String")  # default fallback
 
@@ -139,6 +141,150 @@ def map_pg_column_to_python(pg_col: dict, optional:bool = False) -> str:
     return  f"Optional[{data_type}] = None" if optional else data_type
 
 
+def is_view(table_schema: dict) -> bool:
+    """Views and materialized views are generated as read-only resources."""
+    return table_schema.get("kind", "table") != "table"
+
+
+def get_unique_keys(table_schema: dict) -> list[dict]:
+    """
+    Unique column sets of a table from the schema snapshot, each named after its
+    columns. Snapshots written before unique_keys was captured fall back to the
+    per-column primary_key/unique flags.
+    """
+    unique_keys = table_schema.get("unique_keys")
+    if unique_keys is None:
+        columns = table_schema.get("columns", [])
+        unique_keys = [{"columns": [col["name"] for col in columns if col.get("primary_key")]}]
+        unique_keys += [{"columns": [col["name"]]} for col in columns if col.get("unique") and not col.get("primary_key")]
+
+    return [{"key": "_".join(key["columns"]), "columns": key["columns"]} for key in unique_keys if key["columns"]]
+
+
+def python_literal(value: Any) -> str:
+    """Source literal for a str/None value in generated code, double-quoted like the templates."""
+    return json.dumps(value) if isinstance(value, str) else repr(value)
+
+
+def get_search_fields(table_schema: dict) -> dict:
+    """
+    Searchable expressions of a table: tsvector expressions (indexed or plain
+    tsvector columns) with their text search config, and trigram-indexed
+    expressions. Each expression is spelled exactly as its index defines it
+    so the planner can use the index.
+    """
+    fulltext, trigram = [], []
+    for index in table_schema.get("search_indexes", []):
+        if index["kind"] == "fulltext" and index["expression"] not in [f["expression"] for f in fulltext]:
+            fulltext.append({"expression": index["expression"], "config": index["config"]})
+        elif index["kind"] == "trigram" and index["expression"] not in trigram:
+            trigram.append(index["expression"])
+
+    for col in table_schema.get("columns", []):
+        if col["type"].upper() == "TSVECTOR" and col["name"] not in [f["expression"] for f in fulltext]:
+            fulltext.append({"expression": col["name"], "config": None})
+
+    return {"fulltext": fulltext, "trigram": trigram}
+
+
+NUMERIC_PG_TYPES = {"INTEGER", "INT", "BIGINT", "SMALLINT", "REAL", "FLOAT", "FLOAT4", "FLOAT8", "DOUBLE PRECISION", "NUMERIC", "DECIMAL"}
+ORDERED_PG_TYPES = {"TEXT", "VARCHAR", "CHAR", "TIMESTAMP", "TIMESTAMPTZ", "DATE"}
+GROUPABLE_PG_TYPES = NUMERIC_PG_TYPES | ORDERED_PG_TYPES | {"BOOLEAN", "UUID"}
+
+
+def get_aggregate_columns(table_schema: dict) -> dict:
+    """
+    What /aggregate may do with each column, by type: columns that can be
+    grouped by, and the aggregate functions Postgres defines for them
+    (sum/avg on numbers, min/max on ordered types, count on anything).
+    """
+    group_by, functions = [], {}
+    for col in table_schema.get("columns", []):
+        pg_type = col["type"].upper().split("(")[0].strip()
+        if pg_type in NUMERIC_PG_TYPES:
+            functions[col["name"]] = ["count", "sum", "avg", "min", "max"]
+        elif pg_type in ORDERED_PG_TYPES:
+            functions[col["name"]] = ["count", "min", "max"]
+        else:
+            functions[col["name"]] = ["count"]
+        if pg_type in GROUPABLE_PG_TYPES:
+            group_by.append(col["name"])
+    return {"group_by": group_by, "functions": functions}
+
+
+# Thresholds behind the per-table strategies; the config file's "defaults" section overrides them.
+STRATEGY_DEFAULTS = {
+    "page_size": 100,             # default limit of list routes
+    "max_page_size": 1000,        # upper bound of the limit parameter
+    "keyset_min_rows": 1_000_000, # from here on list routes page by id instead of OFFSET
+    "wide_row_bytes": 2048,       # rows wider than this get proportionally smaller pages
+    "export_batch_size": 1000,    # rows per fetch of the streaming export
+    "lookup_max_rows": 0,         # tables at most this big are cached in memory (0 disables)
+}
+
+# Keys a table may set in the config file's "tables" section.
+STRATEGY_KEYS = ("pagination", "page_size", "max_page_size", "export_batch_size", "lookup")
+
+
+def has_id_key(table_schema: dict) -> bool:
+    """Whether the primary key is the single `id` column that by-id routes, keyset paging and the lookup cache use."""
+    return [col["name"] for col in table_schema.get("columns", []) if col["primary_key"]] == ["id"]
+
+
+def get_table_strategy(table_name: str, table_schema: dict, options: dict) -> dict:
+    """
+    Per-table generation defaults chosen from the snapshot statistics:
+    keyset pagination for large tables, smaller pages and export batches for
+    wide rows, the in-memory cache for small ones. Entries of the config
+    file's "tables" section override the result per table.
+    """
+    defaults = {**STRATEGY_DEFAULTS, **options.get("strategy_defaults", {})}
+    if options.get("lookup_max_rows"):
+        defaults["lookup_max_rows"] = options["lookup_max_rows"]
+
+    statistics = table_schema.get("statistics", {})
+    row_estimate = statistics.get("row_estimate", -1)
+    row_bytes = statistics.get("avg_row_bytes") or 0
+    shrink = min(1.0, defaults["wide_row_bytes"] / row_bytes) if row_bytes else 1.0
+    max_rows = defaults["lookup_max_rows"]
+
+    strategy = {
+        "pagination": "keyset" if row_estimate >= defaults["keyset_min_rows"] else "offset",
+        "page_size": max(10, int(defaults["page_size"] * shrink)),
+        "max_page_size": max(10, int(defaults["max_page_size"] * shrink)),
+        "export_batch_size": max(100, int(defaults["export_batch_size"] * shrink)),
+        # Views can't carry the NOTIFY triggers that keep the cache fresh
+        "lookup": not is_view(table_schema) and (
+            table_name in options.get("lookup_tables", []) or (max_rows > 0 and 0 <= row_estimate <= max_rows)
+        ),
+    }
+    strategy.update(options.get("table_overrides", {}).get(table_name, {}))
+    if not has_id_key(table_schema):
+        # Keyset paging and the lookup cache key rows by id
+        strategy["pagination"] = "offset"
+        strategy["lookup"] = False
+    strategy["max_page_size"] = max(strategy["max_page_size"], strategy["page_size"])
+    return strategy
+
+
+def is_lookup_table(table_name: str, table_schema: dict, options: dict) -> bool:
+    """
+    A table is a lookup when listed in --lookup_tables, when its analyzed row
+    estimate is at most lookup_max_rows, or when the config file says so.
+    """
+    return get_table_strategy(table_name, table_schema, options)["lookup"]
+
+
+def load_schema_json(sql_json_dir: str) -> dict:
+    """Schema snapshot as written by DatabaseInspector: table name -> table info, one JSON file per table."""
+    schema = {}
+    for file_name in sorted(os.listdir(sql_json_dir)):
+        if file_name.endswith(".json"):
+            with open(os.path.join(sql_json_dir, file_name), "r", encoding="utf-8") as f:
+                schema[file_name[:-len(".json")]] = json.load(f)
+    return schema
+
+
 def ensure_package_dirs(path: str, stop_at: str):
     """
     Ensures that `path` and all parent directories up to (and including)
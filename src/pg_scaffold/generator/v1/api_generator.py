@@ -1,16 +1,18 @@
 # app/generator/model_generator.py
 
 import os
+from typing import Any, Dict, Optional
 
 from pg_scaffold.generator.base import CodeGenerator
 from pg_scaffold.generator.utils import snake_to_pascal, map_pg_column_to_python
 from pg_scaffold.preserve_custom.preservation import CodePreservationManager 
 
 class APIGenerator(CodeGenerator):
+    outputs = ("app/api/",)
     
-    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str):
+    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str, options: Optional[Dict[str, Any]] = None):
         output_dir = os.path.join(output_dir, "app/api")
-        super().__init__(sql_json_dir, output_dir, "api.py.j2",gen_version)        
+        super().__init__(sql_json_dir, output_dir, "api.py.j2", gen_version, options)        
 
             
     def generate(self) -> None:
@@ -1,6 +1,7 @@
 # app/generator/model_generator.py
 
 import os
+from typing import Any, Dict, Optional
 import shutil
 from jinja2 import Environment, FileSystemLoader
 from pg_scaffold.generator.base import CodeGenerator
@@ -9,10 +10,11 @@ from pg_scaffold.preserve_custom.preservation import CodePreservationManager
 
 
 class CRUDGenerator(CodeGenerator):
+    outputs = ("app/crud/",)
     
-    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str):
+    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str, options: Optional[Dict[str, Any]] = None):
         output_dir = os.path.join(output_dir, "app/crud")
-        super().__init__(sql_json_dir, output_dir, "crud.py.j2",gen_version)
+        super().__init__(sql_json_dir, output_dir, "crud.py.j2", gen_version, options)
         src = os.path.join(self.template_dir, "crud_base.py")
         dst = os.path.join(output_dir, "base.py")
         shutil.copyfile(src, dst)
@@ -1,12 +1,14 @@
 # app/generator/helper_generator.py
 
 import os
+from typing import Any, Dict, Optional
 import shutil
 from pg_scaffold.generator.base import CodeGenerator
 
 class HelperGenerator(CodeGenerator):
-    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str):
-        super().__init__(sql_json_dir, output_dir, None, gen_version)
+    outputs = ("run_app.sh", ".env")
+    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str, options: Optional[Dict[str, Any]] = None):
+        super().__init__(sql_json_dir, output_dir, None, gen_version, options)
 
     def generate(self) -> None:
         # Copy helper files
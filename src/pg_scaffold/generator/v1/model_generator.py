@@ -1,6 +1,7 @@
 # app/generator/model_generator.py
 
 import os
+from typing import Any, Dict, Optional
 import shutil
 from pg_scaffold.generator.base import CodeGenerator
 
@@ -8,10 +9,11 @@ from pg_scaffold.generator.utils import map_pg_type_to_sqlalchemy_type, map_pg_c
 from pg_scaffold.preserve_custom.preservation import CodePreservationManager 
 
 class ModelGenerator(CodeGenerator):
+    outputs = ("app/models/",)
     
-    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str):
+    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str, options: Optional[Dict[str, Any]] = None):
         output_dir = os.path.join(output_dir, "app/models")
-        super().__init__(sql_json_dir, output_dir, "model.py.j2",gen_version)
+        super().__init__(sql_json_dir, output_dir, "model.py.j2", gen_version, options)
         src = os.path.join(self.template_dir, "model_base.py")
         dst = os.path.join(output_dir, "base.py")
         shutil.copyfile(src, dst)        
@@ -1,16 +1,18 @@
 # app/generator/model_generator.py
 
 import os
+from typing import Any, Dict, Optional
 import shutil
 from pg_scaffold.generator.base import CodeGenerator
 from pg_scaffold.generator.utils import snake_to_pascal, map_pg_column_to_python
 from pg_scaffold.preserve_custom.preservation import CodePreservationManager 
 
 class SchemaGenerator(CodeGenerator):
+    outputs = ("app/schemas/",)
     
-    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str):
+    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str, options: Optional[Dict[str, Any]] = None):
         output_dir = os.path.join(output_dir, "app/schemas")
-        super().__init__(sql_json_dir, output_dir, "schema.py.j2",gen_version)
+        super().__init__(sql_json_dir, output_dir, "schema.py.j2", gen_version, options)
         src = os.path.join(self.template_dir, "schema_base.py")
         dst = os.path.join(output_dir, "base.py")
         shutil.copyfile(src, dst)           
@@ -1,25 +1,62 @@
 # app/generator/model_generator.py
 
 import os
+from typing import Any, Dict, Optional
 
 from pg_scaffold.generator.base import CodeGenerator
-from pg_scaffold.generator.utils import snake_to_pascal, map_pg_column_to_python
+from pg_scaffold.generator.utils import snake_to_pascal, map_pg_column_to_python, get_unique_keys, get_search_fields, get_table_strategy, has_id_key, is_view
 from pg_scaffold.preserve_custom.preservation import CodePreservationManager 
 
 class APIGenerator(CodeGenerator):
+    outputs = ("app/api/",)
     
-    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str):
+    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str, options: Optional[Dict[str, Any]] = None):
         output_dir = os.path.join(output_dir, "app/api")
-        super().__init__(sql_json_dir, output_dir, "api.py.j2",gen_version)        
+        super().__init__(sql_json_dir, output_dir, "api.py.j2", gen_version, options)        
+
+    def _use_json_fast_path(self, table_name: str, table_info: dict) -> bool:
+        """Tables opted in with --json_fast_path get Postgres-built WithRelations routes."""
+        tables = self.options.get("json_fast_path_tables", [])
+        has_relationships = len(table_info.get("relationships", [])) > 0
+        return has_relationships and ("all" in tables or table_name in tables)
+
+    def generate_view(self, table_name: str, table_info: dict) -> None:
+        """Read-only routes for a view or materialized view."""
+        template = self._get_template("api_view.py.j2")
+        strategy = get_table_strategy(table_name, table_info, self.options)
+        has_id = has_id_key(table_info)
+        rendered = template.render(
+            table_name = table_name,
+            class_name = table_info["class_name"],
+            file_name = table_info["file_name"],
+            kind = table_info["kind"],
+            has_id = has_id,
+            search = any(get_search_fields(table_info).values()),
+            strategy = strategy,
+        )
+
+        CodePreservationManager.write_code(rendered, self.output_dir, f"{table_info["file_name"]}.py")
 
-            
     def generate(self) -> None:
-        for table_name, table_info in self.schema.items():
-            
+        for table_name, table_info in self._selected_tables():
+            if is_view(table_info):
+                self.generate_view(table_name, table_info)
+                continue
+
             rendered = self.template.render(
                 table_name = table_name,
                 class_name = table_info["class_name"],
                 file_name = table_info["file_name"],
+                unique_keys = get_unique_keys(table_info),
+                json_fast_path = self._use_json_fast_path(table_name, table_info),
+                search = any(get_search_fields(table_info).values()),
+                strategy = get_table_strategy(table_name, table_info, self.options),
+                many_to_many = [rel for rel in table_info.get("relationships", []) if rel["relation_type"] == "many_to_many"],
+                has_id = has_id_key(table_info),
+                key_columns = [
+                    {"name": col["name"], "type": map_pg_column_to_python({**col, "primary_key": False, "nullable": False})}
+                    for col in table_info.get("columns", []) if col["primary_key"]
+                ],
             )
             
             CodePreservationManager.write_code(rendered, self.output_dir, f"{table_info["file_name"]}.py")
@@ -1,30 +1,48 @@
 # app/generator/model_generator.py
 
 import os
+from typing import Any, Dict, Optional
 import shutil
 from jinja2 import Environment, FileSystemLoader
 from pg_scaffold.generator.base import CodeGenerator
-from pg_scaffold.generator.utils import snake_to_pascal, map_pg_column_to_python
+from pg_scaffold.generator.utils import snake_to_pascal, map_pg_column_to_python, get_unique_keys, is_lookup_table, get_search_fields, get_aggregate_columns, python_literal
 from pg_scaffold.preserve_custom.preservation import CodePreservationManager 
 
 
 class CRUDGenerator(CodeGenerator):
+    outputs = ("app/crud/",)
     
-    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str):
+    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str, options: Optional[Dict[str, Any]] = None):
         output_dir = os.path.join(output_dir, "app/crud")
-        super().__init__(sql_json_dir, output_dir, "crud.py.j2",gen_version)
+        super().__init__(sql_json_dir, output_dir, "crud.py.j2", gen_version, options)
         src = os.path.join(self.template_dir, "crud_base.py")
         dst = os.path.join(output_dir, "base.py")
         shutil.copyfile(src, dst)
 
+    def _get_copy_columns(self, table_schema: dict):
+        """Columns accepted by the Create schema, in snapshot order, and the subset Postgres can default."""
+        columns = [col for col in table_schema.get("columns", []) if col["primary_key"] or not col["server_default"]]
+        copy_columns = [col["name"] for col in columns]
+        copy_optional_columns = [col["name"] for col in columns if col["server_default"] or col.get("identity")]
+        return copy_columns, copy_optional_columns
             
     def generate(self) -> None:
-        for table_name, table_info in self.schema.items():
+        for table_name, table_info in self._selected_tables():
+            copy_columns, copy_optional_columns = self._get_copy_columns(table_info)
             rendered = self.template.render(
                 table_name = table_name,
                 file_name = table_info["file_name"],
                 class_name = table_info["class_name"],
                 relationships = table_info.get("relationships",[]),
+                copy_columns = copy_columns,
+                copy_optional_columns = copy_optional_columns,
+                unique_keys = get_unique_keys(table_info),
+                is_lookup = is_lookup_table(table_name, table_info, self.options),
+                search = get_search_fields(table_info),
+                aggregate = get_aggregate_columns(table_info),
+                kind = table_info.get("kind", "table"),
+                concurrent_refresh = table_info.get("concurrent_refresh", False),
+                python_literal = python_literal,
             )
             
             CodePreservationManager.write_code(rendered, self.output_dir, f"{table_info["file_name"]}.py")
\ No newline at end of file
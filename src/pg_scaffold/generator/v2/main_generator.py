@@ -1,26 +1,76 @@
 # app/generator/model_generator.py
 
 import os
+from typing import Any, Dict, Optional
 import shutil
 from pg_scaffold.generator.base import CodeGenerator
-from pg_scaffold.generator.utils import snake_to_pascal, map_pg_column_to_python
+from pg_scaffold.generator.utils import snake_to_pascal, map_pg_column_to_python, is_lookup_table, is_view
 from pg_scaffold.preserve_custom.preservation import CodePreservationManager 
 
 class MainGenerator(CodeGenerator):
+    outputs = ("main.py", "app/core/", "app/bulk_load.py", "app/refresh_matviews.py")
+    aggregates_only = True
     
-    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str):
+    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str, options: Optional[Dict[str, Any]] = None):
         self.main_dir = output_dir
         output_dir = os.path.join(output_dir, "app/core")
-        super().__init__(sql_json_dir, output_dir, "main.py.j2",gen_version)
+        super().__init__(sql_json_dir, output_dir, "main.py.j2", gen_version, options)
         src = os.path.join(self.template_dir, "core_db.py")
         dst = os.path.join(output_dir, "db.py")
         shutil.copyfile(src, dst)
+        src = os.path.join(self.template_dir, "core_export.py")
+        dst = os.path.join(output_dir, "export.py")
+        shutil.copyfile(src, dst)
+        src = os.path.join(self.template_dir, "core_bulk.py")
+        dst = os.path.join(output_dir, "bulk.py")
+        shutil.copyfile(src, dst)
+        src = os.path.join(self.template_dir, "core_metrics.py")
+        dst = os.path.join(output_dir, "metrics.py")
+        shutil.copyfile(src, dst)
+        src = os.path.join(self.template_dir, "core_query_audit.py")
+        dst = os.path.join(output_dir, "query_audit.py")
+        shutil.copyfile(src, dst)
+        src = os.path.join(self.template_dir, "core_includes.py")
+        dst = os.path.join(output_dir, "includes.py")
+        shutil.copyfile(src, dst)
+        src = os.path.join(self.template_dir, "core_matviews.py")
+        dst = os.path.join(output_dir, "matviews.py")
+        shutil.copyfile(src, dst)
+        src = os.path.join(self.template_dir, "core_lookup_cache.py")
+        dst = os.path.join(output_dir, "lookup_cache.py")
+        shutil.copyfile(src, dst)
             
     def generate(self) -> None:
         file_names = [info["file_name"] for info in self.schema.values()]
+        lookup_tables = [{"file_name": info["file_name"], "class_name": info["class_name"]}
+                         for table_name, info in self.schema.items()
+                         if is_lookup_table(table_name, info, self.options)]
         
         rendered = self.template.render(
-            file_names = file_names
+            file_names = file_names,
+            lookup_tables = lookup_tables
         )
         
-        CodePreservationManager.write_code(rendered, self.main_dir, "main.py")            
\ No newline at end of file
+        CodePreservationManager.write_code(rendered, self.main_dir, "main.py")
+        self.generate_bulk_load()
+        self.generate_refresh_matviews()
+
+    def generate_bulk_load(self) -> None:
+        template = self._get_template("bulk_load.py.j2")
+        services = [{"table_name": table_name, "file_name": info["file_name"], "class_name": info["class_name"]}
+                    for table_name, info in sorted(self.schema.items()) if not is_view(info)]
+        rendered = template.render(
+            services = services
+        )
+
+        CodePreservationManager.write_code(rendered, os.path.join(self.main_dir, "app"), "bulk_load.py")
+
+    def generate_refresh_matviews(self) -> None:
+        template = self._get_template("refresh_matviews.py.j2")
+        matviews = [{"table_name": table_name, "concurrent_refresh": info.get("concurrent_refresh", False)}
+                    for table_name, info in sorted(self.schema.items()) if info.get("kind") == "materialized_view"]
+        rendered = template.render(
+            matviews = matviews
+        )
+
+        CodePreservationManager.write_code(rendered, os.path.join(self.main_dir, "app"), "refresh_matviews.py")
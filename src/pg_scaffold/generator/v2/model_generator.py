@@ -1,6 +1,8 @@
 # app/generator/model_generator.py
 
 import os
+import json
+from typing import Any, Dict, Optional
 import shutil
 from pg_scaffold.generator.base import CodeGenerator
 
@@ -8,10 +10,11 @@ from pg_scaffold.generator.utils import map_pg_type_to_sqlalchemy_type, map_pg_c
 from pg_scaffold.preserve_custom.preservation import CodePreservationManager 
 
 class ModelGenerator(CodeGenerator):
+    outputs = ("app/models/",)
     
-    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str):
+    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str, options: Optional[Dict[str, Any]] = None):
         output_dir = os.path.join(output_dir, "app/models")
-        super().__init__(sql_json_dir, output_dir, "model.py.j2",gen_version)
+        super().__init__(sql_json_dir, output_dir, "model.py.j2", gen_version, options)
         src = os.path.join(self.template_dir, "model_base.py")
         dst = os.path.join(output_dir, "base.py")
         shutil.copyfile(src, dst)        
@@ -40,6 +43,63 @@ class ModelGenerator(CodeGenerator):
             return f" {foreign_key},"
         return " "
 
+    def _get_relationship_lazy(self) -> Optional[str]:
+        """lazy= value for every relationship, None keeps SQLAlchemy's default lazy select."""
+        loading = self.options.get("relationship_loading", "select")
+        return None if loading == "select" else loading
+
+    def _get_index_element(self, element: dict) -> tuple:
+        """Source for one index element, and whether it is a plain column the Index can name directly."""
+        if element["column"] and not element["desc"] and not element["nulls_first"]:
+            return json.dumps(element["expression"].strip('"')), True
+        parts = [element["expression"]]
+        if element["opclass"]:
+            parts.append(element["opclass"])
+        if element["desc"]:
+            parts.append("DESC" if element["nulls_first"] else "DESC NULLS LAST")
+        elif element["nulls_first"]:
+            parts.append("NULLS FIRST")
+        return f"text({json.dumps(' '.join(parts))})", False
+
+    def _get_indexes(self, table_schema: dict) -> list:
+        """
+        __table_args__ entries for the reflected indexes: UniqueConstraint for
+        constraint-backed ones, Index(...) with postgresql_using / _where /
+        _include / _ops for the rest. Anything beyond a plain btree over
+        columns only makes sense on Postgres, so it is wrapped in ddl_if.
+        """
+        declarations = []
+        for index in table_schema.get("indexes", []):
+            name = json.dumps(index["name"])
+            if index["constraint"]:
+                columns = ", ".join(json.dumps(element["expression"].strip('"')) for element in index["elements"])
+                declarations.append(f"UniqueConstraint({columns}, name={name})")
+                continue
+
+            arguments, ops = [name], {}
+            postgres_only = index["method"] != "btree" or bool(index["include"]) or bool(index["predicate"])
+            for element in index["elements"]:
+                source, is_column = self._get_index_element(element)
+                arguments.append(source)
+                postgres_only = postgres_only or not is_column
+                if is_column and element["opclass"]:
+                    ops[element["expression"].strip('"')] = element["opclass"]
+                    postgres_only = True
+
+            if index["unique"]:
+                arguments.append("unique=True")
+            if index["method"] != "btree":
+                arguments.append(f'postgresql_using="{index["method"]}"')
+            if index["include"]:
+                arguments.append(f"postgresql_include={json.dumps(index['include'])}")
+            if ops:
+                arguments.append(f"postgresql_ops={json.dumps(ops)}")
+            if index["predicate"]:
+                arguments.append(f"postgresql_where=text({json.dumps(index['predicate'])})")
+            declaration = f"Index({', '.join(arguments)})"
+            declarations.append(f'{declaration}.ddl_if(dialect="postgresql")' if postgres_only else declaration)
+        return declarations
+
     def generate_init(self) -> None:
         template = self._get_template("model__init__.py.j2")
         model_objects = [{"file_name":info["file_name"], "class_name":info["class_name"]} for info in self.schema.values()]
@@ -53,8 +113,9 @@ class ModelGenerator(CodeGenerator):
             
             
     def generate(self) -> None:
-        self.generate_init()
-        for table_name, table_info in self.schema.items():
+        if self._write_aggregates():
+            self.generate_init()
+        for table_name, table_info in self._selected_tables():
             self._get_foreign_keys(table_info)
             print(f"foreign_keys_dict: {self.foreign_keys_dict}")
             rendered = self.template.render(
@@ -64,7 +125,12 @@ class ModelGenerator(CodeGenerator):
                 relationships = table_info.get("relationships",[]),
                 map_pg_type_to_sqlalchemy_type = map_pg_type_to_sqlalchemy_type,
                 map_pg_column_to_sqlalchemy = map_pg_column_to_sqlalchemy,
-                get_foreign_key_for_column = self._get_foreign_key_for_column
+                get_foreign_key_for_column = self._get_foreign_key_for_column,
+                relationship_lazy = self._get_relationship_lazy(),
+                indexes = self._get_indexes(table_info),
+                # Snapshots with full index definitions declare every index in __table_args__
+                declares_indexes = "indexes" in table_info,
+                kind = table_info.get("kind", "table"),
             )
 
 
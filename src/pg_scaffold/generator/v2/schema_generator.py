@@ -1,16 +1,18 @@
 # app/generator/model_generator.py
 
 import os
+from typing import Any, Dict, Optional
 import shutil
 from pg_scaffold.generator.base import CodeGenerator
 from pg_scaffold.generator.utils import snake_to_pascal, map_pg_column_to_python
 from pg_scaffold.preserve_custom.preservation import CodePreservationManager 
 
 class SchemaGenerator(CodeGenerator):
+    outputs = ("app/schemas/",)
     
-    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str):
+    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str, options: Optional[Dict[str, Any]] = None):
         output_dir = os.path.join(output_dir, "app/schemas")
-        super().__init__(sql_json_dir, output_dir, "schema.py.j2",gen_version)
+        super().__init__(sql_json_dir, output_dir, "schema.py.j2", gen_version, options)
         src = os.path.join(self.template_dir, "schema_base.py")
         dst = os.path.join(output_dir, "base.py")
         shutil.copyfile(src, dst)           
@@ -35,13 +37,16 @@ class SchemaGenerator(CodeGenerator):
             f.write(rendered)
 
     def generate(self) -> None:
-        self.generate_init()
-        for table_name, table_info in self.schema.items():
+        if self._write_aggregates():
+            self.generate_init()
+        for table_name, table_info in self._selected_tables():
             
             rendered = self.template.render(
                 table_name = table_name,
                 class_name = table_info["class_name"],
                 columns = table_info.get("columns", []),
+                # BaseReadSchema declares `id`; views keyed on another column read without it
+                has_id = any(col["name"] == "id" and col["primary_key"] for col in table_info.get("columns", [])),
                 relationships = table_info.get("relationships",[]),
                 map_pg_column_to_python = map_pg_column_to_python,
             )
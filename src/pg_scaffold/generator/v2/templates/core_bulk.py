@@ -0,0 +1,93 @@
+# app/core/bulk.py
+import csv
+import io
+import json
+import uuid
+import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+
+class ImportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+class RejectedRow(BaseModel):
+    """A source row that failed validation or was part of a batch Postgres refused."""
+    row: int  # 1-based position of the record in the source file
+    errors: List[str]
+
+
+class BulkLoadReport(BaseModel):
+    table_name: str
+    loaded: int = 0
+    rejected: List[RejectedRow] = []
+
+
+def guess_format(file_name: Optional[str]) -> ImportFormat:
+    if file_name and file_name.lower().endswith((".ndjson", ".jsonl")):
+        return ImportFormat.ndjson
+    return ImportFormat.csv
+
+
+def read_rows(stream: TextIO, fmt: ImportFormat) -> Iterator[Dict[str, Any]]:
+    """Yield one dict per source row. Empty CSV fields are treated as NULL."""
+    match fmt:
+        case ImportFormat.csv:
+            for row in csv.DictReader(stream):
+                yield {key: (value if value != "" else None) for key, value in row.items()}
+        case ImportFormat.ndjson:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+        case _:
+            raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def _copy_text(value: Any) -> str:
+    """Render a value as a field of COPY's text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        value = value.isoformat()
+    elif isinstance(value, (uuid.UUID, Decimal)):
+        value = str(value)
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_rows(db: Session, table_name: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> None:
+    """
+    Stream rows into table_name with COPY FROM STDIN on the session's raw DBAPI
+    connection. Runs inside the session's transaction; the caller commits.
+    """
+    preparer = db.get_bind().dialect.identifier_preparer
+    column_list = ", ".join(preparer.quote(column) for column in columns)
+    sql = f"COPY {preparer.quote(table_name)} ({column_list}) FROM STDIN"
+    payload = "".join("\t".join(_copy_text(value) for value in row) + "\n" for row in rows)
+
+    db.info["use_primary"] = True  # A RoutingSession must not read from a replica after this
+    dbapi_connection = db.connection().connection.dbapi_connection
+    cursor = dbapi_connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            cursor.copy_expert(sql, io.StringIO(payload))
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(payload)
+    finally:
+        cursor.close()
@@ -1,10 +1,314 @@
 # app/core/db.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 import os
+import time
+import logging
+import itertools
+import threading
+from typing import Annotated, Any, Dict, Generator, List
 from dotenv import load_dotenv
+from fastapi import Depends
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool, QueuePool
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import UpdateBase
+
+# Load environment variables
 load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL","")
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+# Database configuration
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+if not DATABASE_URL:
+    raise ValueError("DATABASE_URL environment variable is required")
+
+# Optional comma-separated read replicas; reads are spread across them round-robin
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+
+# Pool profile:
+#   direct     - the app talks straight to Postgres and owns a connection pool
+#   pgbouncer  - PgBouncer in transaction mode does the pooling (NullPool, no prepared statements)
+#   serverless - short-lived processes keep at most one connection
+DB_POOL_PROFILE = os.getenv("DB_POOL_PROFILE", "direct").lower()
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))        # gunicorn/uvicorn workers per host
+DB_MAX_CONNECTIONS = max(1, int(os.getenv("DB_MAX_CONNECTIONS", "30")))  # connection budget shared by those workers
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "300"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))  # 0 disables
+DB_LOCK_TIMEOUT_MS = int(os.getenv("DB_LOCK_TIMEOUT_MS", "0"))            # 0 disables
+
+
+class PoolStats:
+    """Counters for connection checkouts and the time spent waiting for one."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            # Getting an idle connection takes microseconds; anything slower queued on the pool.
+            if seconds > 0.001:
+                self.waits += 1
+                self.wait_seconds += seconds
+                self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a free connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_stats.record_wait(time.perf_counter() - start)
+
+
+def _timeout_options() -> str:
+    options = []
+    if DB_STATEMENT_TIMEOUT_MS:
+        options.append(f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}")
+    if DB_LOCK_TIMEOUT_MS:
+        options.append(f"-c lock_timeout={DB_LOCK_TIMEOUT_MS}")
+    return " ".join(options)
+
+
+def _engine_kwargs(profile: str) -> Dict[str, Any]:
+    """Engine settings for a pool profile, sized so all workers on a host share DB_MAX_CONNECTIONS."""
+    kwargs: Dict[str, Any] = {
+        "pool_pre_ping": True,
+        "echo": os.getenv("SQL_ECHO", "false").lower() == "true",  # Log SQL queries
+    }
+    connect_args: Dict[str, Any] = {}
+    is_postgres = make_url(DATABASE_URL).get_backend_name() == "postgresql"
+
+    match profile:
+        case "direct":
+            per_worker = max(1, DB_MAX_CONNECTIONS // WEB_CONCURRENCY)
+            pool_size = int(os.getenv("DB_POOL_SIZE", max(1, per_worker // 2)))
+            kwargs.update(
+                poolclass=InstrumentedQueuePool,
+                pool_size=pool_size,
+                max_overflow=int(os.getenv("DB_MAX_OVERFLOW", max(0, per_worker - pool_size))),
+                pool_timeout=DB_POOL_TIMEOUT,
+                pool_recycle=DB_POOL_RECYCLE,
+            )
+        case "pgbouncer":
+            kwargs.update(poolclass=NullPool, pool_pre_ping=False)
+            if make_url(DATABASE_URL).get_driver_name() == "psycopg":
+                # Server-side prepared statements don't survive transaction pooling
+                connect_args["prepare_threshold"] = None
+        case "serverless":
+            kwargs.update(
+                poolclass=InstrumentedQueuePool,
+                pool_size=1,
+                max_overflow=0,
+                pool_timeout=DB_POOL_TIMEOUT,
+                pool_recycle=min(DB_POOL_RECYCLE, 60),
+            )
+        case _:
+            raise ValueError(f"Unknown DB_POOL_PROFILE '{profile}', expected direct, pgbouncer or serverless")
+
+    # PgBouncer rejects startup options, so there the timeouts are set per transaction instead
+    if is_postgres and profile != "pgbouncer" and _timeout_options():
+        connect_args["options"] = _timeout_options()
+    if connect_args:
+        kwargs["connect_args"] = connect_args
+    return kwargs
+
+
+# Create engines
+engine = create_engine(DATABASE_URL, **_engine_kwargs(DB_POOL_PROFILE))
+replica_engines = [create_engine(url, **_engine_kwargs(DB_POOL_PROFILE)) for url in DATABASE_REPLICA_URLS]
+_replica_cycle = itertools.cycle(replica_engines)
+
+
+@event.listens_for(engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    pool_stats.record_connect()
+
+
+@event.listens_for(engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_stats.record_checkout()
+
+
+class RoutingSession(Session):
+    """
+    Session that sends SELECTs to a read replica and everything else to the primary.
+
+    Each session picks one replica round-robin and keeps it, so a request reads
+    from a single replica. Once info["use_primary"] is set the session sticks to
+    the primary, so a request always reads its own writes. Writing sets it, and
+    so do the CRUD write methods and get_primary_db before they read the rows
+    they are about to change: a lagging replica would report them missing or
+    stale.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._replica = None
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if not replica_engines or self.info.get("use_primary") or self._flushing:
+            return engine
+        if isinstance(clause, UpdateBase):
+            self.info["use_primary"] = True
+            return engine
+        if isinstance(clause, Select) and clause._for_update_arg is None:
+            if self._replica is None:
+                self._replica = next(_replica_cycle)
+            return self._replica
+        return engine
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _stick_to_primary(session, flush_context):
+    session.info["use_primary"] = True
+
+
+# SQLAlchemy 2.0+ sessionmaker configuration
+SessionLocal = sessionmaker(
+    bind=engine,
+    class_=RoutingSession,  # Reads go to replicas when DATABASE_REPLICA_URLS is set
+    autoflush=False,  # Don't auto-flush (better control)
+    autocommit=False,  # Explicit commits (SQLAlchemy 2.0+ default)
+    expire_on_commit=False,  # Keep objects usable after commit
+)
+
+
+def _timeout_statements(statement_timeout_ms: int = 0, lock_timeout_ms: int = 0) -> List[str]:
+    statements = []
+    if statement_timeout_ms:
+        statements.append(f"SET LOCAL statement_timeout = {int(statement_timeout_ms)}")
+    if lock_timeout_ms:
+        statements.append(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}")
+    return statements
+
+
+def set_session_timeouts(db: Session, statement_timeout_ms: int = 0, lock_timeout_ms: int = 0) -> None:
+    """
+    Apply statement_timeout / lock_timeout to the current transaction only.
+    Safe behind PgBouncer because SET LOCAL ends with the transaction.
+    """
+    for statement in _timeout_statements(statement_timeout_ms, lock_timeout_ms):
+        db.execute(text(statement))
+
+
+if DB_POOL_PROFILE == "pgbouncer" and (DB_STATEMENT_TIMEOUT_MS or DB_LOCK_TIMEOUT_MS):
+    @event.listens_for(SessionLocal, "after_begin")
+    def _apply_timeouts(session, transaction, connection):
+        # The session is still provisioning this connection, so the SETs go to the connection directly
+        for statement in _timeout_statements(DB_STATEMENT_TIMEOUT_MS, DB_LOCK_TIMEOUT_MS):
+            connection.exec_driver_sql(statement)
+
+
+# Database dependency for FastAPI
+def get_db() -> Generator[Session, None, None]:
+    """
+    FastAPI dependency that provides the request-scoped database session.
+
+    FastAPI caches dependencies per request, so every router, CRUD service and
+    custom dependency that asks for get_db (or DbSession) within one request
+    gets this same session, and with it one pooled connection and transaction.
+    Uncommitted work is rolled back if the request fails.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+DbSession = Annotated[Session, Depends(get_db)]
+
+
+def get_primary_db(db: Session = Depends(get_db)) -> Session:
+    """The request's session pinned to the primary, for routes that write."""
+    db.info["use_primary"] = True
+    return db
+
+
+def pool_status() -> Dict[str, Any]:
+    """Snapshot of the pool for the telemetry endpoint."""
+    pool = engine.pool
+    status: Dict[str, Any] = {
+        "profile": DB_POOL_PROFILE,
+        "pool_class": type(pool).__name__,
+        "connects": pool_stats.connects,
+        "checkouts": pool_stats.checkouts,
+        "waits": pool_stats.waits,
+        "wait_seconds_total": round(pool_stats.wait_seconds, 6),
+        "wait_seconds_max": round(pool_stats.max_wait_seconds, 6),
+    }
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return status
+
+
+# Database health check
+def check_database_health() -> bool:
+    """
+    Check if database connection is healthy.
+    Useful for health check endpoints.
+    """
+    try:
+        with SessionLocal() as db:
+            db.execute(text("SELECT 1"))
+            return True
+    except Exception as e:
+        logging.error(f"Database health check failed: {e}")
+        return False
+
+
+def _base_tables(Base):
+    """Mapped tables without the views and materialized views, which the database defines itself."""
+    return [table for table in Base.metadata.sorted_tables if table.info.get("kind", "table") == "table"]
+
+
+# Database initialization (for testing or setup scripts)
+def init_db():
+    """
+    Initialize database tables.
+    Only use this for initial setup or testing.
+    In production, use Alembic migrations instead.
+    """
+    from app.models.base import Base  # Import your Base class
+    Base.metadata.create_all(bind=engine, tables=_base_tables(Base))
+
+
+# Database cleanup (useful for testing)
+def drop_all_tables():
+    """
+    Drop all database tables.
+    ⚠️ DANGEROUS: Only use in testing environments!
+    """
+    if os.getenv("ENVIRONMENT") != "testing":
+        raise RuntimeError("drop_all_tables can only be used in testing environment")
+
+    from app.models.base import Base
+    Base.metadata.drop_all(bind=engine, tables=_base_tables(Base))
@@ -0,0 +1,151 @@
+# app/core/export.py
+import csv
+import io
+import json
+import time
+import uuid
+import logging
+import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import Column
+
+logger = logging.getLogger(__name__)
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+    arrow = "arrow"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+    ExportFormat.arrow: "application/vnd.apache.arrow.stream",
+}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _iter_ndjson(names: List[str], batches: Iterable[Sequence[Tuple]]) -> Iterator[bytes]:
+    for batch in batches:
+        lines = [json.dumps(dict(zip(names, row)), default=_json_default) for row in batch]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _iter_csv(names: List[str], batches: Iterable[Sequence[Tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands back whatever Arrow wrote since the last drain."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def arrow_schema(columns: Sequence[Column]):
+    """Build an Arrow schema from the table columns so every batch shares one schema."""
+    import pyarrow as pa
+
+    def arrow_type(column: Column):
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return pa.string()
+        if python_type is bool:
+            return pa.bool_()
+        if python_type is int:
+            return pa.int64()
+        if python_type is float:
+            return pa.float64()
+        if python_type is datetime.datetime:
+            return pa.timestamp("us", tz="UTC" if getattr(column.type, "timezone", False) else None)
+        if python_type is datetime.date:
+            return pa.date32()
+        if python_type is bytes:
+            return pa.binary()
+        return pa.string()
+
+    return pa.schema([pa.field(column.name, arrow_type(column), nullable=bool(column.nullable)) for column in columns])
+
+
+def _iter_arrow(columns: Sequence[Column], batches: Iterable[Sequence[Tuple]]) -> Iterator[bytes]:
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise RuntimeError("Arrow export requires the 'pyarrow' package") from e
+
+    schema = arrow_schema(columns)
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        yield sink.drain()
+        for batch in batches:
+            arrays = []
+            for field, values in zip(schema, zip(*batch)):
+                if pa.types.is_string(field.type):
+                    values = [None if v is None else str(v) for v in values]
+                arrays.append(pa.array(values, type=field.type))
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def encode(fmt: ExportFormat, columns: Sequence[Column], batches: Iterable[Sequence[Tuple]]) -> Iterator[bytes]:
+    """
+    Encode batches of row tuples in the requested format, one chunk per batch.
+    Logs the throughput in rows per second once the stream is exhausted.
+    """
+    names = [column.name for column in columns]
+    row_count = 0
+
+    def counted() -> Iterator[Sequence[Tuple]]:
+        nonlocal row_count
+        for batch in batches:
+            row_count += len(batch)
+            yield batch
+
+    match fmt:
+        case ExportFormat.ndjson: chunks = _iter_ndjson(names, counted())
+        case ExportFormat.csv: chunks = _iter_csv(names, counted())
+        case ExportFormat.arrow: chunks = _iter_arrow(columns, counted())
+        case _:
+            raise ValueError(f"Unsupported export format: {fmt}")
+
+    start = time.perf_counter()
+    for chunk in chunks:
+        if chunk:
+            yield chunk
+    elapsed = time.perf_counter() - start
+    rate = row_count / elapsed if elapsed > 0 else float(row_count)
+    logger.info(f"Exported {row_count} rows as {fmt.value} in {elapsed:.3f}s ({rate:,.0f} rows/s)")
@@ -0,0 +1,104 @@
+# app/core/includes.py
+"""
+Per-request relationship includes, e.g. GET /attendees/?include=event,event.attendees
+
+Include paths are validated against the mapped relationship graph, turned into
+joinedload (many-to-one) / selectinload (collections) chains, and serialised
+with a response schema that is built once per (model, include set) and cached.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from fastapi import Response
+from pydantic import BaseModel, create_model
+from pydantic_core import to_json
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+
+import app.schemas as schemas
+
+MAX_INCLUDE_DEPTH = 3
+
+
+def _relationships(model) -> Dict[str, Any]:
+    return {rel.key: rel for rel in inspect(model).relationships}
+
+
+def parse_include(model, include: Optional[str]) -> Tuple[str, ...]:
+    """Split and validate an include parameter, returning a sorted tuple of dotted paths."""
+    if not include:
+        return ()
+    paths = set()
+    for path in (part.strip() for part in include.split(",")):
+        if not path:
+            continue
+        names = path.split(".")
+        if len(names) > MAX_INCLUDE_DEPTH:
+            raise ValueError(f"Include '{path}' is nested deeper than {MAX_INCLUDE_DEPTH} levels")
+        current = model
+        for name in names:
+            relationship = _relationships(current).get(name)
+            if relationship is None:
+                raise ValueError(f"Unknown relationship '{name}' on {current.__tablename__} in include '{path}'")
+            current = relationship.mapper.class_
+        paths.add(path)
+    return tuple(sorted(paths))
+
+
+def _include_tree(paths: Tuple[str, ...]) -> Dict[str, dict]:
+    tree: Dict[str, dict] = {}
+    for path in paths:
+        node = tree
+        for name in path.split("."):
+            node = node.setdefault(name, {})
+    return tree
+
+
+def loader_options(model, paths: Tuple[str, ...]) -> List[Any]:
+    """Eager-load options for the include paths: joinedload for many-to-one, selectinload for collections."""
+    options = []
+
+    def walk(current_model, tree, parent):
+        for name, subtree in tree.items():
+            relationship = _relationships(current_model)[name]
+            attr = getattr(current_model, name)
+            if parent is None:
+                loader = (selectinload if relationship.uselist else joinedload)(attr)
+            else:
+                loader = parent.selectinload(attr) if relationship.uselist else parent.joinedload(attr)
+            if subtree:
+                walk(relationship.mapper.class_, subtree, loader)
+            else:
+                options.append(loader)
+
+    walk(model, _include_tree(paths), None)
+    return options
+
+
+def read_schema_for(model) -> Type[BaseModel]:
+    """The generated {Class}Read schema of a model, by naming convention."""
+    return getattr(schemas, f"{model.__name__.removesuffix('Model')}Read")
+
+
+@lru_cache(maxsize=256)
+def include_schema(model, paths: Tuple[str, ...]) -> Type[BaseModel]:
+    """Response schema for model with exactly the included relationships, cached per include set."""
+
+    def build(current_model, tree) -> Type[BaseModel]:
+        base = read_schema_for(current_model)
+        if not tree:
+            return base
+        fields: Dict[str, Any] = {}
+        for name, subtree in sorted(tree.items()):
+            relationship = _relationships(current_model)[name]
+            nested = build(relationship.mapper.class_, subtree)
+            fields[name] = (Optional[List[nested]] if relationship.uselist else Optional[nested], None)
+        suffix = "_".join(sorted(tree))
+        return create_model(f"{base.__name__}With_{suffix}", __base__=base, **fields)
+
+    return build(model, _include_tree(paths))
+
+
+def include_response(data: Any) -> Response:
+    """Serialise include-schema results directly, bypassing the route's fixed response_model."""
+    return Response(content=to_json(data), media_type="application/json")
@@ -0,0 +1,152 @@
+# app/core/lookup_cache.py
+"""
+In-memory cache for small lookup tables (statuses, categories, ...).
+
+Lookup tables are loaded completely at startup and then served from memory by
+CRUDBase reads and the BatchLoader. Statement-level triggers send
+NOTIFY lookup_cache, '<table>' on every change; each worker LISTENs on its own
+connection and reloads the table, so all workers stay current. As a safety net
+every table is also reloaded after LOOKUP_CACHE_MAX_AGE seconds.
+"""
+import os
+import select
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.db import engine
+
+logger = logging.getLogger(__name__)
+
+LOOKUP_CACHE_ENABLED = os.getenv("LOOKUP_CACHE_ENABLED", "FALSE") == "TRUE"
+LOOKUP_CACHE_INSTALL_TRIGGERS = os.getenv("LOOKUP_CACHE_INSTALL_TRIGGERS", "FALSE") == "TRUE"
+LOOKUP_CACHE_MAX_AGE = float(os.getenv("LOOKUP_CACHE_MAX_AGE", "300"))
+CHANNEL = "lookup_cache"
+
+
+class _CachedTable:
+    def __init__(self, model, ReadSchema):
+        self.model = model
+        self.ReadSchema = ReadSchema
+        self.rows: Dict[Any, Any] = {}
+        self.reads: Dict[Any, Any] = {}
+        self.ordered: List[Any] = []
+        self.loaded_at = 0.0
+
+
+class LookupCache:
+    def __init__(self):
+        self._tables: Dict[str, _CachedTable] = {}
+        self._by_model: Dict[type, _CachedTable] = {}
+        self._stop = threading.Event()
+        self._listener: Optional[threading.Thread] = None
+
+    def register(self, model, ReadSchema) -> None:
+        cached = _CachedTable(model, ReadSchema)
+        self._tables[model.__tablename__] = cached
+        self._by_model[model] = cached
+
+    def is_cached(self, model) -> bool:
+        cached = self._by_model.get(model)
+        return cached is not None and cached.loaded_at > 0
+
+    def get_row(self, model, id: Any) -> Optional[Any]:
+        """Detached ORM instance shared by every request; merge(row, load=False) it into a session before use."""
+        return self._by_model[model].rows.get(id)
+
+    def get_read(self, model, id: Any) -> Optional[Any]:
+        return self._by_model[model].reads.get(id)
+
+    def get_many_read(self, model, skip: int, limit: int) -> List[Any]:
+        return self._by_model[model].ordered[skip:skip + limit]
+
+    def reload(self, table_name: str) -> None:
+        cached = self._tables[table_name]
+        # Always the primary: a replica may not have the write that triggered this reload yet
+        with Session(bind=engine) as db:
+            rows = db.query(cached.model).order_by(cached.model.id).all()
+            db.expunge_all()
+        reads = [cached.ReadSchema.model_validate(row) for row in rows]
+        # Swap whole dicts so readers never see a half-built table
+        cached.rows = {row.id: row for row in rows}
+        cached.reads = {read.id: read for read in reads}
+        cached.ordered = reads
+        cached.loaded_at = time.monotonic()
+        logger.info(f"Lookup cache loaded {len(rows)} rows from {table_name}")
+
+    def reload_all(self) -> None:
+        for table_name in self._tables:
+            self.reload(table_name)
+
+    def trigger_sql(self) -> List[str]:
+        """DDL for the NOTIFY trigger function and one statement-level trigger per lookup table."""
+        statements = [
+            "CREATE OR REPLACE FUNCTION pg_scaffold_notify_lookup() RETURNS trigger AS $$ "
+            f"BEGIN PERFORM pg_notify('{CHANNEL}', TG_TABLE_NAME); RETURN NULL; END; "
+            "$$ LANGUAGE plpgsql"
+        ]
+        for table_name in self._tables:
+            trigger = f'"{table_name}_lookup_cache_notify"'
+            statements += [
+                f'DROP TRIGGER IF EXISTS {trigger} ON "{table_name}"',
+                f'CREATE TRIGGER {trigger} AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "{table_name}" '
+                "FOR EACH STATEMENT EXECUTE FUNCTION pg_scaffold_notify_lookup()",
+            ]
+        return statements
+
+    def install_triggers(self) -> None:
+        with engine.begin() as conn:
+            for statement in self.trigger_sql():
+                conn.execute(text(statement))
+
+    def _refresh_stale(self) -> None:
+        now = time.monotonic()
+        for table_name, cached in self._tables.items():
+            if now - cached.loaded_at > LOOKUP_CACHE_MAX_AGE:
+                self.reload(table_name)
+
+    def _notifications(self, dbapi_connection, timeout: float):
+        if hasattr(dbapi_connection, "poll"):  # psycopg2
+            if select.select([dbapi_connection], [], [], timeout) != ([], [], []):
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    yield dbapi_connection.notifies.pop(0).payload
+        else:  # psycopg 3
+            for notify in dbapi_connection.notifies(timeout=timeout, stop_after=100):
+                yield notify.payload
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                    conn.execute(text(f"LISTEN {CHANNEL}"))
+                    # Anything may have changed while we were not listening
+                    self.reload_all()
+                    dbapi_connection = conn.connection.dbapi_connection
+                    while not self._stop.is_set():
+                        for table_name in set(self._notifications(dbapi_connection, timeout=5.0)):
+                            if table_name in self._tables:
+                                self.reload(table_name)
+                        self._refresh_stale()
+            except Exception as e:
+                logger.error(f"Lookup cache listener failed, reconnecting: {e}")
+                self._stop.wait(5.0)
+
+    def start(self) -> None:
+        if not LOOKUP_CACHE_ENABLED or not self._tables:
+            return
+        if LOOKUP_CACHE_INSTALL_TRIGGERS:
+            self.install_triggers()
+        self.reload_all()
+        self._listener = threading.Thread(target=self._listen, name="lookup-cache-listener", daemon=True)
+        self._listener.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+lookup_cache = LookupCache()
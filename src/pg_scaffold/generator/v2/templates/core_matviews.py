@@ -0,0 +1,100 @@
+# app/core/matviews.py
+"""
+REFRESH MATERIALIZED VIEW with timing.
+
+Materialized views with a unique index are refreshed CONCURRENTLY, so readers
+keep seeing the old contents until the new ones are swapped in; a view that
+has never been populated is refreshed normally first. Each refresh is timed,
+kept in refresh_stats, logged, and exported on /metrics when metrics are on.
+Only one refresh per view runs at a time in a process.
+"""
+import time
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+from app.core.db import engine
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshInProgress(RuntimeError):
+    """Raised when the view is already being refreshed by this process."""
+
+
+class RefreshStats:
+    def __init__(self):
+        self.refreshes = 0
+        self.failures = 0
+        self.seconds_total = 0.0
+        self.last_seconds: Optional[float] = None
+        self.last_refreshed_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+
+refresh_stats: Dict[str, RefreshStats] = defaultdict(RefreshStats)
+_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+
+
+def refresh_materialized_view(view_name: str, concurrently: bool = True) -> RefreshStats:
+    """Refresh one materialized view and record how long it took."""
+    lock = _locks[view_name]
+    if not lock.acquire(blocking=False):
+        raise RefreshInProgress(f"{view_name} is already being refreshed")
+
+    stats = refresh_stats[view_name]
+    start = time.perf_counter()
+    try:
+        with engine.begin() as conn:
+            populated = conn.execute(
+                text("SELECT relispopulated FROM pg_class WHERE oid = CAST(:view_name AS regclass)"),
+                {"view_name": view_name},
+            ).scalar()
+            mode = "CONCURRENTLY " if concurrently and populated else ""
+            quoted = engine.dialect.identifier_preparer.quote(view_name)
+            conn.execute(text(f"REFRESH MATERIALIZED VIEW {mode}{quoted}"))
+    except Exception as e:
+        stats.failures += 1
+        stats.last_error = str(e)
+        logger.error(f"Refresh of {view_name} failed: {e}")
+        raise
+    else:
+        stats.refreshes += 1
+        stats.last_error = None
+        stats.last_refreshed_at = time.time()
+    finally:
+        elapsed = time.perf_counter() - start
+        stats.seconds_total += elapsed
+        stats.last_seconds = elapsed
+        lock.release()
+
+    logger.info(f"Refreshed {view_name} {mode.strip().lower() or 'blocking'} in {elapsed:.3f}s")
+    return stats
+
+
+def _render_refresh_metrics() -> List[str]:
+    lines = ["# HELP matview_refresh_total Materialized view refreshes, by view and outcome.",
+             "# TYPE matview_refresh_total counter"]
+    for view_name, stats in sorted(refresh_stats.items()):
+        lines.append(f'matview_refresh_total{{view="{view_name}",outcome="ok"}} {stats.refreshes}')
+        lines.append(f'matview_refresh_total{{view="{view_name}",outcome="error"}} {stats.failures}')
+    lines += ["# HELP matview_refresh_seconds_total Time spent refreshing, by view.",
+              "# TYPE matview_refresh_seconds_total counter"]
+    for view_name, stats in sorted(refresh_stats.items()):
+        lines.append(f'matview_refresh_seconds_total{{view="{view_name}"}} {stats.seconds_total:.6f}')
+    lines += ["# HELP matview_refresh_last_seconds Duration of the latest refresh, by view.",
+              "# TYPE matview_refresh_last_seconds gauge"]
+    for view_name, stats in sorted(refresh_stats.items()):
+        if stats.last_seconds is not None:
+            lines.append(f'matview_refresh_last_seconds{{view="{view_name}"}} {stats.last_seconds:.6f}')
+    return lines
+
+
+registry.add_collector(_render_refresh_metrics)
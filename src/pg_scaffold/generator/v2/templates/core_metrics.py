@@ -0,0 +1,186 @@
+# app/core/metrics.py
+"""
+Optional request metrics for the generated app.
+
+install_metrics(app) adds an ASGI middleware that records per-route request
+counts, latency histograms and in-flight gauges, counts the SQL statements and
+database time of every request through SQLAlchemy cursor events, reports both
+in a Server-Timing header, and serves everything on /metrics in the Prometheus
+text format. Metrics are kept per worker process. The cursor events are only
+registered by install_metrics(), so apps without metrics pay nothing per statement.
+
+Server-Timing has to go out with the response headers, so streamed responses
+(no Content-Length, e.g. /export) do not get one: their database time accrues
+while the body is being sent. It is still counted in /metrics.
+"""
+import time
+import threading
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestSQLStats:
+    """SQL statements executed and database time spent by one request."""
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+
+
+current_sql_stats: ContextVar[Optional[RequestSQLStats]] = ContextVar("current_sql_stats", default=None)
+
+
+class _Histogram:
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str, int], int] = defaultdict(int)
+        self.latency: Dict[Tuple[str, str], _Histogram] = defaultdict(_Histogram)
+        self.in_flight: Dict[str, int] = defaultdict(int)
+        self.db_statements: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.db_seconds: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.collectors: List[Callable[[], List[str]]] = []
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        """Register a function returning extra exposition lines for /metrics."""
+        self.collectors.append(collector)
+
+    def start(self, method: str) -> None:
+        with self._lock:
+            self.in_flight[method] += 1
+
+    def finish(self, method: str, route: str, status: int, seconds: float, sql: RequestSQLStats) -> None:
+        with self._lock:
+            self.in_flight[method] -= 1
+            self.requests[(method, route, status)] += 1
+            self.latency[(method, route)].observe(seconds)
+            self.db_statements[(method, route)] += sql.statements
+            self.db_seconds[(method, route)] += sql.db_seconds
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            lines += ["# HELP http_requests_total Requests handled, by route and status.",
+                      "# TYPE http_requests_total counter"]
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+
+            lines += ["# HELP http_request_duration_seconds Request latency, by route.",
+                      "# TYPE http_request_duration_seconds histogram"]
+            for (method, route), hist in sorted(self.latency.items()):
+                labels = f'method="{method}",route="{route}"'
+                for bound, count in zip(LATENCY_BUCKETS, hist.buckets):
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {hist.count}')
+                lines.append(f"http_request_duration_seconds_sum{{{labels}}} {hist.sum:.6f}")
+                lines.append(f"http_request_duration_seconds_count{{{labels}}} {hist.count}")
+
+            lines += ["# HELP http_requests_in_progress Requests currently being handled.",
+                      "# TYPE http_requests_in_progress gauge"]
+            for method, count in sorted(self.in_flight.items()):
+                lines.append(f'http_requests_in_progress{{method="{method}"}} {count}')
+
+            lines += ["# HELP db_statements_total SQL statements executed, by route.",
+                      "# TYPE db_statements_total counter"]
+            for (method, route), count in sorted(self.db_statements.items()):
+                lines.append(f'db_statements_total{{method="{method}",route="{route}"}} {count}')
+
+            lines += ["# HELP db_seconds_total Time spent in the database, by route.",
+                      "# TYPE db_seconds_total counter"]
+            for (method, route), seconds in sorted(self.db_seconds.items()):
+                lines.append(f'db_seconds_total{{method="{method}",route="{route}"}} {seconds:.6f}')
+        for collector in self.collectors:
+            lines += collector()
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:  # Statement started before install_metrics() registered the listeners
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = current_sql_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += elapsed
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streaming responses pass through untouched."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        sql = RequestSQLStats()
+        token = current_sql_stats.set(sql)
+        status = 500
+        start = time.perf_counter()
+        registry.start(method)
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if not any(name.lower() == b"content-length" for name, _ in message.get("headers", [])):
+                    # Streamed body: the database time is not known yet
+                    await send(message)
+                    return
+                app_ms = (time.perf_counter() - start) * 1000
+                server_timing = (f'db;dur={sql.db_seconds * 1000:.2f};desc="{sql.statements} queries", '
+                                 f"app;dur={app_ms:.2f}")
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"server-timing", server_timing.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "__unmatched__"
+            registry.finish(method, route_path, status, time.perf_counter() - start, sql)
+            current_sql_stats.reset(token)
+
+
+def install_metrics(app: FastAPI) -> None:
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def read_metrics():
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
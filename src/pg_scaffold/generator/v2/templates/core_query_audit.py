@@ -0,0 +1,112 @@
+# app/core/query_audit.py
+"""
+N+1 and repeated-query detector for debug and CI runs.
+
+With QUERY_AUDIT=log or QUERY_AUDIT=raise, every SQL statement of a request is
+reduced to a fingerprint (literals and IN lists stripped). A fingerprint that
+runs more than QUERY_AUDIT_THRESHOLD times in one request is reported with the
+route and, for lazy loads, the relationship that fired it. In raise mode the
+offending statement raises RepeatedQueryError, failing the request. The
+Session and Engine listeners are registered by install_query_audit(), so with
+QUERY_AUDIT=off statements run without them.
+"""
+import os
+import re
+import logging
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from typing import Dict, Optional, Set
+
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+QUERY_AUDIT = os.getenv("QUERY_AUDIT", "off").lower()  # off | log | raise
+QUERY_AUDIT_THRESHOLD = int(os.getenv("QUERY_AUDIT_THRESHOLD", "5"))
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:[^()]|\([^()]*\))*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RepeatedQueryError(RuntimeError):
+    """Raised in QUERY_AUDIT=raise mode when a statement shape repeats past the threshold."""
+
+
+def fingerprint(statement: str) -> str:
+    """Reduce a SQL statement to its shape so repeated lookups compare equal."""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _IN_LIST.sub("IN (...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryAudit:
+    """Statement fingerprints seen during one request."""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.relationships: Dict[str, Set[str]] = defaultdict(set)
+        self.pending_relationship: Optional[str] = None
+
+    def repeated(self) -> Dict[str, int]:
+        return {shape: count for shape, count in self.counts.items() if count > QUERY_AUDIT_THRESHOLD}
+
+
+current_audit: ContextVar[Optional[QueryAudit]] = ContextVar("current_audit", default=None)
+
+
+def _note_relationship_load(orm_execute_state):
+    audit = current_audit.get()
+    if audit is None or not orm_execute_state.is_relationship_load:
+        return
+    prop = orm_execute_state.loader_strategy_path[-1]
+    audit.pending_relationship = f"{prop.parent.class_.__name__}.{prop.key}"
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    audit = current_audit.get()
+    if audit is None:
+        return
+    shape = fingerprint(statement)
+    audit.counts[shape] += 1
+    if audit.pending_relationship:
+        audit.relationships[shape].add(audit.pending_relationship)
+        audit.pending_relationship = None
+    if QUERY_AUDIT == "raise" and audit.counts[shape] == QUERY_AUDIT_THRESHOLD + 1:
+        via = ", ".join(sorted(audit.relationships[shape])) or "direct query"
+        raise RepeatedQueryError(
+            f"Statement ran more than {QUERY_AUDIT_THRESHOLD} times in one request (via {via}): {shape}"
+        )
+
+
+class QueryAuditMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        audit = QueryAudit()
+        token = current_audit.set(audit)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_audit.reset(token)
+            route = getattr(scope.get("route"), "path", scope["path"])
+            for shape, count in audit.repeated().items():
+                via = ", ".join(sorted(audit.relationships[shape])) or "direct query"
+                logger.warning(f"Repeated query on {scope['method']} {route}: {count}x via {via}: {shape}")
+
+
+def install_query_audit(app: FastAPI) -> None:
+    if not event.contains(Engine, "before_cursor_execute", _count_statement):
+        event.listen(Session, "do_orm_execute", _note_relationship_load)
+        event.listen(Engine, "before_cursor_execute", _count_statement)
+    app.add_middleware(QueryAuditMiddleware)
@@ -1,8 +1,15 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union, Sequence
+from collections import defaultdict
+from typing import Any, Dict, Generic, Iterable, Iterator, List, Optional, Type, TypeVar, Union, Sequence, Tuple
 from fastapi.encoders import jsonable_encoder
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Column, String, Text, and_, any_, bindparam, cast, delete, func, insert, inspect, literal, literal_column, or_, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session, Query
 
+from app.core.bulk import BulkLoadReport, RejectedRow, copy_rows
+from app.core.includes import include_schema, loader_options, parse_include
+from app.core.lookup_cache import lookup_cache
 from app.models.base import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -11,7 +18,85 @@ ReadSchemaType = TypeVar("ReadSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+def id_in(db: Session, column, ids: Sequence[Any]):
+    """`column = ANY(:ids)` on Postgres: one array parameter, so one plan for any number of ids."""
+    if db.get_bind().dialect.name != "postgresql":
+        return column.in_(list(ids))
+    return column == any_(bindparam("ids", list(ids), type_=postgresql.ARRAY(column.type), unique=True))
+
+
+class Deferred:
+    """Handle returned by BatchLoader.load(); get() resolves it, batching with every other pending key."""
+    __slots__ = ("_loader", "_model", "_key")
+
+    def __init__(self, loader: "BatchLoader", model: Type[Base], key: Any):
+        self._loader = loader
+        self._model = model
+        self._key = key
+
+    def get(self) -> Optional[Base]:
+        return self._loader.resolve(self._model, self._key)
+
+
+class BatchLoader:
+    """
+    DataLoader-style batching for one session (and so one request).
+
+    Code that resolves many FK references calls load(Model, id) for each of
+    them first; the first get() then fetches every pending id of that model in
+    a single query. Loaded rows are cached for the rest of the session.
+    Rows of cached lookup tables come from memory, merged into the session.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._pending: Dict[Type[Base], set] = defaultdict(set)
+        self._cache: Dict[Type[Base], Dict[Any, Optional[Base]]] = defaultdict(dict)
+
+    def load(self, model: Type[Base], key: Any) -> Deferred:
+        if lookup_cache.is_cached(model):
+            if key not in self._cache[model]:
+                # Lookup tables are already in memory; nothing to batch. The cached instance is
+                # shared by every request, so this session works on its own copy of it:
+                # relationships lazy-load through the session and changes stay in the request.
+                row = lookup_cache.get_row(model, key)
+                self._cache[model][key] = self.db.merge(row, load=False) if row is not None else None
+        elif key is not None and key not in self._cache[model]:
+            self._pending[model].add(key)
+        return Deferred(self, model, key)
+
+    def resolve(self, model: Type[Base], key: Any) -> Optional[Base]:
+        if key in self._pending[model]:
+            self._dispatch(model)
+        return self._cache[model].get(key)
+
+    def _dispatch(self, model: Type[Base]) -> None:
+        keys = self._pending.pop(model)
+        rows = self.db.query(model).filter(id_in(self.db, model.id, keys)).all()
+        cache = self._cache[model]
+        cache.update({key: None for key in keys})
+        cache.update({row.id: row for row in rows})
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, ReadSchemaType, UpdateSchemaType]):
+    # Column order for COPY, taken from the schema snapshot by the generator.
+    copy_columns: Sequence[str] = ()
+    # Columns in copy_columns the database can fill in itself (e.g. serial and identity ids).
+    copy_optional_columns: Sequence[str] = ()
+    # Reflected unique keys usable as ON CONFLICT targets, by name.
+    upsert_keys: Dict[str, Tuple[str, ...]] = {}
+    # Text search: (tsvector expression, config or None) pairs and pg_trgm-indexed expressions.
+    search_fulltext: Sequence[Tuple[str, Optional[str]]] = ()
+    search_trigram: Sequence[str] = ()
+    # Small, rarely written table served from app.core.lookup_cache.
+    is_lookup: bool = False
+    # /aggregate: groupable columns and the aggregate functions each column's type allows.
+    group_by_columns: Sequence[str] = ()
+    aggregate_columns: Dict[str, Sequence[str]] = {}
+    # Views and materialized views: reads only.
+    read_only: bool = False
+    with_relationships: bool = False
+
     def __init__(self, model: Type[ModelType], 
                  CreateSchema: Type[CreateSchemaType],
                  ReadSchema: Type[ReadSchemaType],
@@ -36,18 +121,257 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, ReadSchemaType, UpdateSchema
     def _create_validation_hook(self):
         return True
     
-    def get_by_id(self,id: Any) -> Optional[ReadSchemaType]:
+    def _include_hook(self, query: Query, include: Tuple[str, ...]) -> Query:
+        """Replace the default eager loads with exactly the requested include paths."""
+        return query.options(*loader_options(self.model, include))
+
+    def _read_schema_for(self, include: Tuple[str, ...]) -> Type[BaseModel]:
+        return include_schema(self.model, include) if include else self.ReadSchema
+
+    def parse_include(self, include: Optional[str]) -> Tuple[str, ...]:
+        """Validate an include= parameter against this model's relationship graph."""
+        return parse_include(self.model, include)
+
+    def _use_lookup_cache(self, include: Tuple[str, ...]) -> bool:
+        """Plain reads of a loaded lookup table come from memory; includes and eager loads go to the database."""
+        return (self.is_lookup and not include and not self.with_relationships
+                and lookup_cache.is_cached(self.model))
+
+    def _check_writable(self) -> None:
+        """Called first by every write method: views refuse, tables pin the session to the primary."""
+        if self.read_only:
+            raise ValueError(f"{self.model.__tablename__} is a view and cannot be written to")
+        # The rows a write reads back and changes must not come from a lagging replica
+        self.db.info["use_primary"] = True
+
+    def _lookup_changed(self) -> None:
+        """Reload a cached lookup table after our own write, without waiting for its NOTIFY."""
+        if self.is_lookup and lookup_cache.is_cached(self.model):
+            lookup_cache.reload(self.model.__tablename__)
+
+    def get_by_id(self, id: Any, include: Tuple[str, ...] = ()) -> Optional[ReadSchemaType]:
+        if self._use_lookup_cache(include):
+            return lookup_cache.get_read(self.model, id)
         query = self.db.query(self.model)
-        query = self._get_first_hook(query)
+        query = self._include_hook(query, include) if include else self._get_first_hook(query)
         db_obj = query.filter(self.model.id == id).first()
-        return self.ReadSchema.model_validate(db_obj)
+        if db_obj is None:
+            return None
+        return self._read_schema_for(include).model_validate(db_obj)
     
-    def get_many(self, *, skip: int = 0, limit: int = 100
+    # Tables without an id column: rows addressed by every primary key column
+
+    def _key_filter(self, key: Dict[str, Any]):
+        return and_(*(column == key[column.name] for column in self.model.__table__.primary_key.columns))
+
+    def get_by_key(self, key: Dict[str, Any], include: Tuple[str, ...] = ()) -> Optional[ReadSchemaType]:
+        query = self.db.query(self.model)
+        query = self._include_hook(query, include) if include else self._get_first_hook(query)
+        db_obj = query.filter(self._key_filter(key)).first()
+        if db_obj is None:
+            return None
+        return self._read_schema_for(include).model_validate(db_obj)
+
+    def update_by_key(self, key: Dict[str, Any], obj_in: Union[UpdateSchemaType, Dict[str, Any]]) -> Optional[ReadSchemaType]:
+        """Apply the fields set in obj_in; key columns come from `key`, not the body."""
+        self._check_writable()
+        db_obj = self.db.query(self.model).filter(self._key_filter(key)).first()
+        if db_obj is None:
+            return None
+        update_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            if field not in key:
+                setattr(db_obj, field, value)
+        self.db.commit()
+        self.db.refresh(db_obj)
+        self._lookup_changed()
+        return self.ReadSchema.model_validate(db_obj)
+
+    def remove_by_key(self, key: Dict[str, Any]) -> Optional[ReadSchemaType]:
+        self._check_writable()
+        db_obj = self.db.query(self.model).filter(self._key_filter(key)).first()
+        if db_obj is None:
+            return None
+        self.db.delete(db_obj)
+        self.db.commit()
+        self._lookup_changed()
+        return self.ReadSchema.model_validate(db_obj)
+
+    @property
+    def loader(self) -> BatchLoader:
+        """The BatchLoader shared by every CRUD service using this session."""
+        if "batch_loader" not in self.db.info:
+            self.db.info["batch_loader"] = BatchLoader(self.db)
+        return self.db.info["batch_loader"]
+
+    def get_many_by_ids(self, ids: Sequence[Any], include: Tuple[str, ...] = ()) -> Tuple[List[ReadSchemaType], List[Any]]:
+        """
+        Fetch rows for ids with a single query. Returns the rows in the order
+        the ids were given, and the ids that matched no row.
+        """
+        query = self.db.query(self.model)
+        query = self._include_hook(query, include) if include else self._get_many_hook(query)
+        db_objs = query.filter(id_in(self.db, self.model.id, ids)).all() if ids else []
+        ReadSchema = self._read_schema_for(include)
+        by_id = {db_obj.id: db_obj for db_obj in db_objs}
+        items = [ReadSchema.model_validate(by_id[id]) for id in ids if id in by_id]
+        missing = list(dict.fromkeys(id for id in ids if id not in by_id))
+        return items, missing
+
+    def get_many(self, *, skip: int = 0, limit: int = 100, include: Tuple[str, ...] = ()
     ) -> List[ReadSchemaType]:
+        if self._use_lookup_cache(include):
+            return lookup_cache.get_many_read(self.model, skip, limit)
         query = self.db.query(self.model)
-        query = self._get_many_hook(query)
+        query = self._include_hook(query, include) if include else self._get_many_hook(query)
         db_objs = query.offset(skip).limit(limit).all()
-        return [self.ReadSchema.model_validate(db_obj) for db_obj in db_objs]
+        ReadSchema = self._read_schema_for(include)
+        return [ReadSchema.model_validate(db_obj) for db_obj in db_objs]
+
+    def get_page_after(self, after: Optional[Any] = None, *, limit: int = 100, include: Tuple[str, ...] = ()
+    ) -> List[ReadSchemaType]:
+        """
+        Keyset pagination: the next limit rows by id after the id `after`
+        (from the start when None). Every page is an index range scan, so
+        deep pages cost the same as the first, unlike OFFSET.
+        """
+        query = self.db.query(self.model)
+        query = self._include_hook(query, include) if include else self._get_many_hook(query)
+        if after is not None:
+            query = query.filter(self.model.id > after)
+        db_objs = query.order_by(self.model.id).limit(limit).all()
+        ReadSchema = self._read_schema_for(include)
+        return [ReadSchema.model_validate(db_obj) for db_obj in db_objs]
+
+    def search(self, q: str, *, skip: int = 0, limit: int = 100, include: Tuple[str, ...] = ()
+    ) -> List[ReadSchemaType]:
+        """
+        Rank rows against q using the table's text search indexes:
+        `@@ websearch_to_tsquery(...)` ordered by ts_rank for tsvector
+        expressions, `%` ordered by similarity for trigram expressions.
+        The ranked ids are selected from the bare table, then loaded like
+        get_many_by_ids so includes never clash with the search expressions.
+        Needs an `id` primary key; routes are only generated for such tables.
+        """
+        if not self.search_fulltext and not self.search_trigram:
+            raise ValueError(f"{self.model.__tablename__} has no text search index")
+        matches, ranks = [], []
+        for expression, config in self.search_fulltext:
+            vector = literal_column(expression)
+            if config:
+                tsquery = func.websearch_to_tsquery(literal_column(f"'{config}'::regconfig"), q)
+            else:
+                tsquery = func.websearch_to_tsquery(q)
+            matches.append(vector.op("@@")(tsquery))
+            ranks.append(func.ts_rank(vector, tsquery))
+        for expression in self.search_trigram:
+            matches.append(literal_column(expression).op("%")(q))
+            ranks.append(func.similarity(literal_column(expression), q))
+
+        table = self.model.__table__
+        rank = ranks[0] if len(ranks) == 1 else func.greatest(*ranks)
+        stmt = (
+            select(table.c.id).select_from(table).where(or_(*matches))
+            .order_by(rank.desc(), table.c.id).offset(skip).limit(limit)
+        )
+        ids = self.db.scalars(stmt).all()
+        items, _ = self.get_many_by_ids(ids, include=include)
+        return items
+
+    def export_columns(self) -> List[Column]:
+        """Columns emitted by stream_batches, in table order."""
+        return list(self.model.__table__.columns)
+
+    def stream_batches(self, *, batch_size: int = 1000) -> Iterator[Sequence[Tuple]]:
+        """
+        Yield plain row tuples in batches of batch_size from a server-side cursor.
+
+        Rows never become ORM or Pydantic objects, so memory stays bounded by
+        one batch regardless of table size. The cursor runs on its own
+        connection (a replica when configured) that lives exactly as long as
+        the iteration.
+        """
+        stmt = select(*self.export_columns()).execution_options(stream_results=True, yield_per=batch_size)
+        with self.db.get_bind(clause=stmt).connect() as conn:
+            result = conn.execute(stmt)
+            for partition in result.partitions():
+                yield [tuple(row) for row in partition]
+
+    # Server-side JSON assembly: the WithRelations document built by Postgres
+
+    @staticmethod
+    def _build_json_object(pairs: List[Any]):
+        """json_build_object over key/value pairs, chunked through jsonb past Postgres' 100-argument limit."""
+        if len(pairs) <= 100:
+            return func.json_build_object(*pairs)
+        chunks = [func.jsonb_build_object(*pairs[i:i + 100]) for i in range(0, len(pairs), 100)]
+        document = chunks[0]
+        for chunk in chunks[1:]:
+            document = document.op("||")(chunk)
+        return document
+
+    @staticmethod
+    def _json_key(name: str):
+        return literal_column("'" + name.replace("'", "''") + "'")
+
+    def _json_columns(self, table) -> List[Any]:
+        pairs = []
+        for column in table.columns:
+            # Columns mapped to String (numeric, bigint, enums, domains, ...) are str in the Read
+            # schemas, so render them as text rather than as JSON numbers
+            value = cast(column, Text) if isinstance(column.type, String) else column
+            pairs += [self._json_key(column.name), value]
+        return pairs
+
+    def _json_document(self, table):
+        """
+        {Class}WithRelations as a SQL expression: every column plus one correlated
+        subquery per relationship, json_agg for collections.
+        """
+        pairs = self._json_columns(table)
+        for relationship in inspect(self.model).relationships:
+            target = relationship.mapper.class_.__table__.alias()
+            if relationship.secondary is not None:
+                # Many-to-many: join the other side through the association table
+                secondary = relationship.secondary.alias()
+                source = target.join(secondary, and_(*[
+                    target.c[remote.name] == secondary.c[column.name]
+                    for remote, column in relationship.secondary_synchronize_pairs
+                ]))
+                condition = and_(*[
+                    table.c[local.name] == secondary.c[column.name]
+                    for local, column in relationship.synchronize_pairs
+                ])
+            else:
+                source = target
+                condition = and_(*[
+                    table.c[local.name] == target.c[remote.name]
+                    for local, remote in relationship.local_remote_pairs
+                ])
+            related = self._build_json_object(self._json_columns(target))
+            if relationship.uselist:
+                value = select(func.coalesce(func.json_agg(related), literal_column("'[]'::json"))).select_from(source).where(condition)
+            else:
+                value = select(related).select_from(source).where(condition).limit(1)
+            pairs += [self._json_key(relationship.key), value.scalar_subquery()]
+        return self._build_json_object(pairs)
+
+    def get_json_by_id(self, id: Any) -> Optional[str]:
+        """The WithRelations JSON for one row, serialised by Postgres; None when the row does not exist."""
+        table = self.model.__table__
+        stmt = select(cast(self._json_document(table), Text)).where(table.c.id == id)
+        return self.db.execute(stmt).scalar_one_or_none()
+
+    def get_many_json(self, *, skip: int = 0, limit: int = 100) -> str:
+        """A JSON array of WithRelations documents, serialised by Postgres."""
+        table = self.model.__table__
+        page = (
+            select(self._json_document(table).label("document"))
+            .order_by(table.c.id).offset(skip).limit(limit)
+            .subquery()
+        )
+        stmt = select(cast(func.coalesce(func.json_agg(page.c.document), literal_column("'[]'::json")), Text))
+        return self.db.execute(stmt).scalar_one()
 
     def _resolve_column(self, dotted_field: str):
         """Resolve 'event.name' → Event.name using SQLAlchemy relationships."""
@@ -69,11 +393,44 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, ReadSchemaType, UpdateSchema
 
         return column
     
+    def _where_clauses(self, where: Sequence[Sequence[Any]], own_columns_only: bool = False) -> List[Any]:
+        """[field, operator, value] triplets as SQL conditions; see get_many_where."""
+        clauses = []
+        for condition in where:
+            if not isinstance(condition, (list, tuple)) or len(condition) != 3:
+                raise ValueError(f"Invalid condition format: {condition}")
+
+            field, op, value = condition
+            if not isinstance(field, str):
+                raise ValueError(f"Invalid field: {field}")
+            if own_columns_only and field not in self.model.__table__.c:
+                raise ValueError(f"Invalid field: {field}")
+
+            column = self._resolve_column(field)
+            
+            match op:
+                case "eq": clauses.append(column == value)
+                case "ne": clauses.append(column != value)
+                case "lt": clauses.append(column < value)
+                case "lte": clauses.append(column <= value)
+                case "gt": clauses.append(column > value)
+                case "gte": clauses.append(column >= value)
+                case "in":
+                    if not isinstance(value, (list, tuple, set)):
+                        raise ValueError(f"Expected list/tuple for 'in' filter on '{field}'")
+                    clauses.append(column.in_(value))
+                case "like": clauses.append(column.like(value))
+                case "ilike": clauses.append(column.ilike(value))
+                case _:
+                    raise ValueError(f"Unsupported operator: {op}")
+        return clauses
+
     def get_many_where(
         self,
         where: Sequence[Sequence[Any]],
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        include: Tuple[str, ...] = ()
     ) -> List[ReadSchemaType]:
         """
         Retrieve multiple rows matching a list of condition triplets.
@@ -89,42 +446,73 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, ReadSchemaType, UpdateSchema
                 ]
             skip: Offset for pagination.
             limit: Maximum number of records to return.
+            include: Validated relationship paths to load and serialise.
 
         Returns:
             A list of validated ReadSchemaType instances.
         """
-        query = self.db.query(self.model)
+        query = self.db.query(self.model).filter(*self._where_clauses(where))
+        query = self._include_hook(query, include) if include else self._get_many_hook(query)
+        db_objs = query.offset(skip).limit(limit).all()
+        ReadSchema = self._read_schema_for(include)
+        return [ReadSchema.model_validate(db_obj) for db_obj in db_objs]
 
-        for condition in where:
-            if len(condition) != 3:
-                raise ValueError(f"Invalid condition format: {condition}")
 
-            field, op, value = condition
+    def aggregate(
+        self,
+        aggregates: Sequence[str],
+        group_by: Sequence[str] = (),
+        where: Sequence[Sequence[Any]] = (),
+        limit: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate rows in a single GROUP BY query.
 
-            column = self._resolve_column(field)
-            
-            match op:
-                case "eq": query = query.filter(column == value)
-                case "ne": query = query.filter(column != value)
-                case "lt": query = query.filter(column < value)
-                case "lte": query = query.filter(column <= value)
-                case "gt": query = query.filter(column > value)
-                case "gte": query = query.filter(column >= value)
-                case "in":
-                    if not isinstance(value, (list, tuple, set)):
-                        raise ValueError(f"Expected list/tuple for 'in' filter on '{field}'")
-                    query = query.filter(column.in_(value))
-                case "like": query = query.filter(column.like(value))
-                case "ilike": query = query.filter(column.ilike(value))
-                case _:
-                    raise ValueError(f"Unsupported operator: {op}")
+        Args:
+            aggregates: "count" for count(*), or "function:column" with function
+                one of count, sum, avg, min, max, e.g. ["count", "avg:score"].
+            group_by: Columns to group by; none gives one row over all matches.
+            where: Filters as in get_many_where, on this table's own columns
+                (filtering through a relationship would need a join and skew
+                the aggregates).
+            limit: Maximum number of groups to return.
 
-        query = self._get_many_hook(query)
-        db_objs = query.offset(skip).limit(limit).all()
-        return [self.ReadSchema.model_validate(db_obj) for db_obj in db_objs]
+        Returns:
+            One dict per group, keyed by the group columns and by "count" or
+            "function_column" for each aggregate, ordered by the group columns.
+        """
+        table = self.model.__table__
+        if not aggregates:
+            raise ValueError("At least one aggregate is required")
 
+        group_columns = []
+        for name in group_by:
+            if name not in self.group_by_columns:
+                raise ValueError(f"Cannot group by '{name}'")
+            group_columns.append(table.c[name])
+
+        selected = []
+        for spec in dict.fromkeys(aggregates):
+            function, _, name = spec.partition(":")
+            if not name and function == "count":
+                selected.append(func.count().label("count"))
+                continue
+            if function not in self.aggregate_columns.get(name, ()):
+                raise ValueError(f"Unsupported aggregate '{spec}'")
+            selected.append(getattr(func, function)(table.c[name]).label(f"{function}_{name}"))
+
+        stmt = (
+            select(*group_columns, *selected)
+            .select_from(table)
+            .where(*self._where_clauses(where, own_columns_only=True))
+            .group_by(*group_columns)
+            .order_by(*group_columns)
+            .limit(limit)
+        )
+        return [dict(row) for row in self.db.execute(stmt).mappings()]
 
     def create(self, obj_in: CreateSchemaType) -> Optional[ReadSchemaType]:
+        self._check_writable()
         db_obj = None
         valid_input = self._create_validation_hook()
         if valid_input:
@@ -133,12 +521,150 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, ReadSchemaType, UpdateSchema
             self.db.add(db_obj)
             self.db.commit()
             self.db.refresh(db_obj)
+            self._lookup_changed()
         return self.ReadSchema.model_validate(db_obj)
 
 
+    def bulk_load(self, rows: Iterable[Dict[str, Any]], *, batch_size: int = 5000) -> BulkLoadReport:
+        """
+        Validate rows against the Create schema in batches and load every valid
+        batch with COPY FROM STDIN. Each batch is committed on its own; a batch
+        Postgres refuses is rolled back and all of its rows are reported.
+        """
+        self._check_writable()
+        report = BulkLoadReport(table_name=self.model.__tablename__)
+        batch: List[Tuple[int, BaseModel]] = []
+
+        for position, row in enumerate(rows, start=1):
+            try:
+                batch.append((position, self.CreateSchema.model_validate(row)))
+            except ValidationError as e:
+                errors = [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()]
+                report.rejected.append(RejectedRow(row=position, errors=errors))
+            if len(batch) >= batch_size:
+                self._copy_batch(batch, report)
+                batch = []
+
+        if batch:
+            self._copy_batch(batch, report)
+        return report
+
+    def _insert_groups(self, values: List[Dict[str, Any]]) -> List[Tuple[List[str], List[Dict[str, Any]]]]:
+        """
+        values grouped by the database-defaulted columns each row leaves out, with
+        the columns to insert for the group: a row without an id gets one from its
+        identity or sequence rather than a NULL, whatever the other rows supply.
+        """
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = defaultdict(list)
+        for value in values:
+            omitted = tuple(column for column in self.copy_optional_columns if value.get(column) is None)
+            groups[omitted].append(value)
+        return [([column for column in self.copy_columns if column not in omitted], rows) for omitted, rows in groups.items()]
+
+    def _copy_batch(self, batch: List[Tuple[int, BaseModel]], report: BulkLoadReport) -> None:
+        values = [obj.model_dump() for _, obj in batch]
+        # COPY runs on the raw DBAPI cursor, so its errors arrive as the driver's, not wrapped in DBAPIError
+        driver_error = self.db.get_bind().dialect.loaded_dbapi.Error
+        try:
+            for columns, rows in self._insert_groups(values):
+                copy_rows(self.db, self.model.__tablename__, columns,
+                          ([row.get(column) for column in columns] for row in rows))
+            self.db.commit()
+            self._lookup_changed()
+            report.loaded += len(batch)
+        except (DBAPIError, driver_error) as e:
+            self.db.rollback()
+            error = str(e.orig if isinstance(e, DBAPIError) else e).strip()
+            report.rejected.extend(RejectedRow(row=position, errors=[error]) for position, _ in batch)
+
+    def upsert(self, objs_in: Sequence[CreateSchemaType], key: str) -> List[ReadSchemaType]:
+        """
+        Insert or update rows with INSERT ... ON CONFLICT (<key columns>) DO UPDATE
+        ... RETURNING, one statement per set of database-defaulted columns the rows
+        leave out. key names one of upsert_keys; rows matching on it get every
+        other supplied column overwritten. When several rows in objs_in share a
+        key, the last one wins. Rows missing part of the key cannot conflict and
+        are all inserted.
+        """
+        self._check_writable()
+        conflict_columns = list(self.upsert_keys[key])
+        keyed: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        unkeyed: List[Dict[str, Any]] = []
+        for value in (obj.model_dump() for obj in objs_in):
+            key_values = tuple(value.get(column) for column in conflict_columns)
+            if any(key_value is None for key_value in key_values):
+                unkeyed.append(value)
+            else:
+                keyed[key_values] = value
+        values = list(keyed.values()) + unkeyed
+        primary_keys = {column.name for column in self.model.__table__.primary_key.columns}
+
+        db_objs = []
+        for columns, rows in self._insert_groups(values):
+            update_columns = [column for column in columns if column not in conflict_columns and column not in primary_keys]
+            stmt = postgresql.insert(self.model).values([{column: row.get(column) for column in columns} for row in rows])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_columns,
+                # A no-op assignment still lets RETURNING report rows that only matched
+                set_={column: stmt.excluded[column] for column in (update_columns or conflict_columns)},
+            )
+            db_objs += self.db.scalars(stmt.returning(self.model), execution_options={"populate_existing": True}).all()
+        self.db.commit()
+        self._lookup_changed()
+        return [self.ReadSchema.model_validate(db_obj) for db_obj in db_objs]
+
+    # Many-to-many links: association rows written in one statement
+
+    def _association(self, relationship: str) -> Tuple[Any, Column, Column, Column]:
+        """(association table, its column for this row, its column for the other side, the other side's key) of a secondary relationship."""
+        prop = inspect(self.model).relationships.get(relationship)
+        if prop is None or prop.secondary is None:
+            raise ValueError(f"{self.model.__tablename__} has no many-to-many relationship '{relationship}'")
+        ((_, local_column),) = prop.synchronize_pairs
+        ((remote_key, remote_column),) = prop.secondary_synchronize_pairs
+        return prop.secondary, local_column, remote_column, remote_key
+
+    def link(self, id: Any, relationship: str, ids: Sequence[Any]) -> Tuple[int, List[Any]]:
+        """
+        Link this row to ids on the other side of a many-to-many relationship
+        with one INSERT ... SELECT into the association table. Pairs that are
+        already linked and ids that match no row are skipped. Returns the
+        number of links added and the ids that matched no row.
+        """
+        self._check_writable()
+        table, local_column, remote_column, remote_key = self._association(relationship)
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return 0, []
+        found = set(self.db.scalars(select(remote_key).where(id_in(self.db, remote_key, ids))))
+
+        linked_already = select(table).where(local_column == id, remote_column == remote_key).exists()
+        rows = select(literal(id, local_column.type), remote_key).where(id_in(self.db, remote_key, ids), ~linked_already)
+        if self.db.get_bind().dialect.name == "postgresql":
+            # A concurrent link of the same pair is not an error either
+            stmt = postgresql.insert(table).from_select([local_column.name, remote_column.name], rows).on_conflict_do_nothing()
+        else:
+            stmt = insert(table).from_select([local_column.name, remote_column.name], rows)
+        # INSERT only reports its rowcount when asked to
+        linked = self.db.execute(stmt, execution_options={"preserve_rowcount": True}).rowcount
+        self.db.commit()
+        return linked, [key for key in ids if key not in found]
+
+    def unlink(self, id: Any, relationship: str, ids: Sequence[Any]) -> int:
+        """Remove the links between this row and ids with one DELETE on the association table; returns how many went."""
+        self._check_writable()
+        table, local_column, remote_column, _ = self._association(relationship)
+        if not ids:
+            return 0
+        stmt = delete(table).where(local_column == id, id_in(self.db, remote_column, list(ids)))
+        unlinked = self.db.execute(stmt).rowcount
+        self.db.commit()
+        return unlinked
+
     def update(
         self, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> Optional[ReadSchemaType]:
+        self._check_writable()
         db_obj = self.db.query(self.model).get(obj_in.id)
         obj_data = jsonable_encoder(db_obj)
         update_data = obj_in if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
@@ -150,11 +676,14 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, ReadSchemaType, UpdateSchema
         self.db.add(db_obj)
         self.db.commit()
         self.db.refresh(db_obj)
+        self._lookup_changed()
         return self.ReadSchema.model_validate(db_obj)
 
     def remove(self, *, id: int) -> Optional[ReadSchemaType]:
+        self._check_writable()
         #db_obj = self.db.query(self.model).get(id)
         db_obj = self.db.get(self.model, id)
         self.db.delete(db_obj)
         self.db.commit()
+        self._lookup_changed()
         return self.ReadSchema.model_validate(db_obj)
\ No newline at end of file
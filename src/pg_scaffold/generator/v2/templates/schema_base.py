@@ -2,7 +2,9 @@
 Base schema classes for common Pydantic configuration and patterns.
 """
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import Generic, List, Optional, TypeVar
+
+ItemSchemaType = TypeVar("ItemSchemaType")
 
 
 class BaseSchema(BaseModel):
@@ -16,6 +18,7 @@ class BaseSchema(BaseModel):
         validate_assignment=True,  # Validate on field assignment
         use_enum_values=True,  # Use enum values instead of enum objects
         str_strip_whitespace=True,  # Strip whitespace from strings
+        coerce_numbers_to_str=True,  # NUMERIC/BIGINT columns are typed str; keep their exact digits
     )
 
 
@@ -45,6 +48,18 @@ class BaseUpdateSchema(BaseSchema):
     pass
 
 
+class BatchReadSchema(BaseModel, Generic[ItemSchemaType]):
+    """Rows fetched by id, in the order requested, plus the ids that were not found."""
+    items: List[ItemSchemaType]
+    missing: List[int]
+
+
+class LinkReport(BaseModel):
+    """Association rows a many-to-many link or unlink added or removed, and the linked ids that matched no row."""
+    changed: int
+    missing: List[int] = []
+
+
 # OPTIONAL: Soft delete schema for entities that support soft deletion
 class SoftDeleteSchema(BaseSchema):
     """Base schema for entities with soft delete functionality."""
@@ -1,6 +1,7 @@
 # app/generator/model_generator.py
 
 import os
+from typing import Any, Dict, Optional
 import shutil
 from datetime import datetime
 from pg_scaffold.generator.base import CodeGenerator
@@ -8,10 +9,11 @@ from pg_scaffold.generator.utils import snake_to_camel, map_pg_column_to_typescr
 from pg_scaffold.preserve_custom.preservation import CodePreservationManager 
 
 class TypescriptGenerator(CodeGenerator):
+    outputs = ("types/",)
     
-    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str):
+    def __init__(self, sql_json_dir: str, output_dir: str, gen_version: str, options: Optional[Dict[str, Any]] = None):
         output_dir = os.path.join(output_dir, "types")
-        super().__init__(sql_json_dir, output_dir, "types.ts.j2",gen_version)
+        super().__init__(sql_json_dir, output_dir, "types.ts.j2", gen_version, options)
 
     # def write_code(self, rendered: str, output_dir: str, file_name: str) -> None:
     #     output_path = os.path.join(output_dir, file_name)        
@@ -24,7 +26,7 @@ class TypescriptGenerator(CodeGenerator):
     #         raise
 
     def generate(self) -> None:        
-        for table_name, table_info in self.schema.items():
+        for table_name, table_info in self._selected_tables():
             rendered = self.template.render(
                 table_name = table_name,
                 class_name = table_info["class_name"],
@@ -0,0 +1,141 @@
+# pg_scaffold/generator/watcher.py
+
+import os
+import time
+import select
+import logging
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import sqlalchemy as sa
+
+from pg_scaffold.generator.inspector import DatabaseInspector
+from pg_scaffold.generator.schema_diff import diff_schemas
+from pg_scaffold.generator.utils import load_schema_json
+
+NOTIFY_CHANNEL = "pg_scaffold_ddl"
+
+# Seconds between fingerprint polls while waiting on NOTIFY, in case a notification was missed
+NOTIFY_FALLBACK_INTERVAL = 30.0
+
+
+class SchemaWatcher:
+    """
+    Watches the catalog for DDL and reports which tables need regenerating.
+
+    Every wake-up runs DatabaseInspector.fingerprints(), one catalog query, and
+    re-inspects only the tables whose fingerprint changed, appeared or went
+    away. What to regenerate is then worked out by diff_schemas(): the tables
+    whose snapshot entry changed plus their relationship neighbours.
+
+    mode "poll" wakes every `interval` seconds. Mode "notify" installs an event
+    trigger that NOTIFYs NOTIFY_CHANNEL on every DDL command and sleeps until
+    one arrives (or NOTIFY_FALLBACK_INTERVAL passes).
+    """
+
+    def __init__(self, inspector: DatabaseInspector, sql_json_dir: str, mode: str = "poll", interval: float = 0.5,
+                 options: Optional[Dict[str, Any]] = None):
+        self.inspector = inspector
+        self.options = options or {}  # Generator settings, for the strategies statistics select
+        self.sql_json_dir = sql_json_dir
+        self.mode = mode
+        self.interval = interval
+        self.schema: Dict[str, Any] = inspector.schema if inspector.schema is not None else load_schema_json(sql_json_dir)
+        self.fingerprints: Dict[str, str] = inspector.fingerprints()
+
+    @staticmethod
+    def event_trigger_sql() -> List[str]:
+        """DDL for the event trigger behind mode "notify"; creating event triggers needs superuser."""
+        return [
+            "CREATE OR REPLACE FUNCTION pg_scaffold_notify_ddl() RETURNS event_trigger LANGUAGE plpgsql AS $$\n"
+            "BEGIN\n"
+            f"    PERFORM pg_notify('{NOTIFY_CHANNEL}', tg_tag);\n"
+            "END\n"
+            "$$",
+            "DROP EVENT TRIGGER IF EXISTS pg_scaffold_ddl",
+            "CREATE EVENT TRIGGER pg_scaffold_ddl ON ddl_command_end EXECUTE FUNCTION pg_scaffold_notify_ddl()",
+        ]
+
+    def _install_event_trigger(self) -> bool:
+        try:
+            with self.inspector.engine.begin() as conn:
+                for statement in self.event_trigger_sql():
+                    conn.execute(sa.text(statement))
+            return True
+        except Exception as e:
+            logging.warning(f"Could not install the DDL event trigger, polling every {self.interval}s instead: {e}")
+            return False
+
+    def changed_tables(self, fingerprints: Dict[str, str]) -> Set[str]:
+        """Tables whose fingerprint changed, appeared or disappeared since the last applied change."""
+        return {table_name for table_name in fingerprints.keys() | self.fingerprints.keys()
+                if fingerprints.get(table_name) != self.fingerprints.get(table_name)}
+
+    def apply(self, changed: Set[str]) -> Dict[str, Any]:
+        """
+        Re-inspect the changed tables, update the JSON snapshot and return what
+        to regenerate, as schema_diff.diff_schemas() reports it.
+        """
+        previous = self.schema
+        self.schema = self.inspector.refresh(previous, sorted(changed))
+        change = diff_schemas(previous, self.schema, self.options)
+
+        # Re-inspected tables, and tables whose reverse relationships were relinked
+        self.inspector.generate_scheme_json(sorted((changed | set(change["changed"])) & self.schema.keys()))
+        for table_name in change["dropped"]:
+            json_path = os.path.join(self.sql_json_dir, f"{table_name}.json")
+            if os.path.exists(json_path):
+                os.remove(json_path)
+
+        return change
+
+    def _notifications(self, dbapi_connection, timeout: float) -> List[str]:
+        if hasattr(dbapi_connection, "poll"):  # psycopg2
+            payloads = []
+            if select.select([dbapi_connection], [], [], timeout) != ([], [], []):
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    payloads.append(dbapi_connection.notifies.pop(0).payload)
+            return payloads
+        # psycopg 3
+        return [notify.payload for notify in dbapi_connection.notifies(timeout=timeout, stop_after=100)]
+
+    def run(self, on_change: Callable[[Dict[str, Any]], None]) -> None:
+        """Block, calling on_change(apply(...)) after each DDL change; stops on Ctrl+C."""
+        listen = self.mode == "notify" and self._install_event_trigger()
+        print(f"👀 Watching {len(self.fingerprints)} relations for DDL changes "
+              f"({'LISTEN ' + NOTIFY_CHANNEL if listen else f'polling every {self.interval}s'}), Ctrl+C to stop")
+        try:
+            if listen:
+                with self.inspector.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                    conn.execute(sa.text(f"LISTEN {NOTIFY_CHANNEL}"))
+                    dbapi_connection = conn.connection.dbapi_connection
+                    self._watch(on_change, lambda: self._notifications(dbapi_connection, NOTIFY_FALLBACK_INTERVAL))
+            else:
+                self._watch(on_change, lambda: time.sleep(self.interval))
+        except KeyboardInterrupt:
+            print("Stopped watching.")
+
+    def _watch(self, on_change: Callable[[Dict[str, Any]], None], wait: Callable[[], Any]) -> None:
+        failed = None
+        while True:
+            wait()
+            fingerprints = self.inspector.fingerprints()
+            changed = self.changed_tables(fingerprints)
+            if not changed or fingerprints == failed:
+                continue
+
+            start = time.perf_counter()
+            previous = self.schema
+            try:
+                change = self.apply(changed)
+                if change["tables"] or change["dropped"]:
+                    on_change(change)
+            except Exception as e:
+                # Snapshot and fingerprints stay as they were, so the next DDL change retries
+                self.schema = previous
+                failed = fingerprints
+                logging.exception(f"Regeneration for {', '.join(sorted(changed))} failed: {e}")
+                continue
+            self.fingerprints = fingerprints
+            print(f"🔁 Regenerated {', '.join(change['tables'] + change['dropped']) or 'nothing'} "
+                  f"in {time.perf_counter() - start:.3f}s")
@@ -11,6 +11,9 @@ from pg_scaffold.preserve_custom.pg_scaffolding import PgScaffoldingExtractor
 class CodePreservationManager:
     """Manages multi-block custom code preservation and restoration across code generation cycles."""
 
+    # Set by StagedOutput.writer(): write_code hands files to its thread pool instead of writing inline
+    batch_writer = None
+
     def __init__(self, source_directory: str, target_directory: Optional[str] = None,
                  extractor: Optional[CodeExtractor] = None):
         self.source_directory = Path(source_directory)
@@ -42,15 +45,18 @@ class CodePreservationManager:
     # -------------------------------------------------------------------------
     # PRESERVATION PHASE
     # -------------------------------------------------------------------------
-    def preserve_custom_code(self) -> Dict[str, PreservedCode]:
-        """Scan source directory for custom code and extract all preserved sections."""
+    def preserve_custom_code(self, files: Optional[List[Path]] = None) -> Dict[str, PreservedCode]:
+        """Scan source directory (or only the given files in it) for custom code and extract all preserved sections."""
         preserved_code = {}
 
         if not self.source_directory.exists():
             print(f"Source directory not found: {self.source_directory}")
             return preserved_code
 
-        python_files = self.find_source_files(self.source_directory)
+        if files is None:
+            python_files = self.find_source_files(self.source_directory)
+        else:
+            python_files = [Path(file_path) for file_path in files if Path(file_path).is_file()]
         self.logger.info(f"Scanning {len(python_files)} Source files for custom code...")
 
         for file_path in python_files:
@@ -71,15 +77,18 @@ class CodePreservationManager:
     # -------------------------------------------------------------------------
     # RESTORATION PHASE
     # -------------------------------------------------------------------------
-    def restore_custom_code(self, preserved_code: Dict[str, PreservedCode]) -> int:
-        """Restore preserved code sections to target directory."""
+    def restore_custom_code(self, preserved_code: Dict[str, PreservedCode], files: Optional[List[Path]] = None) -> int:
+        """Restore preserved code sections to target directory (or only to the given files in it)."""
         if not self.target_directory:
             raise ValueError("Target directory not set. Use set_target_directory() first.")
         if not self.target_directory.exists():
             raise FileNotFoundError(f"Target directory not found: {self.target_directory}")
 
         updated_count = 0
-        python_files = self.find_source_files(self.target_directory)
+        if files is None:
+            python_files = self.find_source_files(self.target_directory)
+        else:
+            python_files = [Path(file_path) for file_path in files if Path(file_path).is_file()]
         self.logger.info(f"Restoring custom code to {len(python_files)} files...")
 
         for file_path in python_files:
@@ -181,6 +190,11 @@ class CodePreservationManager:
         full_content = header + rendered
         output_path = os.path.join(output_dir, file_name)
 
+        if CodePreservationManager.batch_writer is not None:
+            CodePreservationManager.batch_writer.submit(output_path, full_content)
+            print(f"Generated file: {output_path}")
+            return
+
         try:
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             with open(output_path, "w", encoding='utf-8') as f:
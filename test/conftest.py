@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+import uuid
+from contextlib import contextmanager
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.engine import make_url
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+sys.path.insert(0, SRC_DIR)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# A database the tests may create scratch databases from, e.g. postgresql+psycopg://postgres@localhost/postgres
+TEST_DATABASE_URL_ENV = "PG_SCAFFOLD_TEST_DATABASE_URL"
+
+
+@pytest.fixture
+def fixture_path():
+    return lambda name: os.path.join(FIXTURES_DIR, name)
+
+
+@contextmanager
+def scratch_database():
+    """Create an empty database on the test server and drop it afterwards; skips without a test server."""
+    url = os.getenv(TEST_DATABASE_URL_ENV)
+    if not url:
+        pytest.skip(f"set {TEST_DATABASE_URL_ENV} to run tests against PostgreSQL")
+
+    name = f"pg_scaffold_test_{uuid.uuid4().hex[:12]}"
+    admin = sa.create_engine(url, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.exec_driver_sql(f'CREATE DATABASE "{name}"')
+    try:
+        yield make_url(url).set(database=name).render_as_string(hide_password=False)
+    finally:
+        with admin.connect() as conn:
+            conn.exec_driver_sql(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+        admin.dispose()
+
+
+@contextmanager
+def imported_app(app_dir, database_url, monkeypatch):
+    """
+    Import app.core.db of a generated app against database_url, after loading
+    the fixture schema into it. The app's modules are unloaded afterwards.
+    """
+    from pg_scaffold.generator.dump_inspector import load_schema_dump
+
+    load_schema_dump(database_url, os.path.join(FIXTURES_DIR, "events_schema.sql"))
+    monkeypatch.setenv("DATABASE_URL", database_url)
+    monkeypatch.syspath_prepend(str(app_dir))
+    try:
+        from app.core import db
+        yield db
+        db.engine.dispose()
+        for replica in db.replica_engines:
+            replica.dispose()
+    finally:
+        for name in [name for name in sys.modules if name == "app" or name.startswith("app.")]:
+            del sys.modules[name]
+
+
+@pytest.fixture
+def scratch_database_url():
+    """URL of an empty database created for one test and dropped after it."""
+    with scratch_database() as url:
+        yield url
+
+
+@pytest.fixture(scope="session")
+def generated_app_dir(tmp_path_factory):
+    """The app generated from fixtures/events_schema.sql, with the JSON fast path on every table."""
+    if not os.getenv(TEST_DATABASE_URL_ENV):
+        pytest.skip(f"set {TEST_DATABASE_URL_ENV} to run tests against PostgreSQL")
+    workdir = tmp_path_factory.mktemp("generated")
+    output_dir = workdir / "out"
+    subprocess.run(
+        [sys.executable, "-m", "pg_scaffold", "--schema_dump", os.path.join(FIXTURES_DIR, "events_schema.sql"),
+         "--output_dir", str(output_dir), "--json_fast_path", "all"],
+        env={**os.environ, "PYTHONPATH": SRC_DIR}, cwd=workdir, check=True, capture_output=True,
+    )
+    return output_dir
+
+
+@pytest.fixture
+def generated_app(generated_app_dir, scratch_database_url, monkeypatch):
+    """app.core.db of the generated app, on a scratch database holding the fixture schema."""
+    with imported_app(generated_app_dir, scratch_database_url, monkeypatch) as db:
+        yield db
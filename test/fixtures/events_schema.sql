@@ -0,0 +1,318 @@
+--
+-- PostgreSQL database dump
+--
+
+-- Dumped from database version 16.2
+-- Dumped by pg_dump version 16.2
+
+SET statement_timeout = 0;
+SET lock_timeout = 0;
+SET idle_in_transaction_session_timeout = 0;
+SET client_encoding = 'UTF8';
+SET standard_conforming_strings = on;
+SELECT pg_catalog.set_config('search_path', '', false);
+SET check_function_bodies = false;
+SET xmloption = content;
+SET client_min_messages = warning;
+SET row_security = off;
+
+--
+-- Name: event_status; Type: TYPE; Schema: public; Owner: postgres
+--
+
+CREATE TYPE public.event_status AS ENUM (
+    'draft',
+    'published',
+    'cancelled'
+);
+
+
+ALTER TYPE public.event_status OWNER TO postgres;
+
+--
+-- Name: positive_int; Type: DOMAIN; Schema: public; Owner: postgres
+--
+
+CREATE DOMAIN public.positive_int AS integer
+	CONSTRAINT positive_int_check CHECK ((VALUE > 0));
+
+
+ALTER DOMAIN public.positive_int OWNER TO postgres;
+
+SET default_tablespace = '';
+
+SET default_table_access_method = heap;
+
+--
+-- Name: event_judges; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.event_judges (
+    event_id integer NOT NULL,
+    judge_id integer NOT NULL,
+    assigned_at timestamp with time zone DEFAULT now()
+);
+
+
+ALTER TABLE public.event_judges OWNER TO postgres;
+
+--
+-- Name: events; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.events (
+    id integer NOT NULL,
+    venue_id integer,
+    title text NOT NULL,
+    status public.event_status DEFAULT 'draft'::public.event_status NOT NULL,
+    starts_at timestamp with time zone NOT NULL,
+    price numeric(10,2),
+    attendance bigint,
+    is_public boolean DEFAULT true NOT NULL,
+    title_search tsvector GENERATED ALWAYS AS (to_tsvector('english'::regconfig, title)) STORED,
+    created_at timestamp with time zone DEFAULT now()
+);
+
+
+ALTER TABLE public.events OWNER TO postgres;
+
+--
+-- Name: events_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
+--
+
+ALTER TABLE public.events ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY (
+    SEQUENCE NAME public.events_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+
+--
+-- Name: judges; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.judges (
+    id integer NOT NULL,
+    name text NOT NULL,
+    email text
+);
+
+
+ALTER TABLE public.judges OWNER TO postgres;
+
+--
+-- Name: judges_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
+--
+
+CREATE SEQUENCE public.judges_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+ALTER SEQUENCE public.judges_id_seq OWNER TO postgres;
+
+--
+-- Name: judges_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: postgres
+--
+
+ALTER SEQUENCE public.judges_id_seq OWNED BY public.judges.id;
+
+
+--
+-- Name: venues; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.venues (
+    id integer NOT NULL,
+    name text NOT NULL,
+    code character varying(12),
+    capacity public.positive_int
+);
+
+
+ALTER TABLE public.venues OWNER TO postgres;
+
+--
+-- Name: published_events; Type: VIEW; Schema: public; Owner: postgres
+--
+
+CREATE VIEW public.published_events AS
+ SELECT e.id,
+    e.title,
+    e.starts_at,
+    v.name AS venue_name
+   FROM (public.events e
+     LEFT JOIN public.venues v ON ((v.id = e.venue_id)))
+  WHERE (e.status = 'published'::public.event_status);
+
+
+ALTER VIEW public.published_events OWNER TO postgres;
+
+--
+-- Name: venue_event_counts; Type: MATERIALIZED VIEW; Schema: public; Owner: postgres
+--
+
+CREATE MATERIALIZED VIEW public.venue_event_counts AS
+ SELECT venue_id,
+    count(*) AS events,
+    max(starts_at) AS last_starts_at
+   FROM public.events
+  GROUP BY venue_id
+  WITH NO DATA;
+
+
+ALTER MATERIALIZED VIEW public.venue_event_counts OWNER TO postgres;
+
+--
+-- Name: venues_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
+--
+
+CREATE SEQUENCE public.venues_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+ALTER SEQUENCE public.venues_id_seq OWNER TO postgres;
+
+--
+-- Name: venues_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: postgres
+--
+
+ALTER SEQUENCE public.venues_id_seq OWNED BY public.venues.id;
+
+
+--
+-- Name: judges id; Type: DEFAULT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.judges ALTER COLUMN id SET DEFAULT nextval('public.judges_id_seq'::regclass);
+
+
+--
+-- Name: venues id; Type: DEFAULT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.venues ALTER COLUMN id SET DEFAULT nextval('public.venues_id_seq'::regclass);
+
+
+--
+-- Name: event_judges event_judges_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.event_judges
+    ADD CONSTRAINT event_judges_pkey PRIMARY KEY (event_id, judge_id);
+
+
+--
+-- Name: events events_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.events
+    ADD CONSTRAINT events_pkey PRIMARY KEY (id);
+
+
+--
+-- Name: judges judges_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.judges
+    ADD CONSTRAINT judges_pkey PRIMARY KEY (id);
+
+
+--
+-- Name: venues venues_code_key; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.venues
+    ADD CONSTRAINT venues_code_key UNIQUE (code);
+
+
+--
+-- Name: venues venues_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.venues
+    ADD CONSTRAINT venues_pkey PRIMARY KEY (id);
+
+
+--
+-- Name: events_published_starts_at; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX events_published_starts_at ON public.events USING btree (starts_at) WHERE (status = 'published'::public.event_status);
+
+
+--
+-- Name: events_title_search; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX events_title_search ON public.events USING gin (title_search);
+
+
+--
+-- Name: events_venue_id; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX events_venue_id ON public.events USING btree (venue_id);
+
+
+--
+-- Name: judges_email_lower; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE UNIQUE INDEX judges_email_lower ON public.judges USING btree (lower(email));
+
+
+--
+-- Name: judges_name_search; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX judges_name_search ON public.judges USING gin (to_tsvector('simple'::regconfig, name));
+
+
+--
+-- Name: venue_event_counts_venue_id; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE UNIQUE INDEX venue_event_counts_venue_id ON public.venue_event_counts USING btree (venue_id);
+
+
+--
+-- Name: event_judges event_judges_event_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.event_judges
+    ADD CONSTRAINT event_judges_event_id_fkey FOREIGN KEY (event_id) REFERENCES public.events(id) ON DELETE CASCADE;
+
+
+--
+-- Name: event_judges event_judges_judge_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.event_judges
+    ADD CONSTRAINT event_judges_judge_id_fkey FOREIGN KEY (judge_id) REFERENCES public.judges(id);
+
+
+--
+-- Name: events events_venue_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.events
+    ADD CONSTRAINT events_venue_id_fkey FOREIGN KEY (venue_id) REFERENCES public.venues(id);
+
+
+--
+-- PostgreSQL database dump complete
+--
+
@@ -0,0 +1,114 @@
+import pytest
+
+
+@pytest.fixture
+def judges(generated_app):
+    from app.crud.judge import CRUDJudge
+
+    with generated_app.SessionLocal() as session:
+        yield CRUDJudge(session)
+
+
+def test_upsert_inserts_every_row_without_a_key(judges):
+    from app.schemas.judge import JudgeCreate
+
+    rows = judges.upsert([JudgeCreate(name=name) for name in ("A", "B", "C")], key="id")
+    assert sorted(row.name for row in rows) == ["A", "B", "C"]
+    assert len({row.id for row in rows}) == 3
+
+
+def test_upsert_keeps_the_last_row_of_a_repeated_key(judges):
+    from app.schemas.judge import JudgeCreate
+
+    ada, bob = judges.upsert([JudgeCreate(name="Ada"), JudgeCreate(name="Bob")], key="id")
+    rows = judges.upsert([
+        JudgeCreate(id=ada.id, name="Ada Lovelace"),
+        JudgeCreate(id=bob.id, name="Bob"),
+        JudgeCreate(id=ada.id, name="Ada King"),
+    ], key="id")
+    assert sorted((row.id, row.name) for row in rows) == [(ada.id, "Ada King"), (bob.id, "Bob")]
+
+
+def test_upsert_mixes_keyed_and_new_rows(judges):
+    from app.schemas.judge import JudgeCreate
+
+    (ada,) = judges.upsert([JudgeCreate(name="Ada")], key="id")
+    rows = judges.upsert([JudgeCreate(id=ada.id, name="Ada King"), JudgeCreate(name="Bob"), JudgeCreate(name="Cy")], key="id")
+    assert sorted((row.id == ada.id, row.name) for row in rows) == [(False, "Bob"), (False, "Cy"), (True, "Ada King")]
+    assert [row.name for row in judges.get_many()] == ["Ada King", "Bob", "Cy"]
+
+
+def test_bulk_load_fills_identity_ids(generated_app):
+    from app.crud.event import CRUDEvent
+
+    with generated_app.SessionLocal() as session:
+        events = CRUDEvent(session)
+        assert events.copy_optional_columns == ("id",)
+        report = events.bulk_load([
+            {"title": "Opening", "starts_at": "2026-05-01T18:30:00Z"},
+            {"title": "Closing", "starts_at": "2026-05-02T20:00:00Z"},
+        ])
+        assert (report.loaded, report.rejected) == (2, [])
+        assert [event.id for event in events.get_many()] == [1, 2]
+
+
+def test_bulk_load_mixes_rows_with_and_without_serial_ids(judges):
+    report = judges.bulk_load([{"id": 100, "name": "Ada"}, {"name": "Bob"}, {"id": 101, "name": "Cy"}])
+    assert (report.loaded, report.rejected) == (3, [])
+    assert sorted((row.id, row.name) for row in judges.get_many()) == [(1, "Bob"), (100, "Ada"), (101, "Cy")]
+
+
+def test_link_and_unlink_report_what_changed(generated_app):
+    from app.crud.event import CRUDEvent
+
+    with generated_app.engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO judges (id, name) VALUES (1, 'Ada'), (2, 'Bob');"
+                             "INSERT INTO events (id, title, starts_at) VALUES (1, 'Opening', now());")
+    with generated_app.SessionLocal() as session:
+        events = CRUDEvent(session)
+        assert events.link(1, "judges", [1, 2, 9]) == (2, [9])
+        assert events.link(1, "judges", [2, 1]) == (0, [])
+        assert events.unlink(1, "judges", [2, 9]) == 1
+
+
+def test_id_in_filters_compose(generated_app):
+    import sqlalchemy as sa
+    from app.crud.base import id_in
+    from app.models.judge import JudgeModel
+
+    with generated_app.engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO judges (id, name) VALUES (1, 'Ada'), (2, 'Bob'), (3, 'Cy')")
+    with generated_app.SessionLocal() as session:
+        stmt = sa.select(JudgeModel.id).where(sa.or_(id_in(session, JudgeModel.id, [1]), id_in(session, JudgeModel.id, [3])))
+        assert session.scalars(stmt.order_by(JudgeModel.id)).all() == [1, 3]
+
+
+@pytest.mark.parametrize("where", [[5], [[["name"], "eq", "Ada"]], [["name", "eq"]]])
+def test_aggregate_rejects_malformed_where(generated_app, where):
+    from app.crud.judge import CRUDJudge
+
+    with generated_app.SessionLocal() as session:
+        with pytest.raises(ValueError):
+            CRUDJudge(session).aggregate(["count"], where=where)
+
+
+def test_batch_loader_gives_each_session_its_own_lookup_rows(generated_app):
+    from app.core.lookup_cache import lookup_cache
+    from app.crud.base import BatchLoader
+    from app.models.judge import JudgeModel
+    from app.schemas.judge import JudgeRead
+
+    with generated_app.engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO judges (id, name) VALUES (1, 'Ada');"
+                             "INSERT INTO events (id, title, starts_at) VALUES (1, 'Opening', now());"
+                             "INSERT INTO event_judges (event_id, judge_id) VALUES (1, 1);")
+    lookup_cache.register(JudgeModel, JudgeRead)
+    lookup_cache.reload("judges")
+
+    with generated_app.SessionLocal() as session:
+        ada = BatchLoader(session).load(JudgeModel, 1).get()
+        assert ada in session
+        assert [event.title for event in ada.events] == ["Opening"]  # Lazy load through the session
+        ada.name = "Changed in one request"
+        assert BatchLoader(session).load(JudgeModel, 2).get() is None
+    assert lookup_cache.get_row(JudgeModel, 1).name == "Ada"
@@ -0,0 +1,188 @@
+import json
+
+import pytest
+import sqlalchemy as sa
+
+from pg_scaffold.generator.dump_inspector import (
+    DumpCatalog, DumpInspector, conformance_differences, load_schema_dump, split_statements,
+)
+from pg_scaffold.generator.inspector import DatabaseInspector
+
+# events_schema.sql is real `pg_dump --schema-only` output (PostgreSQL 16) of a schema with identity,
+# serial and generated columns, an enum, a domain, partial and expression indexes, a view, a
+# materialized view and an association table. events_schema.json is what DumpInspector makes of it.
+DUMP = "events_schema.sql"
+SNAPSHOT = "events_schema.json"
+
+
+@pytest.fixture
+def dump_sql(fixture_path):
+    with open(fixture_path(DUMP), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture
+def catalog(dump_sql):
+    return DumpCatalog(dump_sql)
+
+
+@pytest.fixture
+def snapshot(fixture_path, tmp_path):
+    schema = DumpInspector(fixture_path(DUMP), str(tmp_path)).inspect()
+    return json.loads(json.dumps(schema))
+
+
+def columns_by_name(columns):
+    return {column["name"]: column for column in columns}
+
+
+def test_snapshot_matches_expected(snapshot, fixture_path):
+    with open(fixture_path(SNAPSHOT), encoding="utf-8") as f:
+        expected = json.load(f)
+    assert snapshot == expected
+
+
+def test_split_statements_keeps_semicolons_inside_literals_and_bodies():
+    sql = (
+        "\\restrict abc\n"
+        "-- a comment; with a semicolon\n"
+        "CREATE TABLE a (b text DEFAULT 'x;y');\n"
+        "CREATE FUNCTION f() RETURNS int LANGUAGE sql AS $$ SELECT 1; $$;\n"
+        "/* block; comment */ COMMENT ON TABLE a IS 'it''s; fine'"
+    )
+    statements = [statement.source() for statement in split_statements(sql)]
+    assert statements == [
+        "CREATE TABLE a (b text DEFAULT 'x;y')",
+        "CREATE FUNCTION f() RETURNS int LANGUAGE sql AS $$ SELECT 1; $$",
+        "COMMENT ON TABLE a IS 'it''s; fine'",
+    ]
+
+
+def test_relations(catalog):
+    assert sorted(catalog.get_table_names()) == ["event_judges", "events", "judges", "venues"]
+    assert catalog.get_view_names() == ["published_events"]
+    assert catalog.get_materialized_view_names() == ["venue_event_counts"]
+
+
+def test_identity_serial_and_generated_columns(catalog):
+    events = columns_by_name(catalog.get_columns("events"))
+    assert events["id"]["identity"] == {"always": False}
+    assert events["id"]["default"] is None
+    assert events["title_search"]["computed"] == {"sqltext": "to_tsvector('english'::regconfig, title)", "persisted": True}
+    assert events["created_at"]["default"] == "now()"
+
+    venues = columns_by_name(catalog.get_columns("venues"))
+    assert venues["id"]["default"] == "nextval('venues_id_seq'::regclass)"
+    assert "identity" not in venues["id"]
+
+
+def test_snapshot_marks_identity_columns(snapshot):
+    identity = [(table, column["name"]) for table, info in snapshot.items() for column in info["columns"] if column["identity"]]
+    assert identity == [("events", "id")]
+    assert not columns_by_name(snapshot["events"]["columns"])["id"]["server_default"]
+
+
+def test_generated_always_identity():
+    catalog = DumpCatalog(
+        "CREATE TABLE public.t (id integer NOT NULL, n integer);\n"
+        "ALTER TABLE public.t ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (SEQUENCE NAME public.t_id_seq);"
+    )
+    assert columns_by_name(catalog.get_columns("t"))["id"]["identity"] == {"always": True}
+
+
+def test_enum_and_domain_columns(catalog, snapshot):
+    status = columns_by_name(catalog.get_columns("events"))["status"]
+    assert isinstance(status["type"], sa.Enum)
+    assert status["type"].enums == ["draft", "published", "cancelled"]
+    assert status["default"] == "'draft'::event_status"
+
+    columns = columns_by_name(snapshot["events"]["columns"])
+    assert (columns["status"]["type"], columns["status"]["var_len"]) == ("VARCHAR", 9)
+    assert columns_by_name(snapshot["venues"]["columns"])["capacity"]["type"] == "DOMAIN"
+
+
+def test_partial_index(snapshot):
+    indexes = {index["name"]: index for index in snapshot["events"]["indexes"]}
+    partial = indexes["events_published_starts_at"]
+    assert partial["predicate"] == "status = 'published'::event_status"
+    assert [element["expression"] for element in partial["elements"]] == ["starts_at"]
+
+
+def test_expression_indexes(snapshot):
+    indexes = {index["name"]: index for index in snapshot["judges"]["indexes"]}
+    lower_email = indexes["judges_email_lower"]
+    assert lower_email["unique"]
+    assert lower_email["elements"][0]["expression"] == "lower(email)"
+    assert not lower_email["elements"][0]["column"]
+
+    assert snapshot["judges"]["search_indexes"] == [{
+        "name": "judges_name_search", "method": "gin", "kind": "fulltext",
+        "expression": "to_tsvector('simple'::regconfig, name)", "config": "simple", "opclass": None, "predicate": None,
+    }]
+
+
+def test_views(snapshot):
+    view = snapshot["published_events"]
+    assert view["kind"] == "view"
+    assert [(column["name"], column["type"]) for column in view["columns"]] == [
+        ("id", "INTEGER"), ("title", "TEXT"), ("starts_at", "TIMESTAMP"), ("venue_name", "TEXT"),
+    ]
+
+    matview = snapshot["venue_event_counts"]
+    assert matview["kind"] == "materialized_view"
+    assert [(column["name"], column["type"], column["primary_key"]) for column in matview["columns"]] == [
+        ("venue_id", "INTEGER", True), ("events", "BIGINT", False), ("last_starts_at", "TIMESTAMP", False),
+    ]
+
+
+def test_association_table(snapshot):
+    events = {rel["variable_name"]: rel for rel in snapshot["events"]["relationships"]}
+    assert events["judges"]["relation_type"] == "many_to_many"
+    assert events["judges"]["secondary"] == "event_judges"
+    judges = {rel["variable_name"]: rel for rel in snapshot["judges"]["relationships"]}
+    assert judges["events"]["relation_type"] == "many_to_many"
+
+
+def _catalog_entries(inspector, table_name):
+    """The parts of the Inspector answers DatabaseInspector reads, in a comparable form."""
+    columns = [
+        {
+            "name": column["name"],
+            "type": str(column["type"]),
+            "nullable": column["nullable"],
+            "default": column["default"],
+            "identity_always": (column.get("identity") or {}).get("always"),
+            "computed": column.get("computed"),
+        }
+        for column in inspector.get_columns(table_name)
+    ]
+    foreign_keys = sorted(
+        (fk["name"], tuple(fk["constrained_columns"]), fk["referred_table"], tuple(fk["referred_columns"]))
+        for fk in inspector.get_foreign_keys(table_name)
+    )
+    unique = sorted((uc["name"], tuple(uc["column_names"])) for uc in inspector.get_unique_constraints(table_name))
+    indexes = sorted((index["name"], bool(index["unique"])) for index in inspector.get_indexes(table_name))
+    return {
+        "columns": columns,
+        "primary_key": inspector.get_pk_constraint(table_name)["constrained_columns"],
+        "foreign_keys": foreign_keys,
+        "unique": unique,
+        "indexes": indexes,
+    }
+
+
+def test_live_conformance(fixture_path, scratch_database_url, tmp_path):
+    load_schema_dump(scratch_database_url, fixture_path(DUMP))
+
+    offline = DumpInspector(fixture_path(DUMP), str(tmp_path)).inspect()
+    live_inspector = DatabaseInspector(scratch_database_url, str(tmp_path))
+    try:
+        live = live_inspector.inspect()
+        assert conformance_differences(offline, live) == []
+
+        catalog = DumpCatalog(open(fixture_path(DUMP), encoding="utf-8").read())
+        reflected = sa.inspect(live_inspector.engine)
+        for table_name in catalog.get_table_names():
+            assert _catalog_entries(catalog, table_name) == _catalog_entries(reflected, table_name), table_name
+    finally:
+        live_inspector.engine.dispose()
@@ -0,0 +1,88 @@
+import csv
+import gc
+import io
+import json
+import time
+import tracemalloc
+
+import pytest
+
+BATCH_SIZE = 1000
+ROW_COUNT = 40000
+SMALL, LARGE = 2000, 16000  # Exports traced for memory, which is slow
+
+ROWS = """
+INSERT INTO venues (id, code, name, capacity) VALUES (1, 'HALL', 'Main hall', 300);
+INSERT INTO events (venue_id, title, status, starts_at, price, attendance)
+SELECT 1, 'Event number ' || n, 'published', '2026-01-01 00:00:00+00'::timestamptz + n * interval '1 minute', n / 100.0, n
+FROM generate_series(1, %(rows)s) AS n;
+"""
+
+
+@pytest.fixture
+def events(generated_app):
+    from app.crud.event import CRUDEvent
+
+    with generated_app.engine.begin() as conn:
+        conn.exec_driver_sql(ROWS % {"rows": ROW_COUNT})
+    with generated_app.SessionLocal() as session:
+        yield CRUDEvent(session)
+
+
+def count_rows(fmt, payload: bytes) -> int:
+    if fmt == "ndjson":
+        return sum(1 for line in payload.splitlines() if json.loads(line))
+    if fmt == "csv":
+        return len(list(csv.reader(io.StringIO(payload.decode("utf-8"))))) - 1
+    import pyarrow as pa
+    return pa.ipc.open_stream(payload).read_all().num_rows
+
+
+def first_batches(events, rows):
+    """events.stream_batches(), stopped after rows rows."""
+    remaining = rows
+    for batch in events.stream_batches(batch_size=BATCH_SIZE):
+        yield batch[:remaining]
+        remaining -= len(batch)
+        if remaining <= 0:
+            return
+
+
+def export(events, fmt, rows):
+    """The encoded export of the first rows events, and its rows per second."""
+    from app.core.export import ExportFormat, encode
+
+    start = time.perf_counter()
+    output = b"".join(encode(ExportFormat(fmt), events.export_columns(), first_batches(events, rows)))
+    return output, rows / (time.perf_counter() - start)
+
+
+def peak_memory(events, fmt, rows):
+    """Peak memory traced while exporting rows, dropping every chunk as a client would consume it."""
+    from app.core.export import ExportFormat, encode
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for _ in encode(ExportFormat(fmt), events.export_columns(), first_batches(events, rows)):
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv", "arrow"])
+def test_export_throughput_and_memory(events, fmt, record_property):
+    if fmt == "arrow":
+        pytest.importorskip("pyarrow")
+
+    payload, rate = export(events, fmt, ROW_COUNT)
+    assert count_rows(fmt, payload) == ROW_COUNT
+    record_property(f"{fmt}_rows_per_second", round(rate))
+
+    small_peak = peak_memory(events, fmt, SMALL)
+    large_peak = peak_memory(events, fmt, LARGE)
+    print(f"\n{fmt}: {rate:,.0f} rows/s over {ROW_COUNT} rows; "
+          f"peak {small_peak / 1024:,.0f} KiB for {SMALL} rows, {large_peak / 1024:,.0f} KiB for {LARGE}")
+    # Eight times the rows in batches of the same size: the peak grows by less than one encoded batch
+    assert large_peak - small_peak < len(payload) / ROW_COUNT * BATCH_SIZE
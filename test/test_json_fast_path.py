@@ -0,0 +1,69 @@
+import json
+from datetime import datetime
+
+import pytest
+import sqlalchemy as sa
+
+ROWS = """
+INSERT INTO venues (code, name, capacity) VALUES ('HALL', 'Main hall', 300), ('ANNEX', 'Annex', NULL);
+INSERT INTO events (venue_id, title, status, starts_at, price, attendance) VALUES
+    (1, 'Opening', 'published', '2026-05-01 18:30:00.123+02', 12.50, 9007199254740993),
+    (NULL, 'Closing', 'draft', '2026-05-02 20:00:00+00', NULL, NULL),
+    (2, 'Rehearsal', 'cancelled', '2026-04-30 09:15:30.5+00', 0.00, 0);
+INSERT INTO judges (name, email) VALUES ('Ada', 'ada@example.org'), ('Bob', 'bob@example.org'), ('Cy', NULL);
+INSERT INTO event_judges (event_id, judge_id) VALUES (1, 1), (1, 2), (2, 2);
+"""
+
+
+@pytest.fixture
+def app_db(generated_app):
+    with generated_app.engine.begin() as conn:
+        conn.exec_driver_sql(ROWS)
+    return generated_app
+
+
+def normalise(value):
+    """Timestamps as datetimes, since only their formatting differs; collections in a stable order."""
+    if isinstance(value, dict):
+        return {key: normalise(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return sorted((normalise(item) for item in value), key=lambda item: json.dumps(item, default=str, sort_keys=True))
+    if isinstance(value, str) and "T" in value:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return value
+
+
+def orm_documents(service, ids):
+    include = tuple(relationship.key for relationship in sa.inspect(service.model).relationships)
+    return [json.loads(service.get_by_id(id, include=include).model_dump_json()) for id in ids]
+
+
+@pytest.mark.parametrize("crud_module, crud_class, ids", [
+    ("app.crud.event", "CRUDEvent", [1, 2, 3]),
+    ("app.crud.judge", "CRUDJudge", [1, 2, 3]),
+    ("app.crud.venue", "CRUDVenue", [1, 2]),
+])
+def test_json_matches_orm(app_db, crud_module, crud_class, ids):
+    module = __import__(crud_module, fromlist=[crud_class])
+    with app_db.SessionLocal() as session:
+        service = getattr(module, crud_class)(session)
+        expected = orm_documents(service, ids)
+
+        documents = [json.loads(service.get_json_by_id(id)) for id in ids]
+        assert [normalise(document) for document in documents] == [normalise(document) for document in expected]
+        assert json.loads(service.get_many_json(skip=0, limit=len(ids))) == documents
+        assert service.get_json_by_id(999) is None
+
+
+def test_json_types_follow_read_schema(app_db):
+    from app.crud.event import CRUDEvent
+
+    with app_db.SessionLocal() as session:
+        document = json.loads(CRUDEvent(session).get_json_by_id(1))
+    # numeric and bigint are str in the Read schemas: exact digits, no float rounding
+    assert (document["price"], document["attendance"]) == ("12.50", "9007199254740993")
+    assert document["venue"]["capacity"] == "300"
+    assert sorted(judge["name"] for judge in document["judges"]) == ["Ada", "Bob"]
@@ -0,0 +1,96 @@
+import pytest
+import sqlalchemy as sa
+
+from conftest import imported_app, scratch_database
+
+# Both databases start with the same rows; then the primary moves on and the replica lags behind.
+SHARED_ROWS = """
+INSERT INTO judges (id, name) VALUES (1, 'Ada');
+INSERT INTO events (id, title, starts_at) VALUES (1, 'Opening', '2026-05-01 18:30:00+00');
+SELECT setval('judges_id_seq', 10);
+"""
+PRIMARY_ONLY_ROWS = """
+UPDATE judges SET name = 'Ada King' WHERE id = 1;
+INSERT INTO judges (id, name) VALUES (2, 'Bob');
+INSERT INTO event_judges (event_id, judge_id) VALUES (1, 2);
+"""
+
+
+@pytest.fixture
+def replicated_app(generated_app_dir, scratch_database_url, monkeypatch):
+    """The generated app with DATABASE_REPLICA_URLS pointing at a second, lagging database."""
+    with scratch_database() as replica_url:
+        monkeypatch.setenv("DATABASE_REPLICA_URLS", replica_url)
+        with imported_app(generated_app_dir, replica_url, monkeypatch):
+            pass
+        with imported_app(generated_app_dir, scratch_database_url, monkeypatch) as db:
+            for engine in (db.engine, *db.replica_engines):
+                with engine.begin() as conn:
+                    conn.exec_driver_sql(SHARED_ROWS)
+            with db.engine.begin() as conn:
+                conn.exec_driver_sql(PRIMARY_ONLY_ROWS)
+            yield db
+
+
+@pytest.fixture
+def client(replicated_app):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.api import event, event_judge, judge
+
+    app = FastAPI()
+    for module in (event, event_judge, judge):
+        app.include_router(module.router)
+    return TestClient(app)
+
+
+def primary_names(db):
+    with db.engine.connect() as conn:
+        return dict(conn.execute(sa.text("SELECT id, name FROM judges ORDER BY id")).all())
+
+
+def test_reads_go_to_the_replica(replicated_app, client):
+    from app.crud.judge import CRUDJudge
+
+    with replicated_app.SessionLocal() as session:
+        judges = CRUDJudge(session)
+        assert judges.get_by_id(1).name == "Ada"
+        assert judges.get_by_id(2) is None
+    assert client.get("/judges/2").status_code == 404
+
+
+def test_update_reads_the_row_it_changes_from_the_primary(replicated_app):
+    from app.crud.judge import CRUDJudge
+    from app.schemas.judge import JudgeUpdate
+
+    # The replica already says 'Ada'; an update loaded from it would look like a no-op and be skipped
+    with replicated_app.SessionLocal() as session:
+        assert CRUDJudge(session).update(JudgeUpdate(id=1, name="Ada")).name == "Ada"
+    assert primary_names(replicated_app)[1] == "Ada"
+
+
+def test_write_routes_find_rows_the_replica_has_not_seen(replicated_app, client):
+    assert client.put("/judges/2", json={"id": 2, "name": "Bob Moog"}).json()["name"] == "Bob Moog"
+
+    response = client.post("/events/1/judges", json=[2, 1])
+    assert response.status_code == 200
+    assert response.json() == {"changed": 1, "missing": []}
+
+    response = client.put("/event_judges/1/2", json={"assigned_at": "2026-05-01T12:00:00Z"})
+    assert response.status_code == 200
+    assert client.delete("/event_judges/1/2").status_code == 200
+
+    with replicated_app.engine.connect() as conn:
+        assert conn.execute(sa.text("SELECT judge_id FROM event_judges ORDER BY judge_id")).scalars().all() == [1]
+    assert client.delete("/judges/2").status_code == 200
+    assert primary_names(replicated_app) == {1: "Ada King"}
+
+
+def test_session_reads_its_copy_from_the_primary(replicated_app):
+    from app.core.bulk import copy_rows
+    from app.models.judge import JudgeModel
+
+    with replicated_app.SessionLocal() as session:
+        copy_rows(session, "judges", ["name"], [["Cy"]])
+        names = session.scalars(sa.select(JudgeModel.name).order_by(JudgeModel.id)).all()
+    assert names == ["Ada King", "Bob", "Cy"]